@@ -0,0 +1,92 @@
+"""
+대상 상태 기반 적응형 점검 주기
+- 장애 또는 응답 지연이 커진(degraded) 대상: 최소 주기로 빠르게 점검 (장애 확인, 복구 감지)
+- 오래 정상인 대상: 연속 정상 횟수에 따라 주기를 늘려 최대 주기까지 완화
+- 지연 상태가 stable_checks회 연속되면 평소 응답 시간이 바뀐 것으로 보고 기준선을 다시 잡음
+"""
+from typing import Dict, Any
+from config import Config
+
+
+class TargetHealth:
+    """대상별 상태 (연속 정상 횟수, 응답 시간 기준선)"""
+
+    def __init__(self):
+        self.consecutive_successes = 0
+        self.is_failing = False
+        self.is_degraded = False
+        # 응답 시간 지수이동평균 (정상 응답만 반영)
+        self.baseline_ms = None
+        # 연속된 지연 상태 응답 시간 (기준선 재설정용)
+        self.degraded_ms = []
+
+
+class AdaptiveIntervalPolicy:
+    """점검 결과에 따라 대상별 점검 주기를 계산"""
+
+    def __init__(self,
+                 min_interval: float = Config.ADAPTIVE_MIN_INTERVAL_SECONDS,
+                 max_interval: float = Config.ADAPTIVE_MAX_INTERVAL_SECONDS,
+                 stable_checks: int = Config.ADAPTIVE_STABLE_CHECKS,
+                 degraded_ratio: float = Config.ADAPTIVE_DEGRADED_RATIO):
+        """
+        Args:
+            min_interval: 장애/지연 대상의 점검 주기 (초, 기본 주기보다 길면 기본 주기 사용)
+            max_interval: 정상 대상 주기 완화 상한 (초)
+            stable_checks: 주기를 2배로 늘리는 연속 정상 횟수 단위
+            degraded_ratio: 응답 시간이 기준선의 이 배수를 넘으면 지연 상태로 판단
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.stable_checks = stable_checks
+        self.degraded_ratio = degraded_ratio
+        self._health: Dict[str, TargetHealth] = {}
+
+    def record(self, result: Dict[str, Any]) -> None:
+        """점검 결과 반영"""
+        health = self._health.setdefault(result['target_url'], TargetHealth())
+
+        if not result['is_success']:
+            health.is_failing = True
+            health.consecutive_successes = 0
+            health.degraded_ms = []
+            return
+
+        latency = result['response_time_ms']
+        health.is_failing = False
+        health.is_degraded = (health.baseline_ms is not None
+                              and latency > max(health.baseline_ms, 1) * self.degraded_ratio)
+
+        if health.is_degraded:
+            health.consecutive_successes = 0
+            health.degraded_ms.append(latency)
+            if len(health.degraded_ms) >= self.stable_checks:
+                # 지연이 계속되면 일시적인 지연이 아니라 평소 응답 시간이 늘어난 것으로 보고 기준선 재설정
+                health.baseline_ms = sum(health.degraded_ms) / len(health.degraded_ms)
+                health.is_degraded = False
+                health.degraded_ms = []
+        else:
+            health.degraded_ms = []
+            health.consecutive_successes += 1
+            # 지연 상태 응답은 기준선에 반영하지 않음
+            health.baseline_ms = (latency if health.baseline_ms is None
+                                  else health.baseline_ms * 0.9 + latency * 0.1)
+
+    def interval_for(self, target: Dict[str, Any]) -> float:
+        """대상의 현재 점검 주기 (초)"""
+        base = target['interval']
+        health = self._health.get(target['url'])
+        if health is None:
+            return base
+
+        if health.is_failing or health.is_degraded:
+            return min(base, self.min_interval)
+
+        steps = health.consecutive_successes // self.stable_checks
+        if steps == 0:
+            return base
+        return max(min(base * 2 ** min(steps, 32), self.max_interval), base)
+
+    def forget(self, url: str) -> None:
+        """대상 제거 시 상태 정리"""
+        self._health.pop(url, None)
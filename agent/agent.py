@@ -1,144 +1,154 @@
 """
 모니터링 Agent 메인 스크립트
-대상 URL을 주기적으로 점검하고 백엔드로 데이터 전송
+대상 URL 목록을 대상별 주기로 동시 점검하고 백엔드로 데이터 전송
 """
+import asyncio
 import time
 import requests
-import schedule
-from datetime import datetime
+import metrics
 from config import Config, validate_config
 from logger import setup_logger
+from adaptive import AdaptiveIntervalPolicy
+from aggregator import ResultAggregator
+from buffer import EventBuffer
+from http_client import create_backend_session
+from probe import ProbeEngine
+from scheduler import ProbeScheduler
+from shipper import SpoolShipper
+from spool import Spool
+from targets import TargetSource
 
 # 로거 초기화
 logger = setup_logger()
 
+# 동시 점검 엔진
+probe_engine = ProbeEngine(max_concurrency=Config.MAX_CONCURRENCY)
 
-def check_url(url: str) -> dict:
+# 백엔드 전송용 keep-alive 세션
+backend_session = create_backend_session()
+
+
+def send_batch_to_backend(events: list) -> bool:
     """
-    대상 URL 점검
+    백엔드로 점검 데이터 일괄 전송 (재시도는 SpoolShipper가 백오프로 처리)
+
+    Args:
+        events: 점검 결과 데이터 목록
 
     Returns:
-        dict: 점검 결과
-            - target_url: 점검 대상 URL
-            - status_code: HTTP 응답 코드 (None if error)
-            - response_time_ms: 응답 시간 (밀리초)
-            - timestamp: 점검 시각
-            - is_success: 정상 여부
-            - error_message: 에러 메시지 (있을 경우)
+        bool: 처리 완료 여부 (False면 같은 배치를 나중에 재전송)
     """
-    result = {
-        'target_url': url,
-        'status_code': None,
-        'response_time_ms': 0,
-        'timestamp': datetime.utcnow().isoformat(),
-        'is_success': False,
-        'error_message': None
-    }
+    endpoint = f"{Config.BACKEND_URL}/events/batch"
+    start_time = time.perf_counter()
 
     try:
-        # 시작 시간 기록
-        start_time = time.time()
+        response = backend_session.post(
+            endpoint,
+            json={'events': events},
+            timeout=Config.REQUEST_TIMEOUT
+        )
+        metrics.BACKEND_SEND_DURATION.observe(time.perf_counter() - start_time)
 
-        # HTTP 요청
-        response = requests.get(url, timeout=Config.REQUEST_TIMEOUT)
+        if response.status_code != 201:
+            metrics.BACKEND_SEND_ERRORS.inc(f'http_{response.status_code}')
 
-        # 응답 시간 계산 (밀리초)
-        response_time_ms = int((time.time() - start_time) * 1000)
+        if response.status_code == 201:
+            rejected = response.json().get('rejected', [])
+            metrics.BACKEND_SENT_EVENTS.inc(amount=len(events))
+            if rejected:
+                logger.warning(f"⚠️ 백엔드가 일부 이벤트 거부: {len(rejected)}건 - {rejected[:3]}")
+            logger.info(f"📤 백엔드 전송 성공: {endpoint} ({len(events) - len(rejected)}건)")
+            return True
 
-        # 결과 설정
-        result['status_code'] = response.status_code
-        result['response_time_ms'] = response_time_ms
-        result['is_success'] = 200 <= response.status_code < 400
+        if 400 <= response.status_code < 500 and response.status_code not in (408, 429):
+            # 재전송해도 같은 결과인 요청 오류는 폐기 (스풀이 막히지 않도록)
+            logger.error(f"❌ 백엔드가 배치 거부, 폐기: {response.status_code} - {response.text} ({len(events)}건)")
+            return True
 
-        logger.info(f"✅ URL 점검 성공: {url} - {response.status_code} ({response_time_ms}ms)")
+        logger.warning(f"⚠️ 백엔드 응답 오류: {response.status_code} - {response.text}")
+        return False
 
-    except requests.exceptions.Timeout:
-        result['response_time_ms'] = Config.REQUEST_TIMEOUT * 1000
-        result['error_message'] = f"Request timed out after {Config.REQUEST_TIMEOUT}s"
-        logger.warning(f"⏱️ 타임아웃: {url} - {result['error_message']}")
+    except requests.exceptions.ConnectionError:
+        metrics.BACKEND_SEND_ERRORS.inc('connection')
+        logger.error(f"🔌 백엔드 연결 실패: {endpoint}")
+        return False
 
-    except requests.exceptions.ConnectionError as e:
-        result['error_message'] = f"Connection error: {str(e)}"
-        logger.error(f"🔌 연결 실패: {url} - {result['error_message']}")
+    except Exception as e:
+        metrics.BACKEND_SEND_ERRORS.inc('timeout' if isinstance(e, requests.exceptions.Timeout) else 'unexpected')
+        logger.error(f"⚠️ 전송 중 예상치 못한 오류: {str(e)}")
+        return False
 
-    except requests.exceptions.RequestException as e:
-        result['error_message'] = f"Request error: {str(e)}"
-        logger.error(f"❌ 요청 실패: {url} - {result['error_message']}")
 
-    except Exception as e:
-        result['error_message'] = f"Unexpected error: {str(e)}"
-        logger.error(f"⚠️ 예상치 못한 오류: {url} - {result['error_message']}")
+# 디스크 스풀 (점검 결과는 스풀에 기록되고 전송기가 별도 스레드에서 전송)
+spool = Spool()
+shipper = SpoolShipper(spool, send_batch_to_backend)
 
-    return result
+# 점검 결과 버퍼 (모아서 스풀에 한 번에 기록)
+event_buffer = EventBuffer(spool.append_many)
 
+# 집계 모드: 상태 변화는 즉시, 나머지는 구간 요약으로 버퍼에 전달
+aggregator = ResultAggregator(event_buffer.add_many) if Config.AGGREGATION_ENABLED else None
 
-def send_to_backend(data: dict, retry_count: int = 0) -> bool:
-    """
-    백엔드로 점검 데이터 전송
+# 대상별 점검 스케줄러 (점검 결과는 집계기 또는 버퍼로 전달)
+scheduler = ProbeScheduler(
+    probe_engine,
+    aggregator.add if aggregator else event_buffer.add,
+    max_concurrency=Config.MAX_CONCURRENCY,
+    policy=AdaptiveIntervalPolicy() if Config.ADAPTIVE_INTERVALS_ENABLED else None,
+    max_probes_per_second=Config.MAX_PROBES_PER_SECOND
+)
 
-    Args:
-        data: 점검 결과 데이터
-        retry_count: 현재 재시도 횟수
 
-    Returns:
-        bool: 전송 성공 여부
-    """
-    endpoint = f"{Config.BACKEND_URL}/events"
-    headers = {
-        'Content-Type': 'application/json',
-        'X-API-Key': Config.API_KEY
-    }
+# 현재 상태 지표 (수집 시점에 계산)
+metrics.PROBES_IN_FLIGHT.callback = lambda: scheduler.in_flight
+metrics.TARGETS.callback = lambda: len(scheduler)
+metrics.BUFFER_DEPTH.callback = lambda: len(event_buffer)
+metrics.SPOOL_DEPTH.callback = lambda: len(spool)
 
-    try:
-        response = requests.post(
-            endpoint,
-            json=data,
-            headers=headers,
-            timeout=Config.REQUEST_TIMEOUT
-        )
 
-        if response.status_code == 201:
-            logger.info(f"📤 백엔드 전송 성공: {endpoint}")
-            return True
-        else:
-            logger.warning(f"⚠️ 백엔드 응답 오류: {response.status_code} - {response.text}")
-            return False
+# 점검 대상 목록 원본 (TARGETS_URL, TARGETS_FILE이면 실행 중 다시 로드)
+target_source = TargetSource()
 
-    except requests.exceptions.ConnectionError:
-        logger.error(f"🔌 백엔드 연결 실패: {endpoint}")
 
-        # 재시도 로직
-        if retry_count < Config.MAX_RETRIES:
-            wait_time = Config.RETRY_BACKOFF_FACTOR ** retry_count
-            logger.info(f"🔄 {wait_time}초 후 재시도 ({retry_count + 1}/{Config.MAX_RETRIES})...")
-            time.sleep(wait_time)
-            return send_to_backend(data, retry_count + 1)
-        else:
-            logger.error(f"❌ 최대 재시도 횟수 초과: {Config.MAX_RETRIES}회")
-            return False
+async def reload_targets():
+    """대상 목록 변경을 주기적으로 확인하여 스케줄러에 변경분만 반영"""
+    while True:
+        await asyncio.sleep(Config.TARGETS_RELOAD_SECONDS)
 
-    except Exception as e:
-        logger.error(f"⚠️ 전송 중 예상치 못한 오류: {str(e)}")
-        return False
+        try:
+            # 파일 읽기/HTTP 요청과 파싱은 이벤트 루프를 막지 않도록 스레드에서 수행
+            targets = await asyncio.to_thread(target_source.poll)
+        except Exception as e:
+            logger.error(f"⚠️ 대상 목록 다시 로드 실패 (기존 목록 유지): {str(e)}")
+            continue
 
+        if targets is None:
+            continue
 
-def monitoring_job():
-    """주기적으로 실행되는 모니터링 작업"""
-    logger.info("=" * 60)
-    logger.info(f"🔍 모니터링 시작: {Config.TARGET_URL}")
+        added, removed, changed = scheduler.update_targets(targets)
+        if aggregator:
+            for url in removed:
+                aggregator.forget(url)
 
-    # URL 점검
-    result = check_url(Config.TARGET_URL)
+        logger.info(
+            f"🔄 대상 목록 다시 로드: 추가 {len(added)}개, 제거 {len(removed)}개, "
+            f"변경 {len(changed)}개 (전체 {len(scheduler)}개)"
+        )
 
-    # 백엔드 전송
-    success = send_to_backend(result)
 
-    if success:
-        logger.info("✅ 모니터링 사이클 완료")
-    else:
-        logger.error("❌ 모니터링 사이클 실패 (백엔드 전송 실패)")
+async def run_agent(targets: list):
+    """스케줄러 실행 (종료 시 실행 중인 점검 완료 후 연결 정리)"""
+    reloader = None
+    if target_source.reloadable and Config.TARGETS_RELOAD_SECONDS > 0:
+        reloader = asyncio.create_task(reload_targets())
 
-    logger.info("=" * 60)
+    try:
+        await scheduler.run(targets)
+    finally:
+        if reloader:
+            reloader.cancel()
+        await scheduler.stop()
+        await probe_engine.aclose()
 
 
 def main():
@@ -147,27 +157,42 @@ def main():
         # 설정 검증
         validate_config()
 
+        targets = target_source.load()
+
         logger.info("🚀 모니터링 Agent 시작")
-        logger.info(f"   대상 URL: {Config.TARGET_URL}")
-        logger.info(f"   점검 주기: {Config.CHECK_INTERVAL_SECONDS}초")
+        logger.info(f"   대상 수: {len(targets)}개")
+        logger.info(f"   동시 실행: {Config.MAX_CONCURRENCY}개")
+        logger.info(f"   기본 점검 주기: {Config.CHECK_INTERVAL_SECONDS}초")
         logger.info(f"   백엔드 URL: {Config.BACKEND_URL}")
+        logger.info(f"   배치 전송: {Config.BATCH_SIZE}건 또는 {Config.BATCH_MAX_WAIT_SECONDS}초마다")
+        logger.info(f"   스풀 경로: {Config.SPOOL_DIR}")
+        if aggregator:
+            logger.info(f"   집계 모드: 상태 변화 즉시 전송, {Config.AGGREGATION_WINDOW_SECONDS}초 구간 요약")
+        if scheduler.policy:
+            logger.info(f"   적응형 주기: {Config.ADAPTIVE_MIN_INTERVAL_SECONDS}초 ~ {Config.ADAPTIVE_MAX_INTERVAL_SECONDS}초")
+        if scheduler.budget:
+            logger.info(f"   점검 속도 제한: 초당 {Config.MAX_PROBES_PER_SECOND}건")
+        if target_source.reloadable and Config.TARGETS_RELOAD_SECONDS > 0:
+            logger.info(f"   대상 목록 변경 확인: {Config.TARGETS_RELOAD_SECONDS}초마다")
+        if Config.METRICS_PORT:
+            metrics.start_metrics_server()
+            logger.info(f"   지표 엔드포인트: http://{Config.METRICS_HOST}:{Config.METRICS_PORT}/metrics")
         logger.info("-" * 60)
 
-        # 즉시 한 번 실행
-        monitoring_job()
-
-        # 주기적 실행 스케줄 등록
-        schedule.every(Config.CHECK_INTERVAL_SECONDS).seconds.do(monitoring_job)
-
-        logger.info(f"⏰ 스케줄 등록 완료: {Config.CHECK_INTERVAL_SECONDS}초마다 실행")
+        # 스풀 전송 시작
+        shipper.start()
 
-        # 무한 루프 (스케줄러 실행)
-        while True:
-            schedule.run_pending()
-            time.sleep(1)
+        # 대상별 주기 점검 (대상마다 위상을 나누어 첫 점검 시작)
+        asyncio.run(run_agent(targets))
 
     except KeyboardInterrupt:
         logger.info("\n⏹️ Agent 종료 (사용자 중단)")
+        if aggregator:
+            aggregator.close()
+        event_buffer.close()
+        shipper.stop()
+        spool.close()
+        backend_session.close()
 
     except Exception as e:
         logger.error(f"💥 Agent 실행 중 치명적 오류: {str(e)}")
@@ -0,0 +1,137 @@
+"""
+점검 결과 집계 (집계 모드)
+- 상태 변화(정상→장애, 장애→정상)와 대상의 첫 결과는 즉시 원본 그대로 전달
+- 그 외 결과는 대상별로 구간(AGGREGATION_WINDOW_SECONDS)마다 요약 1건으로 전달
+  (count, failures, min/max/avg, p50/p95/p99 응답 시간)
+- 상태가 바뀌면 그 대상의 구간을 먼저 요약으로 보내고 새로 시작하므로
+  요약 하나는 항상 한 가지 상태(모두 실패 또는 모두 성공)의 연속된 결과만 담음
+"""
+import math
+import threading
+import time
+from datetime import datetime
+from typing import Callable, List, Dict, Any
+from config import Config
+from logger import setup_logger
+
+# 로거
+logger = setup_logger()
+
+
+def percentile(sorted_values: List[int], p: float) -> int:
+    """정렬된 값 목록의 백분위수 (nearest-rank)"""
+    rank = max(math.ceil(p / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class ResultAggregator:
+    """상태 변화는 즉시, 나머지는 구간 요약으로 전달하는 집계기"""
+
+    def __init__(self, emit: Callable[[List[Dict[str, Any]], bool], None],
+                 window_seconds: float = Config.AGGREGATION_WINDOW_SECONDS):
+        """
+        Args:
+            emit: (결과 목록, 즉시 전송 여부)를 전달받는 함수 (블로킹되지 않아야 함)
+            window_seconds: 요약 구간 길이 (초, 시각 기준으로 정렬)
+        """
+        self.emit = emit
+        self.window_seconds = window_seconds
+
+        # 대상별 마지막 상태 (is_success)
+        self._states: Dict[str, bool] = {}
+        # 대상별 현재 구간의 응답 시간/실패 수/마지막 응답 코드
+        self._windows: Dict[str, Dict[str, Any]] = {}
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='aggregator', daemon=True)
+        self._thread.start()
+
+    def add(self, result: Dict[str, Any]) -> None:
+        """점검 결과 1건 추가"""
+        url = result['target_url']
+        is_success = result['is_success']
+
+        # 전달도 잠금 안에서 수행: 구간 요약과 상태 변화가 발생 순서대로 전달됨
+        with self._lock:
+            transition = self._states.get(url) != is_success
+            self._states[url] = is_success
+
+            if transition:
+                # 상태 변화는 구간을 기다리지 않고 즉시 전송
+                # 이전 상태의 결과가 다음 상태의 요약에 섞이지 않도록 구간을 끊어 요약을 먼저 보냄
+                events = [result]
+                pending = self._windows.pop(url, None)
+                if pending:
+                    now = time.time()
+                    window_start = math.floor(now / self.window_seconds) * self.window_seconds
+                    events.insert(0, self._summarize(url, pending, window_start, now))
+                self.emit(events, True)
+                return
+
+            window = self._windows.setdefault(url, {
+                'latencies': [],
+                'failures': 0,
+                'last_status_code': None
+            })
+            window['latencies'].append(result['response_time_ms'])
+            window['failures'] += 0 if is_success else 1
+            window['last_status_code'] = result['status_code']
+
+    def forget(self, url: str) -> None:
+        """대상 제거 시 상태 정리 (다음 결과는 첫 결과로 취급)"""
+        with self._lock:
+            self._states.pop(url, None)
+            self._windows.pop(url, None)
+
+    def flush(self, window_start: float, window_end: float) -> int:
+        """현재 구간의 대상별 요약을 전달하고 요약 개수 반환"""
+        with self._lock:
+            summaries = [self._summarize(url, window, window_start, window_end)
+                         for url, window in self._windows.items()]
+            self._windows = {}
+
+            if summaries:
+                self.emit(summaries, False)
+        return len(summaries)
+
+    @staticmethod
+    def _summarize(url: str, window: Dict[str, Any], window_start: float, window_end: float) -> Dict[str, Any]:
+        """대상 하나의 구간 요약"""
+        latencies = sorted(window['latencies'])
+        return {
+            'type': 'summary',
+            'target_url': url,
+            'window_start': datetime.utcfromtimestamp(window_start).isoformat(),
+            'window_end': datetime.utcfromtimestamp(window_end).isoformat(),
+            'count': len(latencies),
+            'failures': window['failures'],
+            'min_ms': latencies[0],
+            'max_ms': latencies[-1],
+            'avg_ms': round(sum(latencies) / len(latencies), 1),
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+            'last_status_code': window['last_status_code']
+        }
+
+    def _run(self) -> None:
+        """구간 경계(시각 기준)마다 요약 전달"""
+        window_start = math.floor(time.time() / self.window_seconds) * self.window_seconds
+
+        while True:
+            window_end = window_start + self.window_seconds
+            stopped = self._stop.wait(max(window_end - time.time(), 0))
+
+            count = self.flush(window_start, min(window_end, time.time()) if stopped else window_end)
+            if count:
+                logger.info(f"📊 구간 요약 전달: 대상 {count}개")
+
+            if stopped:
+                break
+            window_start = window_end
+
+    def close(self) -> None:
+        """집계 스레드 종료 (남은 구간 요약 전달)"""
+        self._stop.set()
+        self._thread.join()
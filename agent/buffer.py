@@ -0,0 +1,134 @@
+"""
+점검 결과 버퍼
+결과를 모아 두었다가 개수(BATCH_SIZE) 또는 대기 시간(BATCH_MAX_WAIT_SECONDS) 기준으로 한 번에 전달
+전달(스풀 기록)이 실패하면 결과를 버퍼에 되돌리고 BATCH_MAX_WAIT_SECONDS 뒤 재시도
+(실패가 계속되면 BUFFER_MAX_EVENTS를 넘는 가장 오래된 결과부터 폐기)
+"""
+import threading
+import time
+from typing import Callable, List, Dict, Any, Optional
+import metrics
+from config import Config
+from logger import setup_logger
+
+# 로거
+logger = setup_logger()
+
+
+class EventBuffer:
+    """크기/시간 기준으로 flush되는 스레드 안전 버퍼"""
+
+    def __init__(self, flush_callback: Callable[[List[Dict[str, Any]]], None],
+                 max_size: int = Config.BATCH_SIZE,
+                 max_wait: float = Config.BATCH_MAX_WAIT_SECONDS,
+                 max_events: int = Config.BUFFER_MAX_EVENTS):
+        """
+        Args:
+            flush_callback: 모인 결과 목록을 전달받는 함수 (flush 스레드에서 호출)
+            max_size: 이 개수가 모이면 즉시 flush
+            max_wait: 가장 오래된 결과가 이 시간(초)만큼 기다리면 flush (전달 실패 시 재시도 간격)
+            max_events: 버퍼 최대 결과 수 (전달 실패가 계속될 때 초과분은 오래된 것부터 폐기)
+        """
+        self.flush_callback = flush_callback
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self.max_events = max_events
+
+        # 용량 초과로 폐기한 결과 수
+        self.dropped = 0
+
+        self._events: List[Dict[str, Any]] = []
+        self._oldest_at: Optional[float] = None
+        self._urgent = False
+        self._retry_at = 0.0  # 전달 실패 후 다음 시도 시각 (monotonic)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._full = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='buffer-flusher', daemon=True)
+        self._thread.start()
+
+    def add(self, event: Dict[str, Any]) -> None:
+        """결과 1건 추가"""
+        self.add_many([event])
+
+    def add_many(self, events: List[Dict[str, Any]], urgent: bool = False) -> None:
+        """
+        결과 여러 건 추가 (flush는 flush 스레드에서 수행하므로 호출자는 블로킹되지 않음)
+
+        Args:
+            events: 추가할 결과 목록
+            urgent: True면 대기 시간을 기다리지 않고 바로 flush (상태 변화 등)
+        """
+        with self._lock:
+            if self._oldest_at is None and events:
+                self._oldest_at = time.monotonic()
+            self._events.extend(events)
+            self._enforce_limit()
+            self._urgent = self._urgent or urgent
+            wake = self._urgent or len(self._events) >= self.max_size
+
+        if wake:
+            self._full.set()
+
+    def flush(self) -> int:
+        """
+        버퍼에 남은 결과를 max_size 단위로 모두 전달하고 전달한 개수 반환
+        (전달이 실패하면 그 배치부터 버퍼 앞에 되돌리고 max_wait 뒤 재시도)
+        """
+        with self._lock:
+            events = self._events
+            self._events = []
+            self._oldest_at = None
+            self._urgent = False
+
+        for start in range(0, len(events), self.max_size):
+            try:
+                self.flush_callback(events[start:start + self.max_size])
+            except Exception as e:
+                logger.error(f"❌ 결과 기록 실패, {self.max_wait:g}초 뒤 재시도 ({len(events) - start}건): {e}")
+                self._requeue(events[start:])
+                return start
+        return len(events)
+
+    def _requeue(self, events: List[Dict[str, Any]]) -> None:
+        """전달하지 못한 결과를 순서대로 버퍼 앞에 되돌림"""
+        with self._lock:
+            self._events[:0] = events
+            self._enforce_limit()
+            self._oldest_at = time.monotonic()
+            self._retry_at = self._oldest_at + self.max_wait
+
+    def _enforce_limit(self) -> None:
+        """최대 결과 수 초과 시 가장 오래된 결과부터 폐기 (잠금 안에서 호출)"""
+        overflow = len(self._events) - self.max_events
+        if overflow > 0:
+            del self._events[:overflow]
+            self.dropped += overflow
+            metrics.BUFFER_DROPPED.inc(amount=overflow)
+            logger.error(f"🗑️ 버퍼 용량 초과: 가장 오래된 결과 폐기 ({overflow}건 유실)")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._events)
+
+    def _run(self) -> None:
+        """버퍼가 가득 차거나 대기 시간이 초과되면 flush"""
+        tick = min(self.max_wait, 1.0) / 2
+        while not self._stop.is_set():
+            self._full.wait(tick)
+            self._full.clear()
+
+            with self._lock:
+                expired = (self._oldest_at is not None
+                           and time.monotonic() - self._oldest_at >= self.max_wait)
+                full = len(self._events) >= self.max_size
+                retry_wait = time.monotonic() < self._retry_at
+            if (expired or full or self._urgent) and not retry_wait:
+                self.flush()
+
+    def close(self) -> None:
+        """flush 스레드 종료 후 남은 결과 전달"""
+        self._stop.set()
+        self._full.set()
+        self._thread.join()
+        self.flush()
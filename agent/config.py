@@ -11,31 +11,110 @@ load_dotenv()
 class Config:
     """Agent 설정"""
 
-    # 점검 대상 URL
+    # 점검 대상 URL (단일 대상, TARGETS_FILE/TARGET_URLS 미설정 시 사용)
     TARGET_URL = os.getenv('TARGET_URL', 'https://www.google.com')
 
-    # 점검 주기 (초)
+    # 점검 대상 목록 (쉼표로 구분된 URL 목록)
+    TARGET_URLS = os.getenv('TARGET_URLS', '')
+
+    # 점검 대상 목록 파일 (한 줄에 URL 하나, 설정 시 TARGET_URLS보다 우선)
+    TARGETS_FILE = os.getenv('TARGETS_FILE', '')
+
+    # 점검 대상 목록 URL (파일과 같은 형식, ETag 조건부 요청으로 변경 확인, 설정 시 TARGETS_FILE보다 우선)
+    TARGETS_URL = os.getenv('TARGETS_URL', '')
+
+    # 대상 목록 변경 확인 주기 (초, 0이면 다시 로드하지 않음)
+    TARGETS_RELOAD_SECONDS = float(os.getenv('TARGETS_RELOAD_SECONDS', '10'))
+
+    # 점검 주기 (초, 대상별 interval 옵션으로 재정의 가능)
     CHECK_INTERVAL_SECONDS = int(os.getenv('CHECK_INTERVAL_SECONDS', '30'))
 
+    # 스케줄러 통계 로그 주기 (초)
+    SCHEDULER_STATS_INTERVAL_SECONDS = float(os.getenv('SCHEDULER_STATS_INTERVAL_SECONDS', '60'))
+
     # 백엔드 서버 URL
     BACKEND_URL = os.getenv('BACKEND_URL', 'http://localhost:5000')
 
     # API 키 (백엔드 인증용)
     API_KEY = os.getenv('API_KEY', 'my-secret-key-12345')
 
-    # HTTP 요청 타임아웃 (초)
-    REQUEST_TIMEOUT = 5
+    # HTTP 요청 타임아웃 (초, 대상별 timeout 옵션으로 재정의 가능)
+    REQUEST_TIMEOUT = float(os.getenv('REQUEST_TIMEOUT', '5'))
+
+    # 점검 요청 방식 (GET 또는 HEAD, 대상별 method 옵션으로 재정의 가능)
+    PROBE_METHOD = os.getenv('PROBE_METHOD', 'GET').upper()
+
+    # 본문 최대 수신 바이트 (0이면 응답 헤더까지만 확인, 대상별 max_bytes 옵션으로 재정의 가능)
+    PROBE_MAX_BYTES = int(os.getenv('PROBE_MAX_BYTES', '0'))
+
+    # 본문 검사(expect, expect_sha256) 대상의 기본 최대 수신 바이트
+    PROBE_ASSERT_MAX_BYTES = int(os.getenv('PROBE_ASSERT_MAX_BYTES', str(1024 * 1024)))  # 1MB
+
+    # 수신 한도 이후 남은 본문이 이 크기 이하면 끝까지 읽어 keep-alive 연결 유지 (초과 시 연결 종료)
+    PROBE_DRAIN_MAX_BYTES = int(os.getenv('PROBE_DRAIN_MAX_BYTES', str(64 * 1024)))  # 64KB
+
+    # 동시 점검 최대 개수
+    MAX_CONCURRENCY = int(os.getenv('MAX_CONCURRENCY', '100'))
+
+    # keep-alive 유휴 연결 유지 시간 (초, 점검 주기보다 길어야 연결이 재사용됨)
+    KEEPALIVE_EXPIRY = float(os.getenv('KEEPALIVE_EXPIRY', '120'))
+
+    # DNS 캐시 유지 시간 (초)
+    DNS_CACHE_TTL = float(os.getenv('DNS_CACHE_TTL', '300'))
+
+    # 배치 전송 설정 (개수 또는 대기 시간 중 먼저 도달하는 기준으로 전송)
+    BATCH_SIZE = int(os.getenv('BATCH_SIZE', '500'))
+    BATCH_MAX_WAIT_SECONDS = float(os.getenv('BATCH_MAX_WAIT_SECONDS', '5'))
+
+    # 버퍼 최대 결과 수 (스풀 기록이 계속 실패할 때 메모리 제한, 초과 시 가장 오래된 결과 폐기)
+    BUFFER_MAX_EVENTS = int(os.getenv('BUFFER_MAX_EVENTS', '100000'))
+
+    # 집계 모드 (상태 변화는 즉시, 나머지는 구간 요약으로 전송)
+    AGGREGATION_ENABLED = os.getenv('AGGREGATION_ENABLED', 'false').lower() == 'true'
+    AGGREGATION_WINDOW_SECONDS = float(os.getenv('AGGREGATION_WINDOW_SECONDS', '60'))
+
+    # 적응형 점검 주기 (장애/지연 대상은 빠르게, 오래 정상인 대상은 최대 주기까지 완화)
+    ADAPTIVE_INTERVALS_ENABLED = os.getenv('ADAPTIVE_INTERVALS_ENABLED', 'false').lower() == 'true'
+    ADAPTIVE_MIN_INTERVAL_SECONDS = float(os.getenv('ADAPTIVE_MIN_INTERVAL_SECONDS', '5'))
+    ADAPTIVE_MAX_INTERVAL_SECONDS = float(os.getenv('ADAPTIVE_MAX_INTERVAL_SECONDS', '300'))
+    ADAPTIVE_STABLE_CHECKS = int(os.getenv('ADAPTIVE_STABLE_CHECKS', '10'))
+    ADAPTIVE_DEGRADED_RATIO = float(os.getenv('ADAPTIVE_DEGRADED_RATIO', '3'))
+
+    # 초당 최대 점검 시작 수 (0이면 제한 없음)
+    MAX_PROBES_PER_SECOND = float(os.getenv('MAX_PROBES_PER_SECOND', '0'))
+
+    # Agent 자체 지표 HTTP 엔드포인트 (Prometheus 형식, METRICS_PORT=0이면 사용 안 함)
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+    METRICS_PORT = int(os.getenv('METRICS_PORT', '9108'))
+    # 대상별 점검 지표 (대상이 매우 많으면 false로 전체 합계만 수집)
+    METRICS_PER_TARGET = os.getenv('METRICS_PER_TARGET', 'true').lower() == 'true'
+
+    # 스풀 설정 (백엔드 전송 전 디스크에 기록)
+    SPOOL_DIR = os.getenv('SPOOL_DIR', os.path.join(os.path.dirname(__file__), 'spool'))
+    SPOOL_SEGMENT_MAX_BYTES = int(os.getenv('SPOOL_SEGMENT_MAX_BYTES', str(4 * 1024 * 1024)))  # 4MB
+    SPOOL_MAX_BYTES = int(os.getenv('SPOOL_MAX_BYTES', str(100 * 1024 * 1024)))  # 100MB
+    SPOOL_FSYNC = os.getenv('SPOOL_FSYNC', 'true').lower() == 'true'
+
+    # 스풀 전송 설정
+    SHIPPER_MAX_EVENTS_PER_SECOND = float(os.getenv('SHIPPER_MAX_EVENTS_PER_SECOND', '2000'))
+    SHIPPER_POLL_SECONDS = 0.5
+    SHIPPER_MAX_BACKOFF_SECONDS = float(os.getenv('SHIPPER_MAX_BACKOFF_SECONDS', '60'))
 
     # 재시도 설정
-    MAX_RETRIES = 3
     RETRY_BACKOFF_FACTOR = 2  # 지수 백오프 (2^n초)
 
 
 # 설정 검증
 def validate_config():
     """설정값 검증"""
-    if not Config.TARGET_URL:
-        raise ValueError("TARGET_URL이 설정되지 않았습니다.")
+    if not (Config.TARGET_URL or Config.TARGET_URLS or Config.TARGETS_FILE or Config.TARGETS_URL):
+        raise ValueError("TARGET_URL, TARGET_URLS, TARGETS_FILE, TARGETS_URL 중 하나는 설정되어야 합니다.")
+
+    if Config.TARGETS_URL and not Config.TARGETS_URL.startswith(('http://', 'https://')):
+        raise ValueError(f"TARGETS_URL은 http:// 또는 https://로 시작해야 합니다: {Config.TARGETS_URL}")
+
+    if Config.TARGETS_FILE and not os.path.isfile(Config.TARGETS_FILE):
+        raise ValueError(f"TARGETS_FILE을 찾을 수 없습니다: {Config.TARGETS_FILE}")
 
     if not Config.BACKEND_URL:
         raise ValueError("BACKEND_URL이 설정되지 않았습니다.")
@@ -46,4 +125,55 @@ def validate_config():
     if Config.CHECK_INTERVAL_SECONDS < 1:
         raise ValueError("CHECK_INTERVAL_SECONDS는 최소 1초 이상이어야 합니다.")
 
+    if Config.TARGETS_RELOAD_SECONDS < 0:
+        raise ValueError("TARGETS_RELOAD_SECONDS는 0 이상이어야 합니다.")
+
+    if Config.REQUEST_TIMEOUT <= 0:
+        raise ValueError("REQUEST_TIMEOUT은 0보다 커야 합니다.")
+
+    if Config.PROBE_METHOD not in ('GET', 'HEAD'):
+        raise ValueError("PROBE_METHOD는 GET 또는 HEAD여야 합니다.")
+
+    if Config.PROBE_MAX_BYTES < 0 or Config.PROBE_ASSERT_MAX_BYTES < 1 or Config.PROBE_DRAIN_MAX_BYTES < 0:
+        raise ValueError("PROBE_MAX_BYTES, PROBE_DRAIN_MAX_BYTES는 0 이상, PROBE_ASSERT_MAX_BYTES는 1 이상이어야 합니다.")
+
+    if Config.MAX_CONCURRENCY < 1:
+        raise ValueError("MAX_CONCURRENCY는 최소 1 이상이어야 합니다.")
+
+    if Config.BATCH_SIZE < 1:
+        raise ValueError("BATCH_SIZE는 최소 1 이상이어야 합니다.")
+
+    if Config.BATCH_MAX_WAIT_SECONDS <= 0:
+        raise ValueError("BATCH_MAX_WAIT_SECONDS는 0보다 커야 합니다.")
+
+    if Config.BUFFER_MAX_EVENTS < Config.BATCH_SIZE:
+        raise ValueError("BUFFER_MAX_EVENTS는 BATCH_SIZE 이상이어야 합니다.")
+
+    if Config.AGGREGATION_WINDOW_SECONDS < 1:
+        raise ValueError("AGGREGATION_WINDOW_SECONDS는 최소 1초 이상이어야 합니다.")
+
+    if Config.ADAPTIVE_MIN_INTERVAL_SECONDS < 1:
+        raise ValueError("ADAPTIVE_MIN_INTERVAL_SECONDS는 최소 1초 이상이어야 합니다.")
+
+    if Config.ADAPTIVE_MAX_INTERVAL_SECONDS < Config.ADAPTIVE_MIN_INTERVAL_SECONDS:
+        raise ValueError("ADAPTIVE_MAX_INTERVAL_SECONDS는 ADAPTIVE_MIN_INTERVAL_SECONDS 이상이어야 합니다.")
+
+    if Config.ADAPTIVE_STABLE_CHECKS < 1:
+        raise ValueError("ADAPTIVE_STABLE_CHECKS는 최소 1 이상이어야 합니다.")
+
+    if Config.ADAPTIVE_DEGRADED_RATIO <= 1:
+        raise ValueError("ADAPTIVE_DEGRADED_RATIO는 1보다 커야 합니다.")
+
+    if Config.MAX_PROBES_PER_SECOND < 0:
+        raise ValueError("MAX_PROBES_PER_SECOND는 0 이상이어야 합니다.")
+
+    if not 0 <= Config.METRICS_PORT <= 65535:
+        raise ValueError("METRICS_PORT는 0~65535 범위여야 합니다.")
+
+    if Config.SPOOL_MAX_BYTES < Config.SPOOL_SEGMENT_MAX_BYTES * 2:
+        raise ValueError("SPOOL_MAX_BYTES는 SPOOL_SEGMENT_MAX_BYTES의 2배 이상이어야 합니다.")
+
+    if Config.SHIPPER_MAX_EVENTS_PER_SECOND <= 0:
+        raise ValueError("SHIPPER_MAX_EVENTS_PER_SECOND는 0보다 커야 합니다.")
+
     return True
@@ -0,0 +1,205 @@
+"""
+공유 HTTP 연결 관리
+- 점검용 비동기 클라이언트: keep-alive 연결 풀 + DNS 캐시 + 구간별 응답 시간 측정
+- 백엔드 전송용 동기 세션: keep-alive 연결 풀
+"""
+import asyncio
+import ipaddress
+import socket
+import time
+from contextvars import ContextVar
+from typing import List, Dict, Any, Optional, Tuple
+import httpcore
+import httpx
+import requests
+from config import Config
+
+# 현재 요청의 구간별 응답 시간 (요청을 실행하는 태스크 안에서만 유효)
+current_timing: ContextVar[Optional[Dict[str, Any]]] = ContextVar('current_timing', default=None)
+
+
+def new_timing() -> Dict[str, Any]:
+    """
+    구간별 응답 시간 초기값
+
+    Returns:
+        dict: 구간별 응답 시간 (밀리초)
+            - dns_ms: DNS 조회 시간 (캐시 적중 시 0)
+            - connect_ms: TCP 연결 시간
+            - tls_ms: TLS 핸드셰이크 시간
+            - ttfb_ms: 요청 전송 후 응답 헤더 수신까지 시간
+            - total_ms: 전체 응답 시간
+            - connection_reused: 기존 keep-alive 연결 재사용 여부
+    """
+    return {
+        'dns_ms': 0,
+        'connect_ms': 0,
+        'tls_ms': 0,
+        'ttfb_ms': 0,
+        'total_ms': 0,
+        'connection_reused': True
+    }
+
+
+def _elapsed_ms(start: float) -> int:
+    """시작 시각 이후 경과 시간 (밀리초)"""
+    return int((time.perf_counter() - start) * 1000)
+
+
+class DNSCache:
+    """TTL 기반 비동기 DNS 캐시 (동일 호스트 동시 조회는 한 번만 수행)"""
+
+    def __init__(self, ttl: float = Config.DNS_CACHE_TTL):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self._pending: Dict[Tuple[str, int], asyncio.Future] = {}
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        """호스트 이름을 IP 주소 목록으로 변환"""
+        key = (host, port)
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        # 이미 같은 호스트를 조회 중이면 그 결과를 기다림
+        if key in self._pending:
+            return await asyncio.shield(self._pending[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            addresses = list(dict.fromkeys(info[4][0] for info in infos))
+            self._entries[key] = (time.monotonic() + self.ttl, addresses)
+            future.set_result(addresses)
+            return addresses
+        except Exception as e:
+            future.set_exception(e)
+            # 대기자가 없을 때 "never retrieved" 경고 방지
+            future.exception()
+            raise
+        finally:
+            # 조회 태스크가 취소된 경우 대기 중인 태스크도 함께 해제
+            if not future.done():
+                future.cancel()
+            del self._pending[key]
+
+    def clear(self) -> None:
+        """캐시 비우기"""
+        self._entries.clear()
+
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """DNS 캐시를 거쳐 TCP 연결을 여는 httpcore 네트워크 백엔드"""
+
+    def __init__(self, dns_cache: DNSCache):
+        self.dns_cache = dns_cache
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        timing = current_timing.get()
+
+        # DNS 조회 (IP 주소는 그대로 사용)
+        start_time = time.perf_counter()
+        try:
+            ipaddress.ip_address(host)
+            addresses = [host]
+        except ValueError:
+            try:
+                addresses = await self.dns_cache.resolve(host, port)
+            except socket.gaierror as e:
+                raise httpcore.ConnectError(f"DNS resolution failed for {host}: {e}") from e
+        finally:
+            if timing is not None:
+                timing['dns_ms'] = _elapsed_ms(start_time)
+
+        # 조회된 주소를 순서대로 시도
+        last_error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+
+        raise last_error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class PooledTransport(httpx.AsyncHTTPTransport):
+    """DNS 캐시 네트워크 백엔드를 사용하는 keep-alive 연결 풀 트랜스포트"""
+
+    def __init__(self, limits: httpx.Limits, dns_cache: DNSCache):
+        super().__init__(limits=limits)
+        # httpx는 network_backend 옵션을 노출하지 않으므로 같은 설정으로 풀을 다시 생성
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=CachingNetworkBackend(dns_cache)
+        )
+
+
+async def trace_phases(event_name: str, info: Dict[str, Any]) -> None:
+    """httpcore trace 이벤트로 구간별 시간 기록 (httpx trace 확장 콜백)"""
+    timing = current_timing.get()
+    if timing is None:
+        return
+
+    marks = timing.setdefault('_marks', {})
+    now = time.perf_counter()
+
+    if event_name == 'connection.connect_tcp.started':
+        timing['connection_reused'] = False
+        marks['connect'] = now
+    elif event_name == 'connection.connect_tcp.complete':
+        # connect_tcp 구간에는 DNS 조회 시간이 포함되어 있음
+        timing['connect_ms'] = max(_elapsed_ms(marks['connect']) - timing['dns_ms'], 0)
+    elif event_name == 'connection.start_tls.started':
+        marks['tls'] = now
+    elif event_name == 'connection.start_tls.complete':
+        timing['tls_ms'] = _elapsed_ms(marks['tls'])
+    elif event_name.endswith('send_request_headers.started'):
+        marks['request'] = now
+    elif event_name.endswith('receive_response_headers.complete') and 'request' in marks:
+        timing['ttfb_ms'] = _elapsed_ms(marks['request'])
+
+
+def finish_timing(timing: Dict[str, Any], total_ms: int) -> Dict[str, Any]:
+    """측정 종료: 전체 시간(보고하는 response_time_ms와 같은 값) 기록 및 내부 기록 제거"""
+    timing.pop('_marks', None)
+    timing['total_ms'] = total_ms
+    return timing
+
+
+def create_probe_client(max_connections: int) -> httpx.AsyncClient:
+    """점검용 공유 비동기 클라이언트 생성"""
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=Config.KEEPALIVE_EXPIRY
+    )
+    transport = PooledTransport(limits=limits, dns_cache=DNSCache())
+
+    return httpx.AsyncClient(transport=transport, follow_redirects=True)
+
+
+def create_backend_session() -> requests.Session:
+    """백엔드 전송용 keep-alive 세션 생성"""
+    session = requests.Session()
+    session.headers.update({
+        'Content-Type': 'application/json',
+        'X-API-Key': Config.API_KEY
+    })
+    return session
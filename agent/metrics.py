@@ -0,0 +1,223 @@
+"""
+Agent 자체 지표 (Prometheus 텍스트 형식)
+- 점검 경로에서 갱신되므로 값 갱신은 잠금 없이 dict/list 연산만 수행
+  (각 지표는 한 스레드에서만 갱신: 점검/스케줄러 지표는 이벤트 루프, 전송 지표는 전송 스레드,
+   스풀 폐기 지표는 스풀 잠금 안)
+- 버퍼/스풀 대기 건수처럼 현재 상태는 수집(scrape) 시점에 콜백으로 계산
+- METRICS_PORT로 로컬 HTTP 엔드포인트(/metrics) 제공
+"""
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Dict, Tuple, Optional
+from config import Config
+from logger import setup_logger
+
+# 로거
+logger = setup_logger()
+
+# 응답 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    """라벨 문자열 ({name="value",...})"""
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """지표 공통 (이름, 설명, 라벨 이름)"""
+
+    type_name = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type_name}']
+        lines.extend(self.samples())
+        return lines
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """누적 카운터"""
+
+    type_name = 'counter'
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        # 라벨 없는 카운터는 처음부터 0을 출력 (첫 증가 전후로 rate()가 계산되도록)
+        self._values: Dict[Tuple[str, ...], float] = {} if labels else {(): 0}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def remove(self, *label_values: str) -> None:
+        self._values.pop(label_values, None)
+
+    def samples(self) -> List[str]:
+        return [f'{self.name}{_format_labels(self.labels, key)} {_format_value(value)}'
+                for key, value in list(self._values.items())]
+
+
+class Gauge(Metric):
+    """현재 값 (수집 시점에 callback으로 계산, 라벨 없음)"""
+
+    type_name = 'gauge'
+
+    def __init__(self, name: str, documentation: str, callback: Optional[Callable[[], float]] = None):
+        super().__init__(name, documentation)
+        self.callback = callback
+
+    def samples(self) -> List[str]:
+        if self.callback is None:
+            return []
+        try:
+            return [f'{self.name} {_format_value(self.callback())}']
+        except Exception as e:
+            logger.error(f"⚠️ 지표 계산 실패: {self.name} - {str(e)}")
+            return []
+
+
+class Histogram(Metric):
+    """구간별 누적 분포 (라벨 값마다 구간 카운트, 합계, 개수)"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = buckets
+        # 라벨 값 → [구간별 개수..., +Inf 개수, 합계]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def remove(self, *label_values: str) -> None:
+        self._series.pop(label_values, None)
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, series in list(self._series.items()):
+            series = list(series)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labels, key)} {_format_value(series[-1])}')
+            lines.append(f'{self.name}_count{_format_labels(self.labels, key)} {cumulative}')
+        return lines
+
+
+class Registry:
+    """지표 목록 및 텍스트 출력"""
+
+    def __init__(self):
+        self._metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+# 점검
+PROBES = registry.register(Counter(
+    'agent_probes_total', '점검 횟수 (result: success, failure)', ('target', 'result')))
+PROBE_DURATION = registry.register(Histogram(
+    'agent_probe_duration_seconds', '대상별 점검 응답 시간', ('target',)))
+
+# 스케줄러
+SCHEDULER_LAG = registry.register(Histogram(
+    'agent_scheduler_lag_seconds', '예정 시각과 실제 점검 시작 시각의 차이'))
+SCHEDULER_SKIPPED = registry.register(Counter(
+    'agent_scheduler_skipped_total', '이전 점검이 진행 중이라 건너뛴 회차 수'))
+PROBES_IN_FLIGHT = registry.register(Gauge(
+    'agent_probes_in_flight', '실행 중인 점검 수'))
+TARGETS = registry.register(Gauge(
+    'agent_targets', '점검 대상 수'))
+
+# 버퍼/스풀
+BUFFER_DEPTH = registry.register(Gauge(
+    'agent_buffer_events', '버퍼에 대기 중인 결과 수'))
+BUFFER_DROPPED = registry.register(Counter(
+    'agent_buffer_dropped_events_total', '스풀 기록 실패가 계속되어 버퍼 용량 초과로 폐기된 결과 수'))
+SPOOL_DEPTH = registry.register(Gauge(
+    'agent_spool_pending_events', '스풀에 남아 있는 미전송 결과 수'))
+SPOOL_DROPPED = registry.register(Counter(
+    'agent_spool_dropped_events_total', '스풀 용량 초과로 폐기된 결과 수'))
+
+# 백엔드 전송
+BACKEND_SEND_DURATION = registry.register(Histogram(
+    'agent_backend_send_duration_seconds', '백엔드 배치 전송 응답 시간'))
+BACKEND_SENT_EVENTS = registry.register(Counter(
+    'agent_backend_sent_events_total', '백엔드가 처리한 결과 수'))
+BACKEND_SEND_ERRORS = registry.register(Counter(
+    'agent_backend_send_errors_total', '백엔드 전송 오류 수 (reason: http_<code>, connection, timeout, unexpected)',
+    ('reason',)))
+
+
+def target_label(url: str) -> str:
+    """대상 라벨 값 (METRICS_PER_TARGET=false면 전체를 하나로 집계)"""
+    return url if Config.METRICS_PER_TARGET else 'all'
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics 요청 처리"""
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+
+        body = registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 수집 요청마다 로그를 남기지 않음
+        pass
+
+
+def start_metrics_server(host: str = Config.METRICS_HOST,
+                         port: int = Config.METRICS_PORT) -> ThreadingHTTPServer:
+    """지표 HTTP 서버를 별도 스레드에서 시작"""
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True)
+    thread.start()
+    return server
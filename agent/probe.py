@@ -0,0 +1,220 @@
+"""
+asyncio 기반 점검 엔진
+공유 keep-alive 클라이언트로 대상 URL을 점검 (동시 실행 제한과 실행 시점은 ProbeScheduler가 관리)
+- 응답은 스트리밍으로 받아 헤더 수신 후 또는 max_bytes까지만 읽음 (본문 전체를 메모리에 올리지 않음)
+- 본문 검사(포함 문자열, SHA-256)는 수신하는 청크 단위로 수행
+"""
+import asyncio
+import hashlib
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional
+import httpx
+from config import Config
+from logger import setup_logger
+from http_client import create_probe_client, current_timing, new_timing, finish_timing, trace_phases
+
+# 로거
+logger = setup_logger()
+
+
+class BodyAssertion:
+    """스트리밍 본문 검사 (청크 단위로 포함 문자열 탐색 및 SHA-256 계산)"""
+
+    def __init__(self, expect: Optional[str] = None, expect_sha256: Optional[str] = None):
+        self.expect = expect.encode('utf-8') if expect else None
+        self.expect_sha256 = expect_sha256
+        self.found = self.expect is None
+        self._tail = b''
+        self._hash = hashlib.sha256() if expect_sha256 else None
+
+    def feed(self, chunk: bytes) -> None:
+        """수신한 청크 반영 (청크 경계에 걸친 문자열도 찾도록 이전 청크 끝부분을 유지)"""
+        if self._hash is not None:
+            self._hash.update(chunk)
+
+        if not self.found:
+            data = self._tail + chunk
+            self.found = self.expect in data
+            self._tail = data[-(len(self.expect) - 1):] if len(self.expect) > 1 else b''
+
+    def error(self) -> Optional[str]:
+        """검사 실패 메시지 (통과하면 None)"""
+        if not self.found:
+            return f"Content assertion failed: expected text not found: {self.expect.decode('utf-8')}"
+        if self._hash is not None and self._hash.hexdigest() != self.expect_sha256:
+            return f"Content assertion failed: sha256 mismatch ({self._hash.hexdigest()})"
+        return None
+
+
+class ProbeEngine:
+    """대상 URL 점검 엔진"""
+
+    def __init__(self, max_concurrency: int = Config.MAX_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def get_client(self) -> httpx.AsyncClient:
+        """점검 간 keep-alive 연결을 유지하는 공유 클라이언트 반환"""
+        if self._client is None:
+            self._client = create_probe_client(max_connections=self.max_concurrency)
+        return self._client
+
+    async def aclose(self) -> None:
+        """공유 클라이언트 종료"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _fetch(self, client: httpx.AsyncClient, target: Dict[str, Any], timeout: float,
+                     start_time: float) -> Dict[str, Any]:
+        """
+        스트리밍 요청: 응답 헤더 수신 후 max_bytes까지만 본문을 읽고 검사
+
+        Returns:
+            dict: status_code, headers_ms(헤더 수신까지), body_ms(본문 수신), body_bytes, assertion_error
+        """
+        method = target.get('method', 'GET')
+        max_bytes = 0 if method == 'HEAD' else target.get('max_bytes', 0)
+
+        headers = {}
+        if target.get('range') and max_bytes > 0:
+            headers['Range'] = f'bytes=0-{max_bytes - 1}'
+
+        request = client.build_request(method, target['url'], headers=headers, timeout=timeout,
+                                       extensions={'trace': trace_phases})
+        response = await client.send(request, stream=True)
+
+        try:
+            headers_done = time.perf_counter()
+            assertion = BodyAssertion(target.get('expect'), target.get('expect_sha256'))
+            received = 0
+            chunks = response.aiter_bytes()
+
+            if max_bytes > 0:
+                async for chunk in chunks:
+                    chunk = chunk[:max_bytes - received]
+                    assertion.feed(chunk)
+                    received += len(chunk)
+                    if received >= max_bytes:
+                        break
+
+            body_done = time.perf_counter()
+
+            # 남은 본문이 PROBE_DRAIN_MAX_BYTES 이하면 끝까지 읽어 연결을 풀에 반환
+            # (HEAD는 본문이 없으므로 항상 반환, 길이를 모르는 chunked 본문은 한도까지 읽어 보고 넘으면 닫음)
+            content_length = response.headers.get('content-length', '')
+            if method == 'HEAD':
+                remaining = 0
+            elif content_length.isdigit():
+                remaining = int(content_length) - response.num_bytes_downloaded
+            else:
+                remaining = None
+            if remaining is None or remaining <= Config.PROBE_DRAIN_MAX_BYTES:
+                drained = 0
+                async for chunk in chunks:
+                    drained += len(chunk)
+                    if drained > Config.PROBE_DRAIN_MAX_BYTES:
+                        break
+
+            return {
+                'status_code': response.status_code,
+                'headers_ms': int((headers_done - start_time) * 1000),
+                'body_ms': int((body_done - headers_done) * 1000),
+                'body_bytes': received,
+                'assertion_error': assertion.error() if max_bytes > 0 else None
+            }
+        finally:
+            await response.aclose()
+
+    async def check_url(self, client: httpx.AsyncClient, target: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        대상 URL 점검
+
+        Args:
+            client: 공유 HTTP 클라이언트
+            target: 점검 대상 (url, timeout, method, max_bytes, range, expect, expect_sha256)
+
+        Returns:
+            dict: 점검 결과
+                - target_url: 점검 대상 URL
+                - status_code: HTTP 응답 코드 (None if error)
+                - response_time_ms: 응답 시간 (밀리초, headers_ms + body_ms)
+                - timestamp: 점검 시각
+                - is_success: 정상 여부
+                - error_message: 에러 메시지 (있을 경우)
+                - dns_ms, connect_ms, tls_ms, ttfb_ms: 구간별 응답 시간 (밀리초)
+                - total_ms: 전체 응답 시간 (밀리초, response_time_ms와 같음)
+                - headers_ms: 응답 헤더 수신까지 시간 (밀리초)
+                - body_ms: 헤더 이후 본문 수신 시간 (밀리초, max_bytes까지)
+                - body_bytes: 수신한 본문 바이트 수
+                - connection_reused: keep-alive 연결 재사용 여부
+        """
+        url = target['url']
+        timeout = target.get('timeout', Config.REQUEST_TIMEOUT)
+
+        result = {
+            'target_url': url,
+            'status_code': None,
+            'response_time_ms': 0,
+            'timestamp': datetime.utcnow().isoformat(),
+            'is_success': False,
+            'error_message': None,
+            'headers_ms': None,
+            'body_ms': None,
+            'body_bytes': 0
+        }
+
+        # 구간별 시간 측정 (trace 콜백과 네트워크 백엔드가 이 태스크의 timing에 기록)
+        timing = new_timing()
+        current_timing.set(timing)
+
+        # 시작 시간 기록
+        start_time = time.perf_counter()
+
+        try:
+            # HTTP 요청 (본문 수신까지 포함한 전체 시간을 timeout으로 제한)
+            fetched = await asyncio.wait_for(self._fetch(client, target, timeout, start_time), timeout=timeout)
+
+            # 응답 시간 계산 (밀리초, 연결 유지를 위해 남은 본문을 읽은 시간은 제외)
+            response_time_ms = fetched['headers_ms'] + fetched['body_ms']
+            status_code = fetched['status_code']
+
+            # 결과 설정
+            result['status_code'] = status_code
+            result['response_time_ms'] = response_time_ms
+            result['headers_ms'] = fetched['headers_ms']
+            result['body_ms'] = fetched['body_ms']
+            result['body_bytes'] = fetched['body_bytes']
+            result['is_success'] = 200 <= status_code < 400 and fetched['assertion_error'] is None
+            result['error_message'] = fetched['assertion_error']
+
+            if result['error_message']:
+                logger.warning(f"🔎 본문 검사 실패: {url} - {status_code} {result['error_message']}")
+            else:
+                logger.info(f"✅ URL 점검 성공: {url} - {status_code} ({response_time_ms}ms)")
+
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            result['response_time_ms'] = int(timeout * 1000)
+            result['error_message'] = f"Request timed out after {timeout}s"
+            logger.warning(f"⏱️ 타임아웃: {url} - {result['error_message']}")
+
+        except httpx.ConnectError as e:
+            result['error_message'] = f"Connection error: {str(e)}"
+            logger.error(f"🔌 연결 실패: {url} - {result['error_message']}")
+
+        except httpx.HTTPError as e:
+            result['error_message'] = f"Request error: {str(e)}"
+            logger.error(f"❌ 요청 실패: {url} - {result['error_message']}")
+
+        except Exception as e:
+            result['error_message'] = f"Unexpected error: {str(e)}"
+            logger.error(f"⚠️ 예상치 못한 오류: {url} - {result['error_message']}")
+
+        finally:
+            current_timing.set(None)
+
+        # 실패한 경우에도 완료된 구간(DNS, 연결 등)은 그대로 보고, 전체 시간은 response_time_ms와 같음
+        result.update(finish_timing(timing, result['response_time_ms']))
+
+        return result
@@ -0,0 +1,305 @@
+"""
+대상별 점검 스케줄러 (heap 기반)
+- 대상마다 점검 주기를 따로 두고, 다음 실행 시각을 "예정 시각 + 주기"로 계산하여 누적 지연(drift) 없음
+- URL 해시로 정한 위상(phase)만큼 첫 실행을 분산하여 대상이 같은 초에 몰리지 않음
+- 이전 점검이 끝나지 않은 대상은 이번 회차를 건너뜀 (중첩 실행 방지)
+- 예정 시각과 실제 시작 시각의 차이(스케줄 지연)를 집계
+- 적응형 주기 정책이 있으면 점검 결과에 따라 대상별 주기를 조정 (장애 감지 시 즉시 앞당김)
+- 초당 점검 시작 수 제한 (토큰 버킷, 가장 이른 예정 시각부터 실행)
+"""
+import asyncio
+import heapq
+import itertools
+import math
+import zlib
+from typing import Callable, List, Dict, Any, Optional, Tuple
+import metrics
+from adaptive import AdaptiveIntervalPolicy
+from config import Config
+from logger import setup_logger
+from probe import ProbeEngine
+
+# 로거
+logger = setup_logger()
+
+
+def phase_offset(url: str, interval: float) -> float:
+    """URL별 고정 위상 (0 ~ interval 초, 재시작해도 동일)"""
+    return (zlib.crc32(url.encode('utf-8')) % 10000) / 10000 * interval
+
+
+class SchedulerStats:
+    """스케줄 지연 및 실행 통계 (로그 주기마다 초기화)"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.started = 0
+        self.skipped = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+
+    def record_start(self, lag: float) -> None:
+        self.started += 1
+        self.lag_total += lag
+        self.lag_max = max(self.lag_max, lag)
+
+    @property
+    def lag_avg(self) -> float:
+        return self.lag_total / self.started if self.started else 0.0
+
+
+class ProbeBudget:
+    """초당 점검 시작 수 제한 (토큰 버킷, 최대 1초 분량까지 누적)"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._tokens = rate
+        self._updated_at: Optional[float] = None
+
+    def wait_time(self, now: float) -> float:
+        """토큰 1개를 얻기까지 기다려야 하는 시간 (초, 0이면 바로 사용 가능)"""
+        if self._updated_at is not None:
+            self._tokens = min(self._tokens + (now - self._updated_at) * self.rate, self.rate)
+        self._updated_at = now
+        return 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    def consume(self) -> None:
+        self._tokens -= 1
+
+
+class ProbeScheduler:
+    """대상별 주기 점검 스케줄러"""
+
+    def __init__(self, engine: ProbeEngine, on_result: Callable[[Dict[str, Any]], None],
+                 max_concurrency: int = Config.MAX_CONCURRENCY,
+                 policy: Optional[AdaptiveIntervalPolicy] = None,
+                 max_probes_per_second: float = Config.MAX_PROBES_PER_SECOND):
+        """
+        Args:
+            engine: 점검 엔진
+            on_result: 점검 결과를 전달받는 함수 (이벤트 루프에서 호출되므로 블로킹되지 않아야 함)
+            max_concurrency: 동시 점검 최대 개수
+            policy: 적응형 주기 정책 (없으면 대상별 고정 주기)
+            max_probes_per_second: 초당 최대 점검 시작 수 (0이면 제한 없음)
+        """
+        self.engine = engine
+        self.on_result = on_result
+        self.max_concurrency = max_concurrency
+        self.policy = policy
+        self.budget = ProbeBudget(max_probes_per_second) if max_probes_per_second > 0 else None
+        self.stats = SchedulerStats()
+
+        # (예정 시각, 순번, URL, 세대) - 세대가 다른 항목은 제거/변경된 대상의 이전 일정
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._counter = itertools.count()
+        self._targets: Dict[str, Dict[str, Any]] = {}
+        self._generations: Dict[str, int] = {}
+        # 대상별 다음 예정 시각 (적응형 주기로 앞당길 때 비교용)
+        self._next_at: Dict[str, float] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopped = False
+
+    @property
+    def in_flight(self) -> int:
+        """실행 중인 점검 수"""
+        return len(self._running)
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def _now(self) -> float:
+        return self._loop.time()
+
+    def _push(self, url: str, due: float) -> None:
+        self._next_at[url] = due
+        heapq.heappush(self._heap, (due, next(self._counter), url, self._generations[url]))
+
+    def add_target(self, target: Dict[str, Any]) -> None:
+        """대상 추가 (첫 실행은 현재 시각 + URL별 위상)"""
+        url = target['url']
+        self._targets[url] = target
+        self._generations[url] = self._generations.get(url, 0) + 1
+        self._push(url, self._now() + phase_offset(url, target['interval']))
+        self._wakeup.set()
+
+    def remove_target(self, url: str) -> None:
+        """대상 제거 (heap의 이전 일정은 세대 불일치로 무시됨)"""
+        if self._targets.pop(url, None) is not None:
+            self._generations[url] += 1
+            self._next_at.pop(url, None)
+            if self.policy:
+                self.policy.forget(url)
+            if Config.METRICS_PER_TARGET:
+                metrics.PROBES.remove(url, 'success')
+                metrics.PROBES.remove(url, 'failure')
+                metrics.PROBE_DURATION.remove(url)
+
+    def update_targets(self, targets: List[Dict[str, Any]]) -> Tuple[List[str], List[str], List[str]]:
+        """
+        새 대상 목록을 변경분만 반영 (변경 없는 대상은 일정/위상 유지)
+
+        Returns:
+            tuple: (추가된 URL 목록, 제거된 URL 목록, 설정이 바뀐 URL 목록)
+        """
+        new_targets = {target['url']: target for target in targets}
+        removed = [url for url in self._targets if url not in new_targets]
+        added, changed = [], []
+
+        for url in removed:
+            self.remove_target(url)
+
+        now = self._now()
+        for url, target in new_targets.items():
+            current = self._targets.get(url)
+            if current is None:
+                self.add_target(target)
+                added.append(url)
+            elif current != target:
+                self._targets[url] = target
+                changed.append(url)
+                if current['interval'] != target['interval']:
+                    # 주기가 바뀌면 다음 점검을 새 주기 이내로 당기되, 이미 더 이르면 그대로 둠
+                    next_due = min(self._next_at.get(url, now), now + target['interval'])
+                    self._generations[url] += 1
+                    self._push(url, next_due)
+                    self._wakeup.set()
+
+        return added, removed, changed
+
+    def interval_for(self, target: Dict[str, Any]) -> float:
+        """대상의 현재 점검 주기 (적응형 정책이 없으면 대상 설정값)"""
+        return self.policy.interval_for(target) if self.policy else target['interval']
+
+    def _next_due(self, due: float, interval: float, now: float) -> float:
+        """다음 예정 시각 (많이 밀린 경우 지난 회차는 건너뛰고 위상 유지)"""
+        next_due = due + interval
+        if next_due <= now:
+            next_due += math.ceil((now - next_due) / interval) * interval
+        return next_due
+
+    async def run(self, targets: List[Dict[str, Any]]) -> None:
+        """스케줄러 실행 (stop 호출 전까지 반환하지 않음)"""
+        self._loop = asyncio.get_running_loop()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._wakeup = asyncio.Event()
+
+        for target in targets:
+            self.add_target(target)
+
+        next_stats_at = self._now() + Config.SCHEDULER_STATS_INTERVAL_SECONDS
+
+        while not self._stopped:
+            now = self._now()
+
+            if now >= next_stats_at:
+                self._log_stats()
+                next_stats_at = now + Config.SCHEDULER_STATS_INTERVAL_SECONDS
+
+            if self._heap and self._heap[0][0] <= now and self.budget:
+                # 초당 점검 수 제한: 토큰이 생길 때까지 대기 (밀린 점검은 스케줄 지연으로 집계)
+                budget_wait = self.budget.wait_time(now)
+                if budget_wait > 0:
+                    await asyncio.sleep(min(budget_wait, max(next_stats_at - now, 0)))
+                    continue
+
+            if not self._heap or self._heap[0][0] > now:
+                # 다음 예정 시각(또는 통계 로그 시각)까지 대기, 대상 변경 시 즉시 깨어남
+                wait_until = min(self._heap[0][0] if self._heap else next_stats_at, next_stats_at)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=max(wait_until - now, 0))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            due, _, url, generation = heapq.heappop(self._heap)
+            if url not in self._targets or self._generations[url] != generation:
+                continue
+
+            target = self._targets[url]
+            self._push(url, self._next_due(due, self.interval_for(target), now))
+
+            if url in self._running:
+                # 이전 점검이 아직 진행 중이면 이번 회차는 건너뜀
+                self.stats.skipped += 1
+                metrics.SCHEDULER_SKIPPED.inc()
+                logger.warning(f"⏭️ 이전 점검 진행 중, 이번 회차 건너뜀: {url}")
+                continue
+
+            if self.budget:
+                self.budget.consume()
+
+            task = self._loop.create_task(self._probe(target, due), name=url)
+            self._running[url] = task
+            task.add_done_callback(self._on_probe_done)
+
+    async def _probe(self, target: Dict[str, Any], due: float) -> None:
+        """동시 실행 제한 안에서 점검 후 결과 전달"""
+        async with self._semaphore:
+            lag = self._now() - due
+            self.stats.record_start(lag)
+            metrics.SCHEDULER_LAG.observe(lag)
+            result = await self.engine.check_url(self.engine.get_client(), target)
+
+        label = metrics.target_label(target['url'])
+        metrics.PROBES.inc(label, 'success' if result['is_success'] else 'failure')
+        metrics.PROBE_DURATION.observe(result['response_time_ms'] / 1000, label)
+
+        if self.policy:
+            self._adapt(target, due, result)
+
+        try:
+            self.on_result(result)
+        except Exception as e:
+            logger.error(f"⚠️ 점검 결과 처리 중 오류: {target['url']} - {str(e)}")
+
+    def _adapt(self, target: Dict[str, Any], due: float, result: Dict[str, Any]) -> None:
+        """점검 결과를 정책에 반영하고, 주기가 짧아졌으면 다음 점검을 앞당김"""
+        url = target['url']
+        if self._targets.get(url) is not target:
+            # 점검 중 제거/변경된 대상
+            return
+
+        self.policy.record(result)
+        next_due = max(due + self.interval_for(target), self._now())
+        if next_due < self._next_at.get(url, math.inf):
+            # 기존 일정은 세대 불일치로 무시됨
+            self._generations[url] += 1
+            self._push(url, next_due)
+            self._wakeup.set()
+
+    def _on_probe_done(self, task: asyncio.Task) -> None:
+        """점검 완료 시 실행 중 목록에서 제거 (같은 URL의 새 점검이면 유지)"""
+        url = task.get_name()
+        if self._running.get(url) is task:
+            del self._running[url]
+
+    def _log_stats(self) -> None:
+        """스케줄 지연 통계 로그"""
+        stats = self.stats
+        adaptive = ''
+        if self.policy:
+            intervals = [(self.interval_for(t), t['interval']) for t in self._targets.values()]
+            faster = sum(1 for current, base in intervals if current < base)
+            slower = sum(1 for current, base in intervals if current > base)
+            adaptive = f", 빠른 점검 {faster}개 / 완화 {slower}개"
+        logger.info(
+            f"⏱️ 스케줄러: 대상 {len(self._targets)}개, 점검 {stats.started}건, "
+            f"건너뜀 {stats.skipped}건, 실행 중 {self.in_flight}건, "
+            f"지연 평균 {stats.lag_avg * 1000:.0f}ms / 최대 {stats.lag_max * 1000:.0f}ms{adaptive}"
+        )
+        stats.reset()
+
+    async def stop(self) -> None:
+        """스케줄러 중지 및 실행 중인 점검 완료 대기"""
+        self._stopped = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+        if self._running:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
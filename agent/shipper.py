@@ -0,0 +1,75 @@
+"""
+스풀 전송기
+스풀에 쌓인 점검 결과를 별도 스레드에서 순서대로 백엔드로 전송
+(실패 시 지수 백오프, 재전송 속도 제한)
+"""
+import threading
+import time
+from typing import Callable, List, Dict, Any
+from config import Config
+from logger import setup_logger
+from spool import Spool
+
+# 로거
+logger = setup_logger()
+
+
+class SpoolShipper:
+    """스풀 → 백엔드 전송 스레드"""
+
+    def __init__(self, spool: Spool, send_batch: Callable[[List[Dict[str, Any]]], bool],
+                 batch_size: int = Config.BATCH_SIZE,
+                 max_events_per_second: float = Config.SHIPPER_MAX_EVENTS_PER_SECOND):
+        """
+        Args:
+            spool: 전송할 스풀
+            send_batch: 배치 전송 함수 (처리 완료 시 True, 재시도가 필요하면 False)
+            batch_size: 한 번에 전송할 최대 이벤트 수
+            max_events_per_second: 초당 최대 전송 이벤트 수 (백엔드 복구 직후 몰림 방지)
+        """
+        self.spool = spool
+        self.send_batch = send_batch
+        self.batch_size = batch_size
+        self.max_events_per_second = max_events_per_second
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='spool-shipper', daemon=True)
+
+    def start(self) -> None:
+        """전송 스레드 시작"""
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """전송 스레드 종료 (진행 중인 전송은 최대 timeout초 대기)"""
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        backoff = 1.0
+        # 속도 제한: 다음 전송이 가능한 시각
+        next_send_at = time.monotonic()
+
+        while not self._stop.is_set():
+            events, position = self.spool.read_batch(self.batch_size)
+
+            if not events:
+                # 다 읽은 세그먼트/손상된 레코드만 지나간 경우 위치만 반영
+                if position != self.spool.position:
+                    self.spool.commit(position, 0)
+                self._stop.wait(Config.SHIPPER_POLL_SECONDS)
+                continue
+
+            # 속도 제한 (배치 크기만큼 토큰 소비)
+            wait = next_send_at - time.monotonic()
+            if wait > 0 and self._stop.wait(wait):
+                break
+
+            if self.send_batch(events):
+                self.spool.commit(position, len(events))
+                backoff = 1.0
+                next_send_at = max(next_send_at, time.monotonic()) + len(events) / self.max_events_per_second
+            else:
+                # 전송 실패: 같은 배치를 백오프 후 재시도 (스풀에 남아 있으므로 유실 없음)
+                logger.info(f"🔄 {backoff:.0f}초 후 재전송 (스풀 대기 {len(self.spool)}건)")
+                self._stop.wait(backoff)
+                backoff = min(backoff * Config.RETRY_BACKOFF_FACTOR, Config.SHIPPER_MAX_BACKOFF_SECONDS)
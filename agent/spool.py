@@ -0,0 +1,228 @@
+"""
+디스크 스풀 (append-only)
+백엔드로 보낼 점검 결과를 세그먼트 파일에 JSON 한 줄씩 기록하고
+전송이 끝난 위치(offset)를 저장하여 Agent 재시작 후에도 이어서 전송
+"""
+import json
+import os
+import threading
+from typing import List, Dict, Any, Tuple
+import metrics
+from config import Config
+from logger import setup_logger
+
+# 로거
+logger = setup_logger()
+
+# 세그먼트 파일 이름 형식
+SEGMENT_PREFIX = 'segment-'
+SEGMENT_SUFFIX = '.jsonl'
+
+# 읽기 위치: (세그먼트 번호, 바이트 offset)
+Position = Tuple[int, int]
+
+
+class Spool:
+    """세그먼트 파일 기반 영속 큐 (쓰기: 버퍼 flush, 읽기: Shipper)"""
+
+    def __init__(self, directory: str = Config.SPOOL_DIR,
+                 segment_max_bytes: int = Config.SPOOL_SEGMENT_MAX_BYTES,
+                 max_total_bytes: int = Config.SPOOL_MAX_BYTES,
+                 fsync: bool = Config.SPOOL_FSYNC):
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.max_total_bytes = max_total_bytes
+        self.fsync = fsync
+
+        # 용량 제한으로 폐기한 이벤트 수
+        self.dropped = 0
+
+        self._lock = threading.Lock()
+        self._offset_path = os.path.join(directory, 'offset.json')
+
+        os.makedirs(directory, exist_ok=True)
+
+        # 기존 세그먼트 로드
+        self._sizes: Dict[int, int] = {}
+        for name in os.listdir(directory):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                seq = int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+                self._sizes[seq] = os.path.getsize(self._segment_path(seq))
+
+        # 이전 실행의 마지막 줄이 잘렸을 수 있으므로 항상 새 세그먼트에 기록
+        self._write_seq = max(self._sizes, default=0) + 1
+        self._write_file = None
+        self._open_segment(self._write_seq)
+
+        self._read_pos = self._load_offset()
+
+        self._pending = self._count_pending()
+        if self._pending:
+            logger.info(f"📦 스풀 복구: 미전송 {self._pending}건 ({self.directory})")
+
+    def _segment_path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{seq:012d}{SEGMENT_SUFFIX}")
+
+    def _open_segment(self, seq: int) -> None:
+        """쓰기용 세그먼트 열기"""
+        if self._write_file is not None:
+            self._write_file.close()
+        self._write_seq = seq
+        self._write_file = open(self._segment_path(seq), 'ab')
+        self._sizes[seq] = 0
+
+    def _load_offset(self) -> Position:
+        """저장된 읽기 위치 로드 (없으면 가장 오래된 세그먼트의 처음)"""
+        first = min(self._sizes)
+        try:
+            with open(self._offset_path, encoding='utf-8') as f:
+                data = json.load(f)
+            position = (int(data['segment']), int(data['offset']))
+        except (OSError, ValueError, KeyError):
+            return (first, 0)
+
+        # 읽던 세그먼트가 이미 삭제된 경우 그 다음 세그먼트의 처음부터
+        if position[0] not in self._sizes:
+            later = [seq for seq in self._sizes if seq > position[0]]
+            return (min(later), 0) if later else (first, 0)
+        return position
+
+    def _save_offset(self) -> None:
+        """읽기 위치 저장 (임시 파일 교체로 원자적 기록)"""
+        tmp_path = self._offset_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'segment': self._read_pos[0], 'offset': self._read_pos[1]}, f)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self._offset_path)
+
+    def _count_pending(self) -> int:
+        """읽기 위치 이후의 이벤트 수 (시작 시 1회)"""
+        count = 0
+        for seq in sorted(self._sizes):
+            if seq < self._read_pos[0]:
+                continue
+            with open(self._segment_path(seq), 'rb') as f:
+                if seq == self._read_pos[0]:
+                    f.seek(self._read_pos[1])
+                count += sum(1 for line in f if line.endswith(b'\n'))
+        return count
+
+    def append_many(self, events: List[Dict[str, Any]]) -> None:
+        """이벤트 여러 건을 한 번의 쓰기로 기록"""
+        if not events:
+            return
+
+        data = ''.join(json.dumps(event, separators=(',', ':')) + '\n' for event in events).encode('utf-8')
+
+        with self._lock:
+            # 세그먼트 크기 초과 시 새 세그먼트로 교체
+            if self._sizes[self._write_seq] and self._sizes[self._write_seq] + len(data) > self.segment_max_bytes:
+                self._open_segment(self._write_seq + 1)
+
+            self._write_file.write(data)
+            self._write_file.flush()
+            if self.fsync:
+                os.fsync(self._write_file.fileno())
+
+            self._sizes[self._write_seq] += len(data)
+            self._pending += len(events)
+            self._enforce_limit()
+
+    def _enforce_limit(self) -> None:
+        """전체 크기 제한 초과 시 가장 오래된 세그먼트부터 폐기 (쓰기 중인 세그먼트 제외)"""
+        while sum(self._sizes.values()) > self.max_total_bytes and len(self._sizes) > 1:
+            oldest = min(self._sizes)
+            start = self._read_pos[1] if oldest == self._read_pos[0] else 0
+
+            dropped = 0
+            if oldest >= self._read_pos[0]:
+                with open(self._segment_path(oldest), 'rb') as f:
+                    f.seek(start)
+                    dropped = sum(1 for line in f if line.endswith(b'\n'))
+
+            os.remove(self._segment_path(oldest))
+            del self._sizes[oldest]
+
+            if self._read_pos[0] <= oldest:
+                self._read_pos = (min(self._sizes), 0)
+                self._save_offset()
+
+            self._pending -= dropped
+            self.dropped += dropped
+            metrics.SPOOL_DROPPED.inc(amount=dropped)
+            logger.error(f"🗑️ 스풀 용량 초과: 가장 오래된 세그먼트 폐기 ({dropped}건 유실)")
+
+    def read_batch(self, max_events: int) -> Tuple[List[Dict[str, Any]], Position]:
+        """
+        읽기 위치부터 최대 max_events건 조회 (위치는 commit 전까지 그대로)
+
+        Returns:
+            tuple: (이벤트 목록, 마지막 이벤트 다음 위치)
+        """
+        events: List[Dict[str, Any]] = []
+
+        with self._lock:
+            seq, offset = self._read_pos
+
+            while len(events) < max_events and seq in self._sizes:
+                with open(self._segment_path(seq), 'rb') as f:
+                    f.seek(offset)
+                    for line in f:
+                        if not line.endswith(b'\n'):
+                            # 비정상 종료로 잘린 줄
+                            logger.warning(f"⚠️ 스풀의 잘린 레코드 무시: segment={seq}")
+                            offset += len(line)
+                            break
+
+                        offset += len(line)
+                        try:
+                            events.append(json.loads(line))
+                        except ValueError:
+                            logger.warning(f"⚠️ 스풀의 손상된 레코드 무시: segment={seq}")
+
+                        if len(events) >= max_events:
+                            break
+
+                if len(events) >= max_events or seq == self._write_seq:
+                    break
+
+                # 다 읽은 세그먼트는 다음 세그먼트로 이동
+                next_segments = [s for s in self._sizes if s > seq]
+                if not next_segments:
+                    break
+                seq, offset = min(next_segments), 0
+
+        return events, (seq, offset)
+
+    def commit(self, position: Position, count: int) -> None:
+        """전송 완료 위치 저장 및 다 읽은 세그먼트 삭제"""
+        with self._lock:
+            for seq in [s for s in self._sizes if s < position[0]]:
+                os.remove(self._segment_path(seq))
+                del self._sizes[seq]
+
+            # 전송 중 용량 제한으로 위치가 앞당겨진 경우 그대로 유지
+            if position >= self._read_pos:
+                self._read_pos = position
+                self._pending = max(self._pending - count, 0)
+            self._save_offset()
+
+    @property
+    def position(self) -> Position:
+        """현재 읽기 위치"""
+        with self._lock:
+            return self._read_pos
+
+    def __len__(self) -> int:
+        """미전송 이벤트 수"""
+        with self._lock:
+            return self._pending
+
+    def close(self) -> None:
+        """쓰기 세그먼트 닫기"""
+        with self._lock:
+            if self._write_file is not None:
+                self._write_file.close()
+                self._write_file = None
@@ -0,0 +1,185 @@
+"""
+점검 대상 목록 로드
+TARGETS_URL, TARGETS_FILE, TARGET_URLS, TARGET_URL 순서로 대상 목록을 결정
+(TARGETS_URL, TARGETS_FILE은 실행 중 변경을 감지하여 다시 로드 가능)
+"""
+import hashlib
+import os
+import re
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from urllib.parse import unquote
+import requests
+from config import Config
+
+
+def parse_target_line(line: str) -> Dict[str, Any]:
+    """
+    대상 한 줄 파싱
+
+    형식: <URL> [key=value ...]
+        예) https://example.com interval=10 timeout=3
+            https://example.com/app.js max_bytes=4096 range=true expect=%2F%2A%20v2
+
+    Returns:
+        dict: 점검 대상
+            - url: 점검 대상 URL
+            - interval: 점검 주기 (초)
+            - timeout: 요청 타임아웃 (초)
+            - method: 요청 방식 (GET 또는 HEAD)
+            - max_bytes: 본문 최대 수신 바이트 (0이면 응답 헤더까지만)
+            - range: Range 요청으로 max_bytes만큼만 요청할지 여부
+            - expect: 본문에 포함되어야 하는 문자열 (URL 인코딩 가능, 없으면 None)
+            - expect_sha256: 수신한 본문의 SHA-256 (없으면 None)
+    """
+    parts = line.split()
+    target = {
+        'url': parts[0],
+        'interval': float(Config.CHECK_INTERVAL_SECONDS),
+        'timeout': Config.REQUEST_TIMEOUT,
+        'method': Config.PROBE_METHOD,
+        'max_bytes': None,
+        'range': False,
+        'expect': None,
+        'expect_sha256': None
+    }
+
+    for option in parts[1:]:
+        if '=' not in option:
+            raise ValueError(f"잘못된 대상 옵션: {option} ({parts[0]})")
+
+        key, value = option.split('=', 1)
+        if key == 'interval':
+            target['interval'] = float(value)
+            if target['interval'] < 1:
+                raise ValueError(f"interval은 최소 1초 이상이어야 합니다: {parts[0]}")
+        elif key == 'timeout':
+            target['timeout'] = float(value)
+        elif key == 'method':
+            target['method'] = value.upper()
+            if target['method'] not in ('GET', 'HEAD'):
+                raise ValueError(f"method는 GET 또는 HEAD여야 합니다: {parts[0]}")
+        elif key == 'max_bytes':
+            target['max_bytes'] = int(value)
+            if target['max_bytes'] < 0:
+                raise ValueError(f"max_bytes는 0 이상이어야 합니다: {parts[0]}")
+        elif key == 'range':
+            target['range'] = value.lower() == 'true'
+        elif key == 'expect':
+            target['expect'] = unquote(value)
+        elif key == 'expect_sha256':
+            target['expect_sha256'] = value.lower()
+            if not re.fullmatch(r'[0-9a-f]{64}', target['expect_sha256']):
+                raise ValueError(f"expect_sha256은 64자리 16진수여야 합니다: {parts[0]}")
+        else:
+            raise ValueError(f"알 수 없는 대상 옵션: {key} ({parts[0]})")
+
+    has_assertion = target['expect'] is not None or target['expect_sha256'] is not None
+    if has_assertion and target['method'] == 'HEAD':
+        raise ValueError(f"HEAD 요청에는 본문 검사(expect, expect_sha256)를 사용할 수 없습니다: {parts[0]}")
+
+    if target['max_bytes'] is None:
+        target['max_bytes'] = Config.PROBE_ASSERT_MAX_BYTES if has_assertion else Config.PROBE_MAX_BYTES
+    elif has_assertion and target['max_bytes'] == 0:
+        raise ValueError(f"본문 검사에는 max_bytes가 1 이상이어야 합니다: {parts[0]}")
+
+    return target
+
+
+def parse_targets(lines: Iterable[str]) -> List[Dict[str, Any]]:
+    """대상 목록 파싱 (빈 줄, # 주석 무시, 중복 URL 제거)"""
+    targets = []
+    seen = set()
+
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        target = parse_target_line(line)
+        if target['url'] in seen:
+            continue
+
+        seen.add(target['url'])
+        targets.append(target)
+
+    return targets
+
+
+class TargetSource:
+    """
+    대상 목록 원본
+    - TARGETS_URL: If-None-Match(ETag) 조건부 요청으로 변경 여부 확인
+    - TARGETS_FILE: 파일 수정 시각/크기로 변경 여부 확인
+    - 내용이 같으면(해시 비교) 변경 없음으로 처리
+    """
+
+    def __init__(self, url: str = Config.TARGETS_URL, path: str = Config.TARGETS_FILE):
+        self.url = url
+        self.path = path
+        self._etag: Optional[str] = None
+        self._file_stamp: Optional[Tuple[int, int]] = None
+        self._digest: Optional[str] = None
+
+    @property
+    def reloadable(self) -> bool:
+        """실행 중 다시 로드할 수 있는 원본인지 여부"""
+        return bool(self.url or self.path)
+
+    def load(self) -> List[Dict[str, Any]]:
+        """대상 목록 전체 로드 (시작 시)"""
+        if self.reloadable:
+            return self.poll(force=True)
+
+        if Config.TARGET_URLS:
+            return parse_targets(Config.TARGET_URLS.split(','))
+
+        return parse_targets([Config.TARGET_URL])
+
+    def poll(self, force: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """
+        변경된 경우에만 대상 목록 반환 (변경 없으면 None)
+
+        Raises:
+            ValueError: 대상 목록 형식 오류
+            OSError, requests.RequestException: 원본 읽기 실패
+        """
+        text = self._fetch_url(force) if self.url else self._read_file(force) if self.path else None
+        if text is None:
+            return None
+
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        if digest == self._digest and not force:
+            return None
+
+        targets = parse_targets(text.splitlines())
+        self._digest = digest
+        return targets
+
+    def _fetch_url(self, force: bool) -> Optional[str]:
+        headers = {'X-API-Key': Config.API_KEY}
+        if self._etag and not force:
+            headers['If-None-Match'] = self._etag
+
+        response = requests.get(self.url, headers=headers, timeout=Config.REQUEST_TIMEOUT)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+
+        self._etag = response.headers.get('ETag')
+        return response.text
+
+    def _read_file(self, force: bool) -> Optional[str]:
+        stat = os.stat(self.path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._file_stamp and not force:
+            return None
+
+        with open(self.path, encoding='utf-8') as f:
+            text = f.read()
+        self._file_stamp = stamp
+        return text
+
+
+def load_targets() -> List[Dict[str, Any]]:
+    """설정에 따라 점검 대상 목록 로드"""
+    return TargetSource().load()
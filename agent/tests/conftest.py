@@ -0,0 +1,12 @@
+"""
+Agent 테스트 공통 설정
+- agent 디렉터리의 모듈을 Agent와 같은 방식(평면 import)으로 불러옴
+- 로거에 핸들러를 미리 달아 테스트 중에는 agent.log를 만들지 않음
+"""
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.getLogger('agent').addHandler(logging.NullHandler())
@@ -0,0 +1,68 @@
+"""
+적응형 점검 주기 (정상 대상 주기 완화, 장애/지연 대상 빠른 점검, 기준선 재설정) 테스트
+"""
+import pytest
+from adaptive import AdaptiveIntervalPolicy
+
+URL = 'https://example.com'
+TARGET = {'url': URL, 'interval': 30}
+
+
+def result(is_success=True, response_time_ms=100):
+    return {'target_url': URL, 'is_success': is_success, 'response_time_ms': response_time_ms}
+
+
+@pytest.fixture
+def policy():
+    return AdaptiveIntervalPolicy(min_interval=5, max_interval=300, stable_checks=3, degraded_ratio=3)
+
+
+def record(policy, count, **fields):
+    for _ in range(count):
+        policy.record(result(**fields))
+    return policy.interval_for(TARGET)
+
+
+def test_unknown_target_uses_base_interval(policy):
+    assert policy.interval_for(TARGET) == 30
+
+
+def test_stable_target_backs_off_up_to_max_interval(policy):
+    assert record(policy, 2) == 30
+    assert record(policy, 1) == 60
+    assert record(policy, 3) == 120
+    assert record(policy, 30) == 300
+
+
+def test_failing_target_uses_min_interval_and_resets_back_off(policy):
+    record(policy, 6)
+    assert record(policy, 1, is_success=False) == 5
+    assert record(policy, 1) == 30
+
+
+def test_degraded_target_uses_min_interval_until_latency_recovers(policy):
+    record(policy, 3, response_time_ms=100)
+    assert record(policy, 1, response_time_ms=1000) == 5
+    assert record(policy, 1, response_time_ms=110) == 30
+
+
+def test_persistent_latency_shift_becomes_new_baseline(policy):
+    record(policy, 3, response_time_ms=100)
+    assert record(policy, 2, response_time_ms=800) == 5
+
+    # stable_checks회 연속 지연이면 기준선 재설정 후 다시 주기 완화
+    assert record(policy, 1, response_time_ms=800) == 30
+    assert record(policy, 3, response_time_ms=820) == 60
+
+
+def test_failure_interrupts_degraded_run(policy):
+    record(policy, 3, response_time_ms=100)
+    record(policy, 2, response_time_ms=800)
+    record(policy, 1, is_success=False)
+    assert record(policy, 2, response_time_ms=800) == 5
+
+
+def test_forget_resets_state(policy):
+    record(policy, 1, is_success=False)
+    policy.forget(URL)
+    assert policy.interval_for(TARGET) == 30
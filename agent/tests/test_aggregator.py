@@ -0,0 +1,71 @@
+"""
+점검 결과 집계 (집계 모드) 테스트
+"""
+import pytest
+from aggregator import ResultAggregator
+
+URL = 'https://example.com'
+
+
+def result(is_success, response_time_ms=100, url=URL):
+    return {'target_url': url, 'is_success': is_success, 'status_code': 200 if is_success else 500,
+            'response_time_ms': response_time_ms}
+
+
+@pytest.fixture
+def aggregator():
+    emitted = []
+    aggregator = ResultAggregator(lambda events, urgent: emitted.append((events, urgent)), window_seconds=3600)
+    aggregator.emitted = emitted
+    yield aggregator
+    aggregator.close()
+
+
+def test_transition_is_sent_immediately(aggregator):
+    aggregator.add(result(True))
+    aggregator.add(result(True))
+
+    assert aggregator.emitted == [([result(True)], True)]
+
+
+def test_transition_sends_pending_window_first(aggregator):
+    # 정상 5회 후 실패 4회: 요약이 두 상태를 섞지 않고 상태 변화 앞에서 끊김
+    for _ in range(5):
+        aggregator.add(result(True, 120))
+    for _ in range(4):
+        aggregator.add(result(False, 900))
+    aggregator.flush(0, 60)
+
+    (first, _), (transition, urgent), (window, _) = aggregator.emitted
+    assert first == [result(True, 120)]
+    assert urgent
+    summary, raw = transition
+    assert (summary['type'], summary['count'], summary['failures'], summary['max_ms']) == ('summary', 4, 0, 120)
+    assert raw == result(False, 900)
+    assert [(item['count'], item['failures']) for item in window] == [(3, 3)]
+
+
+def test_flush_summarizes_each_target(aggregator):
+    for url in ('https://a.example.com', 'https://b.example.com'):
+        aggregator.add(result(True, url=url))
+        for latency in (100, 200, 300, 400):
+            aggregator.add(result(True, latency, url=url))
+    aggregator.emitted.clear()
+
+    assert aggregator.flush(0, 60) == 2
+    summaries, urgent = aggregator.emitted[0]
+    assert not urgent
+    assert [item['target_url'] for item in summaries] == ['https://a.example.com', 'https://b.example.com']
+    assert summaries[0]['window_start'] == '1970-01-01T00:00:00'
+    assert (summaries[0]['min_ms'], summaries[0]['max_ms'], summaries[0]['avg_ms'], summaries[0]['p50_ms']) == \
+        (100, 400, 250.0, 200)
+    assert aggregator.flush(60, 120) == 0
+
+
+def test_forget_treats_next_result_as_first(aggregator):
+    aggregator.add(result(True))
+    aggregator.add(result(True))
+    aggregator.forget(URL)
+    aggregator.add(result(True))
+
+    assert aggregator.emitted == [([result(True)], True), ([result(True)], True)]
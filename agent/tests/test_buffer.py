@@ -0,0 +1,94 @@
+"""
+점검 결과 버퍼 (크기/시간 기준 flush, 기록 실패 시 재시도) 테스트
+"""
+import threading
+import time
+import pytest
+import metrics
+from buffer import EventBuffer
+
+
+class FlakyCallback:
+    """처음 failures번은 예외를 내고 이후에는 받은 배치를 기록하는 flush 콜백"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.batches = []
+        self.delivered = threading.Event()
+
+    def __call__(self, events):
+        if self.failures:
+            self.failures -= 1
+            raise OSError('No space left on device')
+        self.batches.append([event['n'] for event in events])
+        self.delivered.set()
+
+
+def events(start, stop):
+    return [{'n': n} for n in range(start, stop)]
+
+
+@pytest.fixture
+def make_buffer():
+    buffers = []
+
+    def make(callback, **kwargs):
+        buffer = EventBuffer(callback, **{'max_size': 3, 'max_wait': 0.1, **kwargs})
+        buffers.append(buffer)
+        return buffer
+
+    yield make
+    for buffer in buffers:
+        buffer.close()
+
+
+def test_full_buffer_flushes_in_batches(make_buffer):
+    callback = FlakyCallback()
+    buffer = make_buffer(callback, max_wait=60)
+    buffer.add_many(events(0, 3))
+
+    assert callback.delivered.wait(2)
+    assert callback.batches == [[0, 1, 2]]
+
+
+def test_failed_flush_is_retried_and_thread_survives(make_buffer):
+    callback = FlakyCallback(failures=2)
+    buffer = make_buffer(callback)
+    buffer.add_many(events(0, 5), urgent=True)
+
+    assert callback.delivered.wait(2)
+    buffer.add_many(events(5, 6), urgent=True)
+    deadline = time.monotonic() + 2
+    while sum(len(batch) for batch in callback.batches) < 6 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # 실패한 배치부터 순서대로 다시 전달
+    assert [n for batch in callback.batches for n in batch] == list(range(6))
+    assert len(buffer) == 0 and buffer.dropped == 0
+
+
+def test_flush_returns_delivered_count_and_keeps_the_rest(make_buffer):
+    callback = FlakyCallback()
+    buffer = make_buffer(callback, max_wait=60)
+    buffer.add_many(events(0, 2))
+    callback.failures = 1
+
+    assert buffer.flush() == 0
+    assert len(buffer) == 2
+
+
+def test_persistent_failure_drops_oldest_over_limit(make_buffer):
+    before = metrics.BUFFER_DROPPED._values[()]
+    callback = FlakyCallback(failures=1000)
+    buffer = make_buffer(callback, max_wait=60, max_events=5)
+
+    buffer.add_many(events(0, 4))
+    buffer.flush()
+    buffer.add_many(events(4, 7))
+
+    assert len(buffer) == 5 and buffer.dropped == 2
+    assert metrics.BUFFER_DROPPED._values[()] - before == 2
+
+    callback.failures = 0
+    buffer.flush()
+    assert [n for batch in callback.batches for n in batch] == [2, 3, 4, 5, 6]
@@ -0,0 +1,91 @@
+"""
+점검 엔진 (스트리밍 수신, 본문 검사, keep-alive 연결 재사용) 테스트
+"""
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from config import Config
+from probe import ProbeEngine
+
+SMALL_BODY = b'hello world ' * 10
+LARGE_BODY = b'x' * 4096
+
+
+class Handler(BaseHTTPRequestHandler):
+    """keep-alive(HTTP/1.1) 테스트 서버: /small, /large는 Content-Length, /chunked는 길이 없이 전송"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(LARGE_BODY)))
+        self.end_headers()
+
+    def do_GET(self):
+        if self.path == '/chunked':
+            self.send_response(200)
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for part in (SMALL_BODY, SMALL_BODY):
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(part), part))
+            self.wfile.write(b'0\r\n\r\n')
+            return
+
+        body = LARGE_BODY if self.path == '/large' else SMALL_BODY
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def drain_limit(monkeypatch):
+    # LARGE_BODY만 연결 재사용 한도를 넘도록 설정
+    monkeypatch.setattr(Config, 'PROBE_DRAIN_MAX_BYTES', 1024)
+
+
+def probe_many(target, count=3):
+    async def run():
+        engine = ProbeEngine(max_concurrency=1)
+        try:
+            return [await engine.check_url(engine.get_client(), target) for _ in range(count)]
+        finally:
+            await engine.aclose()
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize('path, method', [('/small', 'GET'), ('/large', 'HEAD'), ('/chunked', 'GET')])
+def test_connection_is_reused(server, path, method):
+    results = probe_many({'url': server + path, 'method': method})
+
+    assert all(result['is_success'] for result in results)
+    assert [result['connection_reused'] for result in results] == [False, True, True]
+
+
+def test_body_over_drain_limit_closes_connection(server):
+    results = probe_many({'url': server + '/large'})
+    assert [result['connection_reused'] for result in results] == [False, False, False]
+
+
+def test_max_bytes_limits_received_body_and_runs_assertion(server):
+    results = probe_many({'url': server + '/large', 'max_bytes': 100, 'expect': 'xxx'}, count=1)
+    assert results[0]['is_success'] and results[0]['body_bytes'] == 100
+
+    results = probe_many({'url': server + '/small', 'max_bytes': 1000, 'expect': 'goodbye'}, count=1)
+    assert not results[0]['is_success']
+    assert results[0]['error_message'].startswith('Content assertion failed')
+    assert results[0]['body_bytes'] == len(SMALL_BODY)
@@ -0,0 +1,94 @@
+"""
+대상별 점검 스케줄러 (위상 분산, 다음 예정 시각, 중첩 실행 방지) 테스트
+"""
+import asyncio
+from scheduler import ProbeScheduler, phase_offset
+
+
+class FakeEngine:
+    """점검 시각을 기록하고 delay만큼 걸리는 점검 엔진"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    def get_client(self):
+        return None
+
+    async def check_url(self, client, target):
+        self.calls.append((target['url'], asyncio.get_running_loop().time()))
+        await asyncio.sleep(self.delay)
+        return {'target_url': target['url'], 'is_success': True, 'response_time_ms': 1}
+
+
+def run_scheduler(targets, duration, engine, **kwargs):
+    """duration초 동안 스케줄러를 실행하고 (스케줄러, 결과 목록) 반환"""
+    results = []
+    scheduler = ProbeScheduler(engine, results.append, max_probes_per_second=0, **kwargs)
+
+    async def run():
+        task = asyncio.create_task(scheduler.run(targets))
+        await asyncio.sleep(duration)
+        await scheduler.stop()
+        await task
+
+    asyncio.run(run())
+    return scheduler, results
+
+
+def test_phase_offset_is_stable_and_within_interval():
+    offsets = [phase_offset(f'https://{index}.example.com', 30) for index in range(100)]
+    assert all(0 <= offset < 30 for offset in offsets)
+    assert offsets == [phase_offset(f'https://{index}.example.com', 30) for index in range(100)]
+    # 대상이 같은 시각에 몰리지 않음
+    assert len({round(offset) for offset in offsets}) > 20
+
+
+def test_next_due_keeps_phase_without_drift():
+    scheduler = ProbeScheduler(FakeEngine(), lambda result: None, max_probes_per_second=0)
+    assert scheduler._next_due(100.0, 10, now=100.5) == 110.0
+    # 많이 밀리면 지난 회차는 건너뛰고 원래 위상의 다음 시각
+    assert scheduler._next_due(100.0, 10, now=135.2) == 140.0
+
+
+def test_each_target_runs_on_its_own_interval():
+    targets = [{'url': 'https://fast.example.com', 'interval': 0.05},
+               {'url': 'https://slow.example.com', 'interval': 0.2}]
+    engine = FakeEngine()
+    scheduler, results = run_scheduler(targets, 0.45, engine)
+
+    counts = {target['url']: sum(1 for url, _ in engine.calls if url == target['url']) for target in targets}
+    assert 6 <= counts['https://fast.example.com'] <= 10
+    assert 2 <= counts['https://slow.example.com'] <= 3
+    assert len(results) == len(engine.calls)
+
+    # 예정 시각 = 첫 실행 + n × 주기 (누적 지연 없음)
+    fast = [at for url, at in engine.calls if url == 'https://fast.example.com']
+    assert all(abs((at - fast[0]) / 0.05 - round((at - fast[0]) / 0.05)) < 0.4 for at in fast)
+
+
+def test_slow_probe_skips_overlapping_runs():
+    engine = FakeEngine(delay=0.12)
+    scheduler, results = run_scheduler([{'url': 'https://example.com', 'interval': 0.05}], 0.3, engine)
+
+    assert scheduler.stats.skipped > 0
+    assert len(engine.calls) <= 3
+
+
+def test_removed_target_is_not_probed_again():
+    engine = FakeEngine()
+    results = []
+    scheduler = ProbeScheduler(engine, results.append, max_probes_per_second=0)
+
+    async def run():
+        task = asyncio.create_task(scheduler.run([{'url': 'https://example.com', 'interval': 0.02}]))
+        await asyncio.sleep(0.1)
+        scheduler.remove_target('https://example.com')
+        calls = len(engine.calls)
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+        await task
+        return calls
+
+    calls = asyncio.run(run())
+    assert calls > 0 and len(engine.calls) == calls
@@ -0,0 +1,110 @@
+"""
+디스크 스풀 (세그먼트, 용량 제한, 재시작 후 이어서 읽기) 테스트
+"""
+import json
+import os
+import metrics
+from spool import Spool
+
+# 이벤트 한 건이 스풀에 기록되는 크기 (번호는 한 자리)
+EVENT_BYTES = len(json.dumps({'n': 0, 'pad': 'x' * 40}, separators=(',', ':'))) + 1
+
+
+def event(n):
+    return {'n': n, 'pad': 'x' * 40}
+
+
+def open_spool(directory, segment_events=100, max_events=1000):
+    return Spool(str(directory), segment_max_bytes=segment_events * EVENT_BYTES,
+                 max_total_bytes=max_events * EVENT_BYTES, fsync=False)
+
+
+def numbers(events):
+    return [item['n'] for item in events]
+
+
+def test_committed_position_survives_restart(tmp_path):
+    spool = open_spool(tmp_path)
+    for n in range(5):
+        spool.append_many([event(n)])
+
+    events, position = spool.read_batch(2)
+    assert numbers(events) == [0, 1]
+    spool.commit(position, len(events))
+    spool.close()
+
+    spool = open_spool(tmp_path)
+    assert len(spool) == 3
+    events, _ = spool.read_batch(10)
+    assert numbers(events) == [2, 3, 4]
+    spool.close()
+
+
+def test_uncommitted_batch_is_read_again_after_restart(tmp_path):
+    spool = open_spool(tmp_path)
+    spool.append_many([event(n) for n in range(3)])
+    spool.read_batch(10)
+    spool.close()
+
+    spool = open_spool(tmp_path)
+    assert len(spool) == 3
+    assert numbers(spool.read_batch(10)[0]) == [0, 1, 2]
+    spool.close()
+
+
+def test_read_continues_across_segments_and_deletes_committed(tmp_path):
+    spool = open_spool(tmp_path, segment_events=2)
+    for n in range(5):
+        spool.append_many([event(n)])
+
+    events, position = spool.read_batch(10)
+    assert numbers(events) == [0, 1, 2, 3, 4]
+    spool.commit(position, len(events))
+
+    segments = [name for name in os.listdir(tmp_path) if name.startswith('segment-')]
+    assert len(segments) == 1 and len(spool) == 0
+    spool.close()
+
+
+def test_size_limit_drops_oldest_segment(tmp_path):
+    before = metrics.SPOOL_DROPPED._values[()]
+    spool = open_spool(tmp_path, segment_events=1, max_events=3)
+    for n in range(5):
+        spool.append_many([event(n)])
+
+    assert spool.dropped == 2
+    assert metrics.SPOOL_DROPPED._values[()] - before == 2
+    assert len(spool) == 3
+    assert numbers(spool.read_batch(10)[0]) == [2, 3, 4]
+    spool.close()
+
+
+def test_drop_moves_read_position_past_discarded_events(tmp_path):
+    spool = open_spool(tmp_path, segment_events=1, max_events=3)
+    for n in range(3):
+        spool.append_many([event(n)])
+
+    # 전송 중(commit 전)에 가장 오래된 세그먼트가 폐기되면 이미 읽은 위치는 되돌리지 않음
+    events, position = spool.read_batch(1)
+    spool.append_many([event(3)])
+    spool.commit(position, len(events))
+
+    assert spool.dropped == 1
+    assert numbers(spool.read_batch(10)[0]) == [1, 2, 3]
+    spool.close()
+
+
+def test_truncated_record_is_skipped(tmp_path):
+    spool = open_spool(tmp_path)
+    spool.append_many([event(0)])
+    spool.close()
+
+    # 비정상 종료로 마지막 줄이 잘린 세그먼트
+    segment = sorted(name for name in os.listdir(tmp_path) if name.startswith('segment-'))[-1]
+    with open(tmp_path / segment, 'ab') as f:
+        f.write(b'{"n":1,"pad"')
+
+    spool = open_spool(tmp_path)
+    spool.append_many([event(2)])
+    assert numbers(spool.read_batch(10)[0]) == [0, 2]
+    spool.close()
@@ -0,0 +1,117 @@
+"""
+점검 대상 목록 (파싱, 변경 감지, 변경분만 스케줄러에 반영) 테스트
+"""
+import asyncio
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from scheduler import ProbeScheduler
+from targets import TargetSource, parse_target_line, parse_targets
+
+
+def test_parse_target_options():
+    target = parse_target_line('https://example.com/app.js interval=10 max_bytes=4096 range=true expect=%2F%2A%20v2')
+    assert (target['interval'], target['max_bytes'], target['range'], target['expect']) == (10.0, 4096, True, '/* v2')
+
+
+@pytest.mark.parametrize('line', [
+    'https://example.com interval=0.5',
+    'https://example.com method=POST',
+    'https://example.com retries=3',
+    'https://example.com method=HEAD expect=ok',
+    'https://example.com expect_sha256=abc',
+])
+def test_invalid_target_line_is_rejected(line):
+    with pytest.raises(ValueError):
+        parse_target_line(line)
+
+
+def test_parse_targets_skips_comments_and_duplicates():
+    targets = parse_targets(['# 주석', '', 'https://a.example.com', 'https://a.example.com interval=5',
+                             'https://b.example.com'])
+    assert [target['url'] for target in targets] == ['https://a.example.com', 'https://b.example.com']
+
+
+def test_file_source_returns_targets_only_when_content_changes(tmp_path):
+    path = tmp_path / 'targets.txt'
+    path.write_text('https://a.example.com\n', encoding='utf-8')
+    source = TargetSource(url='', path=str(path))
+
+    assert [target['url'] for target in source.load()] == ['https://a.example.com']
+    assert source.poll() is None
+
+    # 수정 시각이 바뀌어도 내용이 같으면 변경 없음
+    os.utime(path, ns=(0, 0))
+    assert source.poll() is None
+
+    path.write_text('https://a.example.com\nhttps://b.example.com\n', encoding='utf-8')
+    assert [target['url'] for target in source.poll()] == ['https://a.example.com', 'https://b.example.com']
+
+    path.write_text('https://a.example.com interval=0\n', encoding='utf-8')
+    with pytest.raises(ValueError):
+        source.poll()
+
+
+def test_url_source_uses_etag():
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append(self.headers.get('If-None-Match'))
+            if self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = b'https://a.example.com\n'
+            self.send_response(200)
+            self.send_header('ETag', '"v1"')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        source = TargetSource(url=f'http://127.0.0.1:{httpd.server_address[1]}/targets', path='')
+        assert [target['url'] for target in source.load()] == ['https://a.example.com']
+        assert source.poll() is None
+        assert requests_seen == [None, '"v1"']
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_update_targets_applies_only_differences():
+    async def run():
+        scheduler = ProbeScheduler(engine=None, on_result=lambda result: None, max_probes_per_second=0)
+        scheduler._loop = asyncio.get_running_loop()
+        scheduler._wakeup = asyncio.Event()
+
+        a, b, c = parse_targets(['https://a.example.com interval=100', 'https://b.example.com interval=100',
+                                 'https://c.example.com interval=100'])
+        for target in (a, b, c):
+            scheduler.add_target(target)
+        scheduled = dict(scheduler._next_at)
+
+        new_b = {**b, 'timeout': 3}
+        new_c = {**c, 'interval': 2.0}
+        d = parse_target_line('https://d.example.com')
+        added, removed, changed = scheduler.update_targets([a, new_b, new_c, d])
+
+        assert (added, removed, changed) == (['https://d.example.com'], [], ['https://b.example.com',
+                                                                             'https://c.example.com'])
+        # 변경 없는 대상과 주기가 같은 대상은 일정 유지, 주기가 짧아진 대상은 새 주기 안으로 당김
+        assert scheduler._next_at['https://a.example.com'] == scheduled['https://a.example.com']
+        assert scheduler._next_at['https://b.example.com'] == scheduled['https://b.example.com']
+        assert scheduler._next_at['https://c.example.com'] <= scheduler._now() + 2
+
+        added, removed, changed = scheduler.update_targets([a])
+        assert (added, sorted(removed), changed) == ([], ['https://b.example.com', 'https://c.example.com',
+                                                          'https://d.example.com'], [])
+        assert len(scheduler) == 1
+
+    asyncio.run(run())
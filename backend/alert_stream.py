@@ -0,0 +1,137 @@
+"""
+알림 변경 이벤트 스트림 (Server-Sent Events)
+- 알림 생성/확인(ACK)/해결/다시 열림을 구독자에게 바로 전달 (대시보드 폴링 대체)
+- 이벤트는 발행 시 한 번만 SSE 형식으로 직렬화하여 모든 구독자가 공유
+- 구독자마다 버퍼 크기 제한, 버퍼가 가득 찬 느린 구독자는 연결을 끊음 (다시 연결하여 이어받기)
+- 최근 이벤트를 보관하여 Last-Event-ID부터 이어받기 (보관 범위를 벗어나면 reset 이벤트)
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+# 구독자별 버퍼 크기 (가득 차면 느린 구독자로 보고 연결 종료)
+ALERT_STREAM_BUFFER_SIZE = int(os.getenv('ALERT_STREAM_BUFFER_SIZE', '100'))
+# 이어받기용으로 보관하는 최근 이벤트 수
+ALERT_STREAM_HISTORY_SIZE = int(os.getenv('ALERT_STREAM_HISTORY_SIZE', '1000'))
+# 최대 동시 구독자 수 (구독자마다 요청 스레드 하나를 연결 내내 사용하므로
+# WSGI 서버의 요청 스레드 수보다 충분히 작게 두어 이벤트 수신 요청이 처리될 스레드를 남김)
+ALERT_STREAM_MAX_SUBSCRIBERS = int(os.getenv('ALERT_STREAM_MAX_SUBSCRIBERS', '16'))
+# 이벤트가 없을 때 연결 유지용 주석 전송 주기 (끊긴 연결도 이때 감지)
+ALERT_STREAM_HEARTBEAT_SECONDS = float(os.getenv('ALERT_STREAM_HEARTBEAT_SECONDS', '15'))
+
+# 알림 상태 → 이벤트 이름
+STATUS_EVENTS = {
+    'OPEN': 'reopened',
+    'ACK': 'acked',
+    'RESOLVED': 'resolved'
+}
+
+
+class Subscriber:
+    """구독자 한 명의 이벤트 버퍼"""
+
+    def __init__(self, buffer_size: int):
+        self.buffer_size = buffer_size
+        self.evicted = False
+        self._events: deque = deque()
+        self._cond = threading.Condition()
+
+    def offer(self, frame: str) -> bool:
+        """이벤트 추가 (버퍼가 가득 차면 구독자를 끊음 표시하고 False)"""
+        with self._cond:
+            if len(self._events) >= self.buffer_size:
+                self.evicted = True
+                self._events.clear()
+                self._cond.notify()
+                return False
+
+            self._events.append(frame)
+            self._cond.notify()
+            return True
+
+    def next(self, timeout: float) -> Optional[str]:
+        """다음 이벤트 (timeout 동안 없거나 끊긴 구독자면 None)"""
+        with self._cond:
+            if not self._events and not self.evicted:
+                self._cond.wait(timeout)
+            if self.evicted or not self._events:
+                return None
+            return self._events.popleft()
+
+
+class AlertEventBroker:
+    """알림 변경 이벤트 발행 및 구독 관리"""
+
+    def __init__(self, buffer_size: int = ALERT_STREAM_BUFFER_SIZE,
+                 history_size: int = ALERT_STREAM_HISTORY_SIZE,
+                 max_subscribers: int = ALERT_STREAM_MAX_SUBSCRIBERS):
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        # 재시작 후 이벤트 번호가 겹치지 않도록 이벤트 ID에 시작 시각 포함
+        self._epoch = format(int(time.time() * 1000), 'x')
+        self._sequence = 0
+        self._history: deque = deque(maxlen=history_size)  # (번호, SSE 프레임)
+        self._subscribers: set = set()
+        self._lock = threading.Lock()
+        self.evicted_count = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: str, alert: Dict[str, Any]) -> None:
+        """
+        알림 변경 이벤트 발행
+
+        Args:
+            event: created, acked, resolved, reopened
+            alert: 알림 정보 (id, alert_type, status, target_url 등)
+        """
+        data = json.dumps(alert, default=str)
+        with self._lock:
+            self._sequence += 1
+            frame = f"id: {self._epoch}-{self._sequence}\nevent: {event}\ndata: {data}\n\n"
+            self._history.append((self._sequence, frame))
+
+            for subscriber in list(self._subscribers):
+                if not subscriber.offer(frame):
+                    self._subscribers.discard(subscriber)
+                    self.evicted_count += 1
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Tuple[Optional[Subscriber], List[str]]:
+        """
+        구독 시작
+
+        Returns:
+            (구독자, 먼저 보낼 프레임 목록) - 동시 구독자 수를 넘으면 구독자는 None
+            last_event_id 이후 이벤트를 보관 범위에서 찾지 못하면 프레임 목록은 reset 이벤트 하나
+        """
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None, []
+
+            replay = self._replay(last_event_id) if last_event_id else []
+            subscriber = Subscriber(self.buffer_size)
+            self._subscribers.add(subscriber)
+            return subscriber, replay
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def _replay(self, last_event_id: str) -> List[str]:
+        """last_event_id 이후의 보관된 이벤트 (잠금 안에서 호출)"""
+        epoch, _, sequence = last_event_id.partition('-')
+        oldest = self._history[0][0] if self._history else self._sequence + 1
+        if epoch != self._epoch or not sequence.isdigit() or int(sequence) < oldest - 1:
+            # 서버 재시작 또는 보관 범위를 벗어남: 클라이언트가 /alerts로 전체를 다시 조회해야 함
+            return [f"id: {self._epoch}-{self._sequence}\nevent: reset\ndata: {{}}\n\n"]
+
+        return [frame for number, frame in self._history if number > int(sequence)]
+
+
+# 프로세스 전체에서 공유하는 알림 이벤트 브로커
+alert_events = AlertEventBroker()
@@ -1,8 +1,13 @@
 """
-/alerts API - 알림 조회 및 상태 변경
+/alerts API - 알림 조회, 내보내기 및 상태 변경
 """
-from flask import Blueprint, request, jsonify
+from functools import partial
+from flask import Blueprint, request, jsonify, Response
 from models import Alert, NotificationLog
+from pagination import parse_choices, parse_fields, parse_limit, parse_time, decode_cursor
+from streaming import stream_rows, parse_format, parse_chunk_size
+from read_cache import alert_read_cache, cached_response
+from alert_stream import alert_events, STATUS_EVENTS, ALERT_STREAM_HEARTBEAT_SECONDS
 import logging
 
 # Blueprint 생성
@@ -12,25 +17,64 @@ alerts_bp = Blueprint('alerts', __name__)
 logger = logging.getLogger('alerts_api')
 
 
+def parse_alert_filters(args) -> dict:
+    """알림 목록 필터 파라미터 (잘못된 값은 ValueError)"""
+    return {
+        'statuses': parse_choices(args.get('status'), 'status', Alert.STATUSES),
+        'alert_types': parse_choices(args.get('alert_type'), 'alert_type', Alert.TYPES),
+        'target_url': args.get('target_url'),
+        'since': parse_time(args.get('since'), 'since'),
+        'until': parse_time(args.get('until'), 'until'),
+        'fields': parse_fields(args.get('fields'), Alert.FIELDS)
+    }
+
+
+def parse_log_filters(args) -> dict:
+    """발송 로그 목록 필터 파라미터 (잘못된 값은 ValueError)"""
+    return {
+        'alert_id': args.get('alert_id', type=int),
+        'channels': parse_choices(args.get('channel'), 'channel'),
+        'statuses': parse_choices(args.get('status'), 'status', NotificationLog.STATUSES),
+        'since': parse_time(args.get('since'), 'since'),
+        'until': parse_time(args.get('until'), 'until'),
+        'fields': parse_fields(args.get('fields'), NotificationLog.FIELDS)
+    }
+
+
 @alerts_bp.route('/alerts', methods=['GET'])
+@cached_response(alert_read_cache)
 def get_alerts():
-    """알림 목록 조회 API"""
-    # 쿼리 파라미터에서 상태 필터링
-    status = request.args.get('status')
+    """
+    알림 목록 조회 API (최신순, 커서 기반 페이지네이션)
 
+    Query Parameters:
+        status, alert_type: 쉼표로 여러 값 지정 가능
+        target_url: 대상 URL
+        since, until: 생성 시각 범위 (ISO 8601 UTC, since 이상 until 미만)
+        fields: 응답에 포함할 필드 (쉼표 구분)
+        limit: 페이지 크기
+        cursor: 이전 응답의 next_cursor
+    """
     try:
-        # 알림 목록 조회
-        if status:
-            alerts = Alert.get_all(status=status.upper())
-            logger.info(f"📋 알림 목록 조회: status={status}, count={len(alerts)}")
-        else:
-            alerts = Alert.get_all()
-            logger.info(f"📋 알림 목록 조회: 전체, count={len(alerts)}")
+        filters = parse_alert_filters(request.args)
+        filters['cursor'] = request.args.get('cursor')
+        filters['limit'] = parse_limit(request.args.get('limit'))
+        if filters['cursor']:
+            decode_cursor(filters['cursor'])
+    except ValueError as e:
+        logger.warning(f"⚠️ 잘못된 조회 조건: {str(e)}")
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        page = Alert.get_page(**filters)
+        alerts = page['rows']
+        logger.info(f"📋 알림 목록 조회: count={len(alerts)}, more={page['next_cursor'] is not None}")
 
         return jsonify({
             'success': True,
             'count': len(alerts),
-            'alerts': alerts
+            'alerts': alerts,
+            'next_cursor': page['next_cursor']
         }), 200
 
     except Exception as e:
@@ -38,7 +82,72 @@ def get_alerts():
         return jsonify({'error': str(e)}), 500
 
 
+@alerts_bp.route('/alerts/stream', methods=['GET'])
+def stream_alerts():
+    """
+    알림 변경 이벤트 구독 API (Server-Sent Events)
+
+    이벤트: created, acked, resolved, reopened (data: 알림 JSON)
+            reset (이어받을 수 없음 → /alerts로 다시 조회), evicted (느린 구독자, 다시 연결 필요)
+    이어받기: Last-Event-ID 헤더 또는 last_event_id 쿼리 파라미터
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    subscriber, replay = alert_events.subscribe(last_event_id)
+
+    if subscriber is None:
+        logger.warning(f"⚠️ 알림 스트림 구독자 수 초과: {alert_events.max_subscribers}")
+        return jsonify({'error': 'Too many subscribers'}), 503
+
+    logger.info(f"📡 알림 스트림 구독 시작: 구독자 {alert_events.subscriber_count}명, 이어받기 {len(replay)}건")
+
+    def generate():
+        try:
+            yield "retry: 3000\n\n"
+            for frame in replay:
+                yield frame
+
+            while True:
+                frame = subscriber.next(ALERT_STREAM_HEARTBEAT_SECONDS)
+                if subscriber.evicted:
+                    logger.warning("⚠️ 느린 알림 스트림 구독자 연결 종료")
+                    yield "event: evicted\ndata: {}\n\n"
+                    return
+                # 이벤트가 없으면 연결 유지용 주석 (끊긴 연결은 여기서 쓰기 실패로 감지)
+                yield frame if frame is not None else ": keepalive\n\n"
+        finally:
+            alert_events.unsubscribe(subscriber)
+            logger.info(f"📡 알림 스트림 구독 종료: 구독자 {alert_events.subscriber_count}명")
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # 리버스 프록시 버퍼링 비활성화
+    })
+
+
+@alerts_bp.route('/alerts/export', methods=['GET'])
+def export_alerts():
+    """
+    알림 전체 내보내기 API (스트리밍, 최신순)
+
+    Query Parameters:
+        GET /alerts와 같은 필터 (status, alert_type, target_url, since, until, fields)
+        format: ndjson (기본값) 또는 json (JSON 배열)
+        chunk_size: 한 번에 조회하여 보내는 행 수
+    """
+    try:
+        filters = parse_alert_filters(request.args)
+        fmt = parse_format(request.args.get('format'))
+        chunk_size = parse_chunk_size(request.args.get('chunk_size'))
+    except ValueError as e:
+        logger.warning(f"⚠️ 잘못된 조회 조건: {str(e)}")
+        return jsonify({'error': str(e)}), 400
+
+    logger.info(f"📤 알림 내보내기 시작: format={fmt}, chunk_size={chunk_size}")
+    return stream_rows(partial(Alert.get_page, **filters), fmt, chunk_size, 'alerts')
+
+
 @alerts_bp.route('/alerts/<int:alert_id>', methods=['GET'])
+@cached_response(alert_read_cache)
 def get_alert(alert_id: int):
     """특정 알림 상세 조회 API"""
     try:
@@ -96,6 +205,10 @@ def update_alert_status(alert_id: int):
         # 업데이트된 알림 조회
         updated_alert = Alert.get_by_id(alert_id)
 
+        # 구독자에게 상태 변경 전달
+        if alert['status'] != new_status:
+            alert_events.publish(STATUS_EVENTS[new_status], updated_alert)
+
         return jsonify({
             'success': True,
             'alert': updated_alert
@@ -108,20 +221,61 @@ def update_alert_status(alert_id: int):
 
 @alerts_bp.route('/notification_logs', methods=['GET'])
 def get_notification_logs():
-    """알림 발송 로그 조회 API"""
-    # 쿼리 파라미터에서 limit 가져오기 (기본값: 50)
-    limit = request.args.get('limit', default=50, type=int)
+    """
+    알림 발송 로그 조회 API (최신순, 커서 기반 페이지네이션)
 
+    Query Parameters:
+        alert_id: 알림 ID
+        channel, status: 쉼표로 여러 값 지정 가능
+        since, until: 발송 시각 범위 (ISO 8601 UTC, since 이상 until 미만)
+        fields: 응답에 포함할 필드 (쉼표 구분)
+        limit: 페이지 크기 (기본값: 50)
+        cursor: 이전 응답의 next_cursor
+    """
     try:
-        logs = NotificationLog.get_recent(limit=limit)
-        logger.info(f"📋 알림 발송 로그 조회: count={len(logs)}")
+        filters = parse_log_filters(request.args)
+        filters['cursor'] = request.args.get('cursor')
+        filters['limit'] = parse_limit(request.args.get('limit'), default=50)
+        if filters['cursor']:
+            decode_cursor(filters['cursor'])
+    except ValueError as e:
+        logger.warning(f"⚠️ 잘못된 조회 조건: {str(e)}")
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        page = NotificationLog.get_page(**filters)
+        logs = page['rows']
+        logger.info(f"📋 알림 발송 로그 조회: count={len(logs)}, more={page['next_cursor'] is not None}")
 
         return jsonify({
             'success': True,
             'count': len(logs),
-            'logs': logs
+            'logs': logs,
+            'next_cursor': page['next_cursor']
         }), 200
 
     except Exception as e:
         logger.error(f"❌ 알림 발송 로그 조회 중 오류: {str(e)}")
         return jsonify({'error': str(e)}), 500
+
+
+@alerts_bp.route('/notification_logs/export', methods=['GET'])
+def export_notification_logs():
+    """
+    알림 발송 로그 전체 내보내기 API (스트리밍, 최신순)
+
+    Query Parameters:
+        GET /notification_logs와 같은 필터 (alert_id, channel, status, since, until, fields)
+        format: ndjson (기본값) 또는 json (JSON 배열)
+        chunk_size: 한 번에 조회하여 보내는 행 수
+    """
+    try:
+        filters = parse_log_filters(request.args)
+        fmt = parse_format(request.args.get('format'))
+        chunk_size = parse_chunk_size(request.args.get('chunk_size'))
+    except ValueError as e:
+        logger.warning(f"⚠️ 잘못된 조회 조건: {str(e)}")
+        return jsonify({'error': str(e)}), 400
+
+    logger.info(f"📤 알림 발송 로그 내보내기 시작: format={fmt}, chunk_size={chunk_size}")
+    return stream_rows(partial(NotificationLog.get_page, **filters), fmt, chunk_size, 'notification_logs')
@@ -2,9 +2,15 @@
 /events API - 이벤트 수신 및 처리
 """
 from flask import Blueprint, request, jsonify
-from models import Event, Alert, NotificationLog
-from notifiers.console import ConsoleNotifier
-from notifiers.telegram import TelegramNotifier
+from models import Event, EventSummary, Alert
+from alert_stream import alert_events
+from target_state import target_states
+from notifiers import create_notifiers
+from notifiers.registry import NotifierRegistry
+from dispatcher import NotificationDispatcher
+from timeutil import parse_utc
+from datetime import datetime
+from typing import Optional
 import logging
 import os
 
@@ -14,15 +20,20 @@ events_bp = Blueprint('events', __name__)
 # 로거
 logger = logging.getLogger('events_api')
 
-# 알림 채널
-console_notifier = ConsoleNotifier()
-telegram_notifier = TelegramNotifier()
+# 알림 채널 (BaseNotifier를 상속한 등록 채널 전체)
+notifier_registry = NotifierRegistry(create_notifiers())
+
+# 알림 발송 디스패처 (발송 대기열에 추가된 알림을 별도 스레드에서 발송, 서버 시작 시 start)
+notification_dispatcher = NotificationDispatcher(notifier_registry)
 
 # API 키 (환경변수에서 로드)
 from dotenv import load_dotenv
 load_dotenv()
 API_KEY = os.getenv('API_KEY', 'my-secret-key-12345')
 
+# 배치 수신 최대 이벤트 개수
+MAX_BATCH_SIZE = int(os.getenv('MAX_BATCH_SIZE', '1000'))
+
 
 def verify_api_key():
     """API 키 검증"""
@@ -44,11 +55,10 @@ def create_event():
     data = request.get_json()
 
     # 필수 필드 검증
-    required_fields = ['target_url', 'response_time_ms', 'is_success', 'timestamp']
-    for field in required_fields:
-        if field not in data:
-            logger.warning(f"⚠️ 필수 필드 누락: {field}")
-            return jsonify({'error': f'Missing required field: {field}'}), 400
+    error = validate_event(data)
+    if error:
+        logger.warning(f"⚠️ 이벤트 검증 실패: {error}")
+        return jsonify({'error': error}), 400
 
     try:
         # 이벤트 생성
@@ -57,17 +67,20 @@ def create_event():
             status_code=data.get('status_code'),
             response_time_ms=data['response_time_ms'],
             is_success=data['is_success'],
-            error_message=data.get('error_message')
+            error_message=data.get('error_message'),
+            dns_ms=data.get('dns_ms'),
+            connect_ms=data.get('connect_ms'),
+            tls_ms=data.get('tls_ms'),
+            ttfb_ms=data.get('ttfb_ms'),
+            headers_ms=data.get('headers_ms'),
+            body_ms=data.get('body_ms'),
+            timestamp=data.get('timestamp')
         )
 
         logger.info(f"✅ 이벤트 저장 완료: event_id={event_id}, url={data['target_url']}, success={data['is_success']}")
 
-        # 장애 감지 및 알림 처리
-        if not data['is_success']:
-            handle_failure(event_id, data)
-        else:
-            # 정상 응답 시 복구 감지
-            handle_recovery(data['target_url'])
+        # 대상 상태 갱신 후 장애/복구 감지
+        process_result(event_id, data, bool(data['is_success']))
 
         return jsonify({
             'success': True,
@@ -79,7 +92,208 @@ def create_event():
         return jsonify({'error': str(e)}), 500
 
 
-def handle_failure(event_id: int, data: dict):
+@events_bp.route('/events/batch', methods=['POST'])
+def create_events_batch():
+    """이벤트 일괄 수신 API (단일 트랜잭션 저장 후 대상별 장애/복구 감지)"""
+    # API 키 검증
+    if not verify_api_key():
+        logger.warning("⚠️ 인증 실패: 잘못된 API 키")
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    # 요청 데이터 파싱
+    data = request.get_json(silent=True) or {}
+    events = data.get('events')
+
+    if not isinstance(events, list) or not events:
+        logger.warning("⚠️ 필수 필드 누락: events")
+        return jsonify({'error': 'Missing required field: events (non-empty list)'}), 400
+
+    if len(events) > MAX_BATCH_SIZE:
+        logger.warning(f"⚠️ 배치 크기 초과: {len(events)} > {MAX_BATCH_SIZE}")
+        return jsonify({'error': f'Batch too large. Max {MAX_BATCH_SIZE} events'}), 413
+
+    # 이벤트별 검증 (잘못된 이벤트만 제외하고 나머지는 저장)
+    # type이 summary인 항목은 Agent 집계 모드의 구간 요약
+    accepted = []
+    summaries = []
+    rejected = []
+    order = []  # 수신 순서 (종류, 종류별 목록의 위치)
+    for index, event in enumerate(events):
+        is_summary = isinstance(event, dict) and event.get('type') == 'summary'
+        error = validate_summary(event) if is_summary else validate_event(event)
+        if error:
+            rejected.append({'index': index, 'error': error})
+        elif is_summary:
+            order.append(('summary', len(summaries)))
+            summaries.append(event)
+        else:
+            order.append(('event', len(accepted)))
+            accepted.append(event)
+
+    if not accepted and not summaries:
+        logger.warning(f"⚠️ 배치 전체 검증 실패: {len(rejected)}건")
+        return jsonify({'error': 'No valid events in batch', 'rejected': rejected}), 400
+
+    try:
+        # 종류별로 단일 트랜잭션으로 일괄 저장
+        event_ids = Event.create_many(accepted) if accepted else []
+        summary_ids = EventSummary.create_many(summaries) if summaries else []
+
+        logger.info(f"✅ 이벤트 일괄 저장 완료: 이벤트 {len(event_ids)}건, 요약 {len(summary_ids)}건 "
+                    f"(거부 {len(rejected)}건)")
+
+        # 수신 순서대로 대상 상태 갱신 후 장애/복구 감지 (요약은 연속된 같은 결과로 반영)
+        process_state_changes([
+            (event_ids[position], accepted[position]) if kind == 'event' else (None, summaries[position])
+            for kind, position in order
+        ])
+
+        return jsonify({
+            'success': True,
+            'count': len(event_ids),
+            'event_ids': event_ids,
+            'summary_count': len(summary_ids),
+            'rejected': rejected
+        }), 201
+
+    except Exception as e:
+        logger.error(f"❌ 이벤트 일괄 처리 중 오류: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+
+def validate_event(data) -> Optional[str]:
+    """이벤트 필드 검증 (오류 메시지 반환, 정상이면 None / timestamp는 'YYYY-MM-DD HH:MM:SS' UTC로 정규화)"""
+    if not isinstance(data, dict):
+        return 'Event must be a JSON object'
+
+    required_fields = ['target_url', 'response_time_ms', 'is_success', 'timestamp']
+    for field in required_fields:
+        if field not in data:
+            return f'Missing required field: {field}'
+
+    if not isinstance(data['target_url'], str) or not data['target_url']:
+        return 'target_url must be a non-empty string'
+    if not isinstance(data['is_success'], bool):
+        return 'is_success must be a boolean'
+    if not is_non_negative_number(data['response_time_ms']):
+        return 'response_time_ms must be a non-negative number'
+
+    for field in EVENT_TIMING_FIELDS:
+        value = data.get(field)
+        if value is not None and not is_non_negative_number(value):
+            return f'{field} must be a non-negative number'
+    status_code = data.get('status_code')
+    if status_code is not None and (not is_integer(status_code) or not 100 <= status_code <= 599):
+        return 'status_code must be an HTTP status code'
+    error_message = data.get('error_message')
+    if error_message is not None and not isinstance(error_message, str):
+        return 'error_message must be a string'
+
+    try:
+        data['timestamp'] = parse_utc(data['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+    except (TypeError, ValueError):
+        return 'timestamp must be an ISO 8601 timestamp'
+
+    return None
+
+
+# 이벤트의 선택 숫자 필드 (구간별 응답 시간)
+EVENT_TIMING_FIELDS = ('dns_ms', 'connect_ms', 'tls_ms', 'ttfb_ms', 'headers_ms', 'body_ms')
+
+# 구간 요약의 선택 숫자 필드 (응답 시간 통계, 마지막 응답 코드)
+SUMMARY_LATENCY_FIELDS = ('min_ms', 'max_ms', 'avg_ms', 'p50_ms', 'p95_ms', 'p99_ms')
+
+
+def is_integer(value) -> bool:
+    """JSON 정수 여부 (bool은 int의 하위 타입이므로 제외)"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def is_non_negative_number(value) -> bool:
+    """0 이상의 JSON 숫자 여부 (bool 제외)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+
+
+def validate_summary(data: dict) -> Optional[str]:
+    """구간 요약 필드 검증 (시각은 'YYYY-MM-DD HH:MM:SS' UTC로 정규화)"""
+    required_fields = ['target_url', 'window_start', 'window_end', 'count', 'failures']
+    for field in required_fields:
+        if field not in data:
+            return f'Missing required field: {field}'
+
+    if not isinstance(data['target_url'], str) or not data['target_url']:
+        return 'target_url must be a non-empty string'
+    if not is_integer(data['count']) or data['count'] < 1:
+        return 'count must be a positive integer'
+    if not is_integer(data['failures']) or not 0 <= data['failures'] <= data['count']:
+        return 'failures must be an integer between 0 and count'
+
+    for field in SUMMARY_LATENCY_FIELDS:
+        value = data.get(field)
+        if value is not None and not is_non_negative_number(value):
+            return f'{field} must be a non-negative number'
+    status_code = data.get('last_status_code')
+    if status_code is not None and (not is_integer(status_code) or not 100 <= status_code <= 599):
+        return 'last_status_code must be an HTTP status code'
+
+    try:
+        for field in ('window_start', 'window_end'):
+            data[field] = parse_utc(data[field]).strftime('%Y-%m-%d %H:%M:%S')
+    except (TypeError, ValueError):
+        return 'window_start/window_end must be ISO 8601 timestamps'
+
+    return None
+
+
+def process_state_changes(results):
+    """
+    배치 항목의 장애/복구 감지 (수신 순서대로 대상 상태에 반영)
+
+    Args:
+        results: (event_id, 이벤트 데이터) 목록 - 구간 요약은 event_id가 None
+    """
+    for event_id, data in results:
+        if event_id is not None:
+            process_result(event_id, data, bool(data['is_success']))
+            continue
+
+        # 집계 모드의 요약은 상태 변화 시점에 끊기므로 모두 실패 또는 모두 성공
+        # (실패와 성공이 섞인 요약은 결과 순서를 알 수 없어 연속 횟수에 반영하지 않음)
+        count, failures = data['count'], data['failures']
+        if 0 < failures < count:
+            continue
+        process_result(None, {'target_url': data['target_url'], 'status_code': data.get('last_status_code')},
+                       failures == 0, count=count, summary=True)
+
+
+def process_result(event_id: Optional[int], data: dict, is_success: bool,
+                   count: int = 1, summary: bool = False):
+    """
+    점검 결과로 대상 상태(메모리)를 갱신하고 장애/복구/flapping 처리
+
+    - 연속 실패가 open_after회 이상이면 장애 알림, 연속 성공이 resolve_after회 이상이면 복구
+    - flapping 중에는 알림을 새로 열거나 해결하지 않음 (시작 시 한 번만 WARNING 알림)
+    """
+    target_url = data['target_url']
+    state = target_states.record(target_url, is_success, count, summary)
+    if state is None:
+        return
+
+    if state['flapping']:
+        if state['flap_changed']:
+            handle_flapping(event_id, target_url, state)
+        return
+    if state['flap_changed']:
+        logger.info(f"ℹ️ 상태 안정됨 (flapping 종료): url={target_url}")
+
+    open_after, resolve_after = target_states.thresholds(target_url)
+    if not is_success and state['streak'] >= open_after:
+        handle_failure(event_id, data, state['streak'])
+    elif is_success and state['streak'] >= resolve_after:
+        handle_recovery(event_id, target_url)
+
+
+def handle_failure(event_id: Optional[int], data: dict, streak: int = 1):
     """장애 처리 및 알림 생성"""
     target_url = data['target_url']
 
@@ -92,22 +306,56 @@ def handle_failure(event_id: int, data: dict):
 
     # 새 알림 생성
     message = create_error_message(data)
+    if streak > 1:
+        message += f" (연속 {streak}회 실패)"
     alert_id = Alert.create(
         event_id=event_id,
         alert_type='ERROR',
         message=message,
-        target_url=target_url
+        target_url=target_url,
+        channels=notifier_registry.channels()
     )
 
     logger.warning(f"🚨 알림 생성: alert_id={alert_id}, url={target_url}")
+    alert_events.publish('created', {
+        'id': alert_id, 'event_id': event_id, 'alert_type': 'ERROR', 'status': 'OPEN',
+        'created_at': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'), 'resolved_at': None,
+        'message': message, 'target_url': target_url
+    })
+
+    # 알림 발송 (알림과 함께 발송 대기열에 추가됨)
+    send_notifications()
 
-    # 알림 발송
-    send_notifications(alert_id)
 
+def handle_flapping(event_id: Optional[int], target_url: str, state: dict):
+    """flapping 시작 처리 (열린 알림이 없으면 WARNING 알림 한 건, 있으면 해결하지 않고 유지)"""
+    existing_alert = Alert.get_open_alert_by_url(target_url)
+    if existing_alert:
+        logger.warning(f"⚠️ flapping 감지 (기존 알림 유지): alert_id={existing_alert['id']}, url={target_url}")
+        return
+
+    message = f"상태가 자주 바뀌고 있습니다 (flapping): 최근 {state['window']}회 중 {state['changes']}회 변화"
+    alert_id = Alert.create(
+        event_id=event_id,
+        alert_type='WARNING',
+        message=message,
+        target_url=target_url,
+        channels=notifier_registry.channels()
+    )
+
+    logger.warning(f"⚠️ flapping 알림 생성: alert_id={alert_id}, url={target_url}")
+    alert_events.publish('created', {
+        'id': alert_id, 'event_id': event_id, 'alert_type': 'WARNING', 'status': 'OPEN',
+        'created_at': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'), 'resolved_at': None,
+        'message': message, 'target_url': target_url
+    })
 
-def handle_recovery(target_url: str):
+    send_notifications()
+
+
+def handle_recovery(event_id: Optional[int], target_url: str):
     """복구 감지 및 처리"""
-    # OPEN 또는 ACK 상태의 알림이 있는지 확인
+    # OPEN 또는 ACK 상태의 알림이 있는지 확인 (메모리 캐시 조회, 없으면 DB 접근 없이 종료)
     existing_alert = Alert.get_open_alert_by_url(target_url)
 
     if existing_alert:
@@ -115,53 +363,31 @@ def handle_recovery(target_url: str):
 
         # 기존 알림을 RESOLVED로 변경
         Alert.resolve_by_url(target_url)
+        resolved_at = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+        alert_events.publish('resolved', {**existing_alert, 'status': 'RESOLVED', 'resolved_at': resolved_at})
 
-        # 복구 알림 생성
-        event = Event.get_recent_by_url(target_url, limit=1)[0]
+        # 복구 알림 생성 (복구를 감지한 이벤트 기준, 바로 RESOLVED 상태로 생성)
         alert_id = Alert.create(
-            event_id=event['id'],
+            event_id=event_id,
             alert_type='RECOVERY',
             message='서비스가 정상 복구되었습니다.',
-            target_url=target_url
+            target_url=target_url,
+            status='RESOLVED',
+            channels=notifier_registry.channels()
         )
-
-        # 복구 알림도 즉시 RESOLVED로 설정
-        Alert.update_status(alert_id, 'RESOLVED')
+        alert_events.publish('created', {
+            'id': alert_id, 'event_id': event_id, 'alert_type': 'RECOVERY', 'status': 'RESOLVED',
+            'created_at': resolved_at, 'resolved_at': resolved_at,
+            'message': '서비스가 정상 복구되었습니다.', 'target_url': target_url
+        })
 
         # 복구 알림 발송
-        send_notifications(alert_id)
+        send_notifications()
 
 
-def send_notifications(alert_id: int):
-    """알림 발송 (모든 채널)"""
-    alert = Alert.get_by_id(alert_id)
-
-    if not alert:
-        logger.error(f"❌ 알림을 찾을 수 없음: alert_id={alert_id}")
-        return
-
-    # 콘솔 알림
-    console_result = console_notifier.send(alert)
-    NotificationLog.create(
-        alert_id=alert_id,
-        channel=console_notifier.get_channel_name(),
-        status='SENT' if console_result['success'] else 'FAILED',
-        response_code=None,
-        message_id=console_result.get('message_id'),
-        error_message=console_result.get('error')
-    )
-
-    # 텔레그램 알림 (활성화된 경우만)
-    if telegram_notifier.enabled:
-        telegram_result = telegram_notifier.send(alert)
-        NotificationLog.create(
-            alert_id=alert_id,
-            channel=telegram_notifier.get_channel_name(),
-            status='SENT' if telegram_result['success'] else 'FAILED',
-            response_code=None,
-            message_id=telegram_result.get('message_id'),
-            error_message=telegram_result.get('error')
-        )
+def send_notifications():
+    """발송 대기열에 추가한 알림을 바로 가져가도록 디스패처를 깨움 (발송과 재시도는 기다리지 않음)"""
+    notification_dispatcher.wake()
 
 
 def create_error_message(data: dict) -> str:
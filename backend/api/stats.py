@@ -0,0 +1,87 @@
+"""
+/stats API - 대상별 가동률 및 응답 시간 통계 (분/시간/일 rollup 기반)
+"""
+import re
+from datetime import datetime, timedelta
+from flask import Blueprint, request, jsonify
+from models import EventRollup
+from timeutil import parse_utc
+import logging
+
+# Blueprint 생성
+stats_bp = Blueprint('stats', __name__)
+
+# 로거
+logger = logging.getLogger('stats_api')
+
+# 기간 표기 (예: 30m, 24h, 7d)
+WINDOW_PATTERN = re.compile(r'^(\d+)([mhd])$')
+WINDOW_UNITS = {'m': 'minutes', 'h': 'hours', 'd': 'days'}
+
+
+def parse_window(args) -> tuple:
+    """
+    조회 기간 [since, until) (UTC, 시간대가 있는 since/until은 UTC로 환산)
+    since/until(ISO 8601)이 없으면 window(기본값: 24h)만큼 until(기본값: 현재)부터 거슬러 올라감
+    """
+    try:
+        until = parse_utc(args['until']) if 'until' in args else datetime.utcnow()
+        since = parse_utc(args['since']) if 'since' in args else None
+    except ValueError:
+        raise ValueError('since/until must be ISO 8601 timestamps')
+
+    if since is None:
+        match = WINDOW_PATTERN.match(args.get('window', '24h'))
+        if not match or int(match.group(1)) == 0:
+            raise ValueError('window must look like 30m, 24h or 7d')
+        try:
+            since = until - timedelta(**{WINDOW_UNITS[match.group(2)]: int(match.group(1))})
+        except OverflowError:
+            # timedelta 범위 또는 datetime 최소값을 넘는 기간
+            raise ValueError('window is too long')
+
+    if since >= until:
+        raise ValueError('since must be earlier than until')
+    return since, until
+
+
+@stats_bp.route('/stats', methods=['GET'])
+def get_stats():
+    """
+    대상별 통계 조회 API
+
+    Query Parameters:
+        target_url: 특정 대상만 조회 (없으면 전체 대상)
+        window: 조회 기간 (예: 30m, 24h, 7d, 기본값: 24h)
+        since, until: 조회 기간 직접 지정 (ISO 8601 UTC, window보다 우선)
+    """
+    try:
+        since, until = parse_window(request.args)
+    except ValueError as e:
+        logger.warning(f"⚠️ 잘못된 조회 기간: {str(e)}")
+        return jsonify({'error': str(e)}), 400
+
+    target_url = request.args.get('target_url')
+
+    try:
+        stats = EventRollup.get_stats(since, until, target_url)
+        logger.info(f"📊 통계 조회: {since:%Y-%m-%d %H:%M} ~ {until:%Y-%m-%d %H:%M}, 대상 {len(stats)}개")
+
+        response = {
+            'success': True,
+            'since': since.strftime('%Y-%m-%d %H:%M:%S'),
+            'until': until.strftime('%Y-%m-%d %H:%M:%S')
+        }
+        if target_url:
+            if not stats:
+                return jsonify({'error': 'No data for target_url in window'}), 404
+            response['stats'] = stats[0]
+        else:
+            response['count'] = len(stats)
+            response['targets'] = stats
+
+        return jsonify(response), 200
+
+    except Exception as e:
+        logger.error(f"❌ 통계 조회 중 오류: {str(e)}")
+        return jsonify({'error': str(e)}), 500
@@ -2,16 +2,24 @@
 Flask 백엔드 서버 메인 애플리케이션
 """
 import os
+import atexit
 import logging
 from logging.handlers import RotatingFileHandler
 from flask import Flask, jsonify
 from dotenv import load_dotenv
-from api.events import events_bp
+from werkzeug.serving import is_running_from_reloader
+from api.events import events_bp, notification_dispatcher
 from api.alerts import alerts_bp
+from api.stats import stats_bp
+from models import Alert
+from retention import RetentionWorker, EVENT_RETENTION_DAYS
 
 # 환경변수 로드
 load_dotenv()
 
+# 디버그 모드 (python app.py, flask run에서 코드 변경 시 자동 재시작)
+DEBUG = os.getenv('FLASK_DEBUG', 'false').lower() in ('true', '1')
+
 # Flask 앱 생성
 app = Flask(__name__)
 
@@ -60,6 +68,44 @@ logger = setup_logging()
 # Blueprint 등록
 app.register_blueprint(events_bp)
 app.register_blueprint(alerts_bp)
+app.register_blueprint(stats_bp)
+
+
+def is_reloader_parent() -> bool:
+    """
+    개발 서버 리로더의 감시(부모) 프로세스인지
+    (python app.py, flask run의 디버그 모드는 코드를 감시하는 부모 프로세스와
+     요청을 처리하는 자식 프로세스(WERKZEUG_RUN_MAIN=true)로 나뉘어 앱을 두 번 불러옴)
+    """
+    dev_server = __name__ == '__main__' or os.environ.get('FLASK_RUN_FROM_CLI') == 'true'
+    return dev_server and DEBUG and not is_running_from_reloader()
+
+
+def start_background_workers(app: Flask) -> None:
+    """
+    서버 시작 작업 (열린 알림 캐시 로드, 알림 발송 디스패처와 보존 기간 정리 스레드 시작)
+    - 앱을 불러올 때 한 번 실행: python app.py, flask run, gunicorn 등 WSGI 서버 모두 동일
+    - 리로더 감시 프로세스에서는 시작하지 않음 (요청을 처리하는 프로세스에서만 실행)
+    """
+    if app.extensions.get('background_workers') or is_reloader_parent():
+        return
+    app.extensions['background_workers'] = True
+
+    # 열린 알림 캐시 로드 (장애/복구 감지와 열린 알림 조회는 이후 DB 대신 캐시 사용)
+    open_count = Alert.load_open_alerts()
+    logger.info(f"📌 열린 알림 {open_count}건 로드")
+
+    # 알림 발송 시작 (이전 실행에서 발송하지 못한 알림 포함), 종료 시 발송 중인 알림 마무리
+    notification_dispatcher.start()
+    atexit.register(notification_dispatcher.close)
+
+    # 보존 기간 정리 스레드 시작
+    RetentionWorker().start()
+    logger.info(f"🧹 보존 기간 정리 시작: 원본 이벤트 {EVENT_RETENTION_DAYS:g}일 보관")
+
+
+# 서버 시작 작업 (앱을 불러올 때 실행)
+start_background_workers(app)
 
 
 # 루트 엔드포인트 (헬스체크)
@@ -91,17 +137,16 @@ def internal_error(error):
 if __name__ == '__main__':
     # 환경변수에서 포트 가져오기
     port = int(os.getenv('FLASK_PORT', 5000))
-    debug = os.getenv('FLASK_DEBUG', 'false').lower() == 'true'
 
     logger.info("=" * 80)
     logger.info("🚀 Error Notification System 백엔드 서버 시작")
     logger.info(f"   포트: {port}")
-    logger.info(f"   디버그 모드: {debug}")
+    logger.info(f"   디버그 모드: {DEBUG}")
     logger.info("=" * 80)
 
     # Flask 서버 실행
     app.run(
         host='0.0.0.0',
         port=port,
-        debug=debug
+        debug=DEBUG
     )
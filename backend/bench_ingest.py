@@ -0,0 +1,119 @@
+"""
+이벤트 수신 경로 DB 처리량 벤치마크
+- before: 쿼리마다 새 연결 (기본 rollback journal 모드, 변경 전 get_db_connection)
+- pooled: 연결 풀 재사용 + WAL + PRAGMA 설정, 쓰기마다 커밋 (DB_GROUP_COMMIT=false)
+- group: pooled + 그룹 커밋 쓰기 스레드 (현재 기본값)
+
+각 모드는 임시 DB 파일에서 POST /events의 DB 작업을 그대로 반복:
+    정상 이벤트: Event.create → Alert.get_open_alert_by_url (열린 알림 캐시 조회)
+    장애 이벤트(새 알림): Event.create → Alert.get_open_alert_by_url → Alert.create (발송 대기열 포함)
+                          → Alert.resolve_by_url (다음 회차를 위해 정리)
+
+사용법:
+    python bench_ingest.py [--events 2000] [--failure-ratio 0.1] [--threads 8]
+"""
+import argparse
+import io
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, redirect_stdout
+
+import database
+import init_db
+from models import Event, Alert
+
+
+@contextmanager
+def legacy_connection():
+    """변경 전 방식: 쿼리마다 연결을 열고 닫음"""
+    conn = sqlite3.connect(database.DB_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        yield conn
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        raise e
+    finally:
+        conn.close()
+
+
+def ingest(index: int, failure_ratio: float) -> None:
+    """이벤트 1건 수신 시의 DB 작업"""
+    target_url = f"https://bench-{index % 50}.example.com"
+    is_success = (index % 1000) >= failure_ratio * 1000
+
+    event_id = Event.create(target_url, 200 if is_success else 500, 120, is_success,
+                            None if is_success else 'HTTP 500')
+    existing_alert = Alert.get_open_alert_by_url(target_url)
+
+    if not is_success and not existing_alert:
+        Alert.create(event_id, 'ERROR', 'HTTP 500', target_url, channels=('CONSOLE',))
+        Alert.resolve_by_url(target_url)
+
+
+def run(mode: str, events: int, failure_ratio: float, threads: int) -> float:
+    """한 모드 실행 후 초당 처리 이벤트 수 반환"""
+    directory = tempfile.mkdtemp(prefix='bench-ingest-')
+    db_path = os.path.join(directory, 'bench.db')
+    init_db.DB_PATH = db_path
+    database.DB_PATH = db_path
+
+    original = database.get_db_connection
+    group_commit = database.DB_GROUP_COMMIT
+    database.DB_GROUP_COMMIT = mode == 'group'
+    with redirect_stdout(io.StringIO()):
+        init_db.create_tables()
+    if mode == 'before':
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("PRAGMA journal_mode=DELETE")
+        database.get_db_connection = legacy_connection
+    Alert.load_open_alerts()
+
+    per_thread = events // threads
+
+    def worker(offset: int):
+        for i in range(per_thread):
+            ingest(offset + i, failure_ratio)
+
+    workers = [threading.Thread(target=worker, args=(n * per_thread,)) for n in range(threads)]
+    start = time.perf_counter()
+    try:
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+    finally:
+        elapsed = time.perf_counter() - start
+        database.get_db_connection = original
+        database.DB_GROUP_COMMIT = group_commit
+        database.close_all()
+
+    return per_thread * threads / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='이벤트 수신 경로 DB 처리량 벤치마크')
+    parser.add_argument('--events', type=int, default=2000, help='모드별 처리할 이벤트 수')
+    parser.add_argument('--failure-ratio', type=float, default=0.1, help='장애 이벤트 비율 (0~1)')
+    parser.add_argument('--threads', type=int, default=8, help='동시 요청 스레드 수')
+    args = parser.parse_args()
+
+    print(f"이벤트 {args.events}건, 장애 비율 {args.failure_ratio}, 스레드 {args.threads}개")
+    print(f"PRAGMA: synchronous={database.DB_SYNCHRONOUS}, cache_size={database.DB_CACHE_SIZE_KB}KB, "
+          f"mmap_size={database.DB_MMAP_SIZE}, busy_timeout={database.DB_BUSY_TIMEOUT_MS}ms")
+    print(f"그룹 커밋: 최대 {database.DB_GROUP_COMMIT_MAX_BATCH}문장 / {database.DB_GROUP_COMMIT_MAX_DELAY_MS}ms, "
+          f"쓰기 스레드 synchronous={database.DB_WRITER_SYNCHRONOUS}")
+
+    results = {}
+    for mode in ('before', 'pooled', 'group'):
+        results[mode] = run(mode, args.events, args.failure_ratio, args.threads)
+        ratio = results[mode] / results['before']
+        print(f"  {mode:6s}: {results[mode]:10.0f} events/s ({ratio:.1f}배)")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,20 +1,91 @@
 """
 데이터베이스 연결 및 쿼리 관리
+- 연결은 풀에서 재사용 (요청마다 새로 열지 않음)
+- WAL 모드 및 PRAGMA(synchronous, cache_size, mmap_size, busy_timeout)는 환경변수로 설정
+- 같은 스레드에서 중첩 호출 시 바깥 트랜잭션의 연결을 그대로 사용
+- 쓰기(INSERT/UPDATE/DELETE)는 그룹 커밋 쓰기 스레드가 여러 요청을 모아 한 트랜잭션으로 커밋
 """
 import sqlite3
 import os
+import queue
+import threading
+import time
 from contextlib import contextmanager
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
 
 # 데이터베이스 파일 경로
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'notifications.db')
 
+# 연결 설정
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '8'))  # 유지할 유휴 연결 수
+DB_SYNCHRONOUS = os.getenv('DB_SYNCHRONOUS', 'NORMAL').upper()  # OFF, NORMAL, FULL, EXTRA
+DB_CACHE_SIZE_KB = int(os.getenv('DB_CACHE_SIZE_KB', '16384'))  # 연결당 페이지 캐시 (16MB)
+DB_MMAP_SIZE = int(os.getenv('DB_MMAP_SIZE', str(256 * 1024 * 1024)))  # 256MB
+DB_BUSY_TIMEOUT_MS = int(os.getenv('DB_BUSY_TIMEOUT_MS', '5000'))
+DB_CACHED_STATEMENTS = int(os.getenv('DB_CACHED_STATEMENTS', '256'))  # 연결당 준비된 문장 캐시
+
+# 그룹 커밋 설정 (쓰기 요청을 모아 한 번에 커밋)
+DB_GROUP_COMMIT = os.getenv('DB_GROUP_COMMIT', 'true').lower() == 'true'
+DB_GROUP_COMMIT_MAX_BATCH = int(os.getenv('DB_GROUP_COMMIT_MAX_BATCH', '1000'))  # 한 커밋의 최대 문장 수
+DB_GROUP_COMMIT_MAX_DELAY_MS = float(os.getenv('DB_GROUP_COMMIT_MAX_DELAY_MS', '0'))  # 요청을 더 모으는 최대 대기 (예: 5)
+DB_WRITER_SYNCHRONOUS = os.getenv('DB_WRITER_SYNCHRONOUS', 'FULL').upper()  # 쓰기 스레드 연결 (FULL: 커밋마다 fsync)
+
+for _name, _value in (('DB_SYNCHRONOUS', DB_SYNCHRONOUS), ('DB_WRITER_SYNCHRONOUS', DB_WRITER_SYNCHRONOUS)):
+    if _value not in ('OFF', 'NORMAL', 'FULL', 'EXTRA'):
+        raise ValueError(f"{_name}는 OFF, NORMAL, FULL, EXTRA 중 하나여야 합니다.")
+
+# 유휴 연결 풀 (최근 반환된 연결부터 재사용)
+_pool: queue.LifoQueue = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+
+# 현재 스레드가 사용 중인 연결 (중첩 호출용)
+_local = threading.local()
+
+
+def connect() -> sqlite3.Connection:
+    """새 연결 생성 및 PRAGMA 설정"""
+    conn = sqlite3.connect(
+        DB_PATH,
+        timeout=DB_BUSY_TIMEOUT_MS / 1000,
+        cached_statements=DB_CACHED_STATEMENTS,
+        check_same_thread=False  # 풀을 통해 스레드 간 이동 (동시에 두 스레드가 쓰지는 않음)
+    )
+    conn.row_factory = sqlite3.Row  # 딕셔너리 형태로 결과 반환
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA synchronous={DB_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA cache_size={-DB_CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size={DB_MMAP_SIZE}")
+    conn.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+    return conn
+
+
+def _acquire() -> sqlite3.Connection:
+    try:
+        return _pool.get_nowait()
+    except queue.Empty:
+        return connect()
+
+
+def _release(conn: sqlite3.Connection) -> None:
+    try:
+        _pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
 
 @contextmanager
 def get_db_connection():
-    """데이터베이스 연결을 관리하는 컨텍스트 매니저"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row  # 딕셔너리 형태로 결과 반환
+    """데이터베이스 연결을 관리하는 컨텍스트 매니저 (블록이 끝나면 커밋, 예외 시 롤백)"""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        # 중첩 호출: 바깥 블록이 커밋/롤백
+        yield conn
+        return
+
+    conn = _acquire()
+    _local.conn = conn
     try:
         yield conn
         conn.commit()
@@ -22,14 +93,174 @@ def get_db_connection():
         conn.rollback()
         raise e
     finally:
+        _local.conn = None
+        _release(conn)
+
+
+def _run_statements(conn: sqlite3.Connection, statements: List[Tuple[str, tuple]]) -> Tuple[List[int], List[Dict[str, Any]]]:
+    """문장을 차례로 실행하고 문장별 lastrowid와 RETURNING 결과 행 반환"""
+    cursor = conn.cursor()
+    row_ids, rows = [], []
+    for query, params in statements:
+        cursor.execute(query, params)
+        rows.extend(dict(row) for row in cursor.fetchall())
+        row_ids.append(cursor.lastrowid)
+    return row_ids, rows
+
+
+class WriteRequest:
+    """쓰기 스레드에 전달하는 쓰기 요청 (한 요청의 문장들은 같은 트랜잭션에 포함)"""
+
+    def __init__(self, statements: List[Tuple[str, tuple]]):
+        self.statements = statements
+        self.row_ids: List[int] = []
+        self.rows: List[Dict[str, Any]] = []  # RETURNING 결과 행
+        self.error: Optional[Exception] = None
+        self.done = threading.Event()
+
+
+class GroupCommitWriter:
+    """
+    그룹 커밋 쓰기 스레드
+    - 대기 중인 쓰기 요청을 최대 max_batch 문장까지 모아 한 트랜잭션으로 커밋 (fsync 1회)
+      (커밋하는 동안 들어온 요청이 다음 배치가 되므로 동시 요청이 많을수록 배치가 커짐)
+    - max_delay > 0이면 직전 커밋에 여러 요청이 모였을 때 최대 max_delay 동안 더 모음
+      (요청이 드문드문 도착하는 경우 커밋 횟수를 더 줄임, 요청이 하나뿐이면 기다리지 않음)
+    - 요청자는 커밋이 끝난 뒤 행 ID와 RETURNING 결과 행을 받음
+    """
+
+    def __init__(self, max_batch: int = DB_GROUP_COMMIT_MAX_BATCH,
+                 max_delay: float = DB_GROUP_COMMIT_MAX_DELAY_MS / 1000):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+        self._thread.start()
+
+    def execute(self, statements: List[Tuple[str, tuple]]) -> WriteRequest:
+        """쓰기 요청 후 커밋 완료까지 대기하고 실행 결과(행 ID, RETURNING 결과 행)가 담긴 요청 반환"""
+        request = WriteRequest(statements)
+        self._queue.put(request)
+        request.done.wait()
+
+        if request.error is not None:
+            raise request.error
+        return request
+
+    def submit(self, statements: List[Tuple[str, tuple]]) -> List[int]:
+        """쓰기 요청 후 커밋 완료까지 대기하고 문장별 lastrowid 반환"""
+        return self.execute(statements).row_ids
+
+    def _collect(self, first: WriteRequest, linger: bool) -> Tuple[List[WriteRequest], bool]:
+        """첫 요청에 이어 대기 중인 요청을 모음 (종료 요청을 받으면 stop=True)"""
+        batch = [first]
+        count = len(first.statements)
+        deadline = time.monotonic() + self.max_delay if linger and self.max_delay > 0 else None
+
+        while count < self.max_batch:
+            try:
+                if deadline is None:
+                    request = self._queue.get_nowait()
+                else:
+                    request = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+
+            if request is None:
+                return batch, True
+            batch.append(request)
+            count += len(request.statements)
+
+        return batch, False
+
+    def _execute(self, conn: sqlite3.Connection, request: WriteRequest) -> None:
+        request.row_ids, request.rows = _run_statements(conn, request.statements)
+
+    def _commit(self, conn: sqlite3.Connection, batch: List[WriteRequest]) -> None:
+        """배치를 한 트랜잭션으로 커밋 (실패 시 요청별 트랜잭션으로 다시 실행하여 실패 요청만 오류 처리)"""
+        try:
+            for request in batch:
+                self._execute(conn, request)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            for request in batch:
+                try:
+                    self._execute(conn, request)
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    request.error = e
+
+        for request in batch:
+            request.done.set()
+
+    def _run(self) -> None:
+        conn = connect()
+        conn.execute(f"PRAGMA synchronous={DB_WRITER_SYNCHRONOUS}")
+        linger = False
+        stop = False
+
+        while not stop:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch, stop = self._collect(first, linger)
+            self._commit(conn, batch)
+            linger = len(batch) > 1
+
         conn.close()
 
+    def close(self) -> None:
+        """대기 중인 요청을 커밋한 뒤 쓰기 스레드 종료"""
+        self._queue.put(None)
+        self._thread.join()
+
+
+# 그룹 커밋 쓰기 스레드 (첫 쓰기 시 시작)
+_writer: Optional[GroupCommitWriter] = None
+_writer_lock = threading.Lock()
+
+
+def _write(statements: List[Tuple[str, tuple]]) -> WriteRequest:
+    """쓰기 문장 실행 후 실행 결과(행 ID, RETURNING 결과 행)가 담긴 요청 반환"""
+    global _writer
+
+    conn = getattr(_local, 'conn', None)
+    if conn is not None or not DB_GROUP_COMMIT:
+        # 트랜잭션 블록 안의 쓰기(또는 그룹 커밋 비활성화)는 현재 스레드에서 직접 실행
+        request = WriteRequest(statements)
+        with get_db_connection() as conn:
+            request.row_ids, request.rows = _run_statements(conn, statements)
+        return request
+
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = GroupCommitWriter()
+    return _writer.execute(statements)
+
+
+def close_all() -> None:
+    """쓰기 스레드 종료 및 풀의 유휴 연결 모두 닫기"""
+    global _writer
+
+    with _writer_lock:
+        if _writer is not None:
+            _writer.close()
+            _writer = None
+
+    while True:
+        try:
+            _pool.get_nowait().close()
+        except queue.Empty:
+            break
+
 
 def execute_query(query: str, params: tuple = ()) -> None:
     """쿼리 실행 (INSERT, UPDATE, DELETE)"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
+    _write([(query, params)])
 
 
 def fetch_one(query: str, params: tuple = ()) -> Optional[Dict[str, Any]]:
@@ -51,8 +282,24 @@ def fetch_all(query: str, params: tuple = ()) -> List[Dict[str, Any]]:
 
 
 def insert_and_get_id(query: str, params: tuple = ()) -> int:
-    """데이터 삽입 후 자동 생성된 ID 반환"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        return cursor.lastrowid
+    """데이터 삽입 후 자동 생성된 ID 반환 (커밋 완료 후 반환)"""
+    return _write([(query, params)]).row_ids[0]
+
+
+def write_statements(statements: List[Tuple[str, tuple]]) -> List[int]:
+    """서로 다른 쓰기 문장 여러 개를 한 트랜잭션으로 실행 후 문장별 lastrowid 반환"""
+    if not statements:
+        return []
+    return _write(statements).row_ids
+
+
+def insert_many_and_get_ids(query: str, params_list: List[tuple]) -> List[int]:
+    """여러 행을 한 트랜잭션으로 삽입 후 자동 생성된 ID 목록 반환"""
+    if not params_list:
+        return []
+    return _write([(query, params) for params in params_list]).row_ids
+
+
+def write_returning(query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+    """RETURNING이 있는 쓰기 문장을 쓰기 스레드에서 실행 후 결과 행 반환 (커밋 완료 후 반환)"""
+    return _write([(query, params)]).rows
@@ -0,0 +1,234 @@
+"""
+알림 발송 디스패처 (발송 대기열 전달)
+- 알림은 생성 트랜잭션에서 채널별로 notification_outbox에 추가됨 (models.NotificationOutbox)
+  → 요청 스레드는 발송을 기다리지 않고, 발송 전에 서버가 종료되어도 알림을 잃지 않음
+- 가져오기 스레드가 발송할 때가 된 행을 배치로 가져가(claim) 작업 스레드에 넘김
+  (새 알림이 생기면 wake()로 바로, 그 외에는 NOTIFY_POLL_SECONDS마다 확인)
+- 작업 스레드는 대상 URL로 나눠 배정 (같은 대상의 장애/복구 알림 순서 유지),
+  모든 채널로 동시에 발송하고 시도마다 결과를 notification_logs에 기록 (notifiers.registry)
+- 실패하면 지수 백오프로 다시 시도, NOTIFY_MAX_ATTEMPTS번 실패하면 포기 (최소 한 번 전달, 중복 가능)
+- 알림 묶음: 채널별로 NOTIFY_DIGEST_WINDOW_SECONDS 구간의 첫 알림은 바로 발송하고,
+  같은 구간의 이후 알림은 구간이 끝난 뒤 한 번에 가져가 한 채널에 NOTIFY_DIGEST_MIN_ALERTS건 이상이면
+  그 채널로는 묶음 메시지 하나만 발송 (대규모 장애에도 채널별 메시지 수는 구간당 최대 둘, 발송 로그는 알림마다 기록)
+"""
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import zlib
+from typing import Dict, Any, List, Optional, Tuple
+from models import Alert, NotificationOutbox
+from notifiers.registry import NotifierRegistry
+
+# 로거
+logger = logging.getLogger('dispatcher')
+
+# 작업 스레드 수 및 동시에 가져가 발송 중인 최대 알림 수
+NOTIFY_WORKERS = int(os.getenv('NOTIFY_WORKERS', '4'))
+NOTIFY_QUEUE_SIZE = int(os.getenv('NOTIFY_QUEUE_SIZE', '1000'))
+# 한 번에 가져가는 행 수 (한 번에 가져간 행끼리만 묶음), 새 알림이 없을 때 대기열 확인 주기
+NOTIFY_CLAIM_BATCH = int(os.getenv('NOTIFY_CLAIM_BATCH', '500'))
+NOTIFY_POLL_SECONDS = float(os.getenv('NOTIFY_POLL_SECONDS', '1'))
+# 가져간 행을 다른 가져오기에서 제외하는 시간 (발송 결과를 기록하지 못한 경우 이후 다시 가져감)
+NOTIFY_CLAIM_SECONDS = float(os.getenv('NOTIFY_CLAIM_SECONDS', '300'))
+# 재시도: 최대 시도 횟수, 첫 재시도 대기 (시도마다 2배), 최대 대기
+NOTIFY_MAX_ATTEMPTS = int(os.getenv('NOTIFY_MAX_ATTEMPTS', '8'))
+NOTIFY_RETRY_BASE_SECONDS = float(os.getenv('NOTIFY_RETRY_BASE_SECONDS', '5'))
+NOTIFY_RETRY_MAX_SECONDS = float(os.getenv('NOTIFY_RETRY_MAX_SECONDS', '1800'))
+# 알림 묶음: 구간 길이 (0이면 묶지 않고 바로 발송), 묶음 메시지로 보내는 최소 알림 수
+NOTIFY_DIGEST_WINDOW_SECONDS = int(os.getenv('NOTIFY_DIGEST_WINDOW_SECONDS', '5'))
+NOTIFY_DIGEST_MIN_ALERTS = int(os.getenv('NOTIFY_DIGEST_MIN_ALERTS', '3'))
+# 종료 시 가져간 알림을 발송하며 기다리는 최대 시간 (남은 알림은 다음 시작 시 발송)
+NOTIFY_SHUTDOWN_TIMEOUT_SECONDS = float(os.getenv('NOTIFY_SHUTDOWN_TIMEOUT_SECONDS', '10'))
+
+
+def retry_delay(attempts: int) -> Optional[float]:
+    """
+    attempts번째 시도가 실패한 뒤 다음 시도까지 대기할 시간 (초)
+
+    Returns:
+        float: 지수 백오프 (±20% 무작위, 여러 알림이 같은 시각에 몰리지 않도록), 더 시도하지 않으면 None
+    """
+    if attempts >= NOTIFY_MAX_ATTEMPTS:
+        return None
+    delay = min(NOTIFY_RETRY_BASE_SECONDS * 2 ** (attempts - 1), NOTIFY_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+class NotificationDispatcher:
+    """발송 대기열 가져오기 스레드와 작업 스레드 풀"""
+
+    def __init__(self, registry: NotifierRegistry, workers: int = NOTIFY_WORKERS,
+                 max_in_flight: int = NOTIFY_QUEUE_SIZE, batch_size: int = NOTIFY_CLAIM_BATCH):
+        self.registry = registry
+        self.max_in_flight = max_in_flight
+        self.batch_size = batch_size
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._queues = [queue.Queue() for _ in range(workers)]
+        self._threads = [
+            threading.Thread(target=self._run, args=(q,), name=f'notify-{index}', daemon=True)
+            for index, q in enumerate(self._queues)
+        ]
+        self._poller = threading.Thread(target=self._poll, name='notify-outbox', daemon=True)
+
+    @property
+    def pending(self) -> int:
+        """가져가서 발송 중인 알림 수"""
+        return self._in_flight
+
+    def start(self) -> None:
+        """이전 프로세스가 가져간 채 끝내지 못한 행을 되돌리고 발송 시작 (서버 시작 시 호출)"""
+        NotificationOutbox.release_claims()
+        for thread in self._threads:
+            thread.start()
+        self._poller.start()
+
+    def wake(self) -> None:
+        """새 알림을 대기열에 추가했음을 알림 (다음 확인 주기를 기다리지 않고 바로 가져감)"""
+        self._wake.set()
+
+    def _poll(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            claimed = 0
+            try:
+                claimed = self._claim()
+            except Exception as e:
+                logger.error(f"❌ 알림 발송 대기열 조회 중 오류: {str(e)}")
+
+            # 배치를 가득 채웠으면 남은 행이 더 있을 수 있으므로 바로 다시 가져감
+            if claimed < self.batch_size:
+                self._wake.wait(NOTIFY_POLL_SECONDS)
+
+    def _claim(self) -> int:
+        """발송할 때가 된 행을 가져가 작업 스레드에 넘김 (가져간 행 수 반환)"""
+        with self._in_flight_lock:
+            limit = min(self.batch_size, self.max_in_flight - self._in_flight)
+        if limit <= 0:
+            return 0
+
+        rows = NotificationOutbox.claim(limit, NOTIFY_CLAIM_SECONDS, NOTIFY_DIGEST_WINDOW_SECONDS)
+        if not rows:
+            return 0
+        alerts = Alert.get_by_ids(list({row['alert_id'] for row in rows}))
+
+        # 한 채널에 알림이 많으면 그 채널은 묶음 발송, 나머지 행은 알림별 발송
+        by_channel: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            if row['alert_id'] in alerts:
+                by_channel.setdefault(row['channel'], []).append(row)
+        digests = {channel: channel_rows for channel, channel_rows in by_channel.items()
+                   if len(channel_rows) >= NOTIFY_DIGEST_MIN_ALERTS}
+        digested = {row['id'] for channel_rows in digests.values() for row in channel_rows}
+
+        by_alert: Dict[int, List[Dict[str, Any]]] = {}
+        for row in rows:
+            if row['id'] not in digested:
+                by_alert.setdefault(row['alert_id'], []).append(row)
+
+        with self._in_flight_lock:
+            self._in_flight += len(digests) + len(by_alert)
+        for channel, channel_rows in digests.items():
+            items = [(alerts[row['alert_id']], row) for row in channel_rows]
+            self._queues[zlib.crc32(channel.encode()) % len(self._queues)].put(('digest', channel, items))
+        for alert_id, alert_rows in by_alert.items():
+            alert = alerts.get(alert_id)
+            shard = zlib.crc32(alert['target_url'].encode()) if alert else alert_id
+            self._queues[shard % len(self._queues)].put(('alert', alert, alert_rows))
+        return len(rows)
+
+    def _plan_retry(self, channel: str, attempts: int, result: Dict[str, Any], label: str) -> Optional[float]:
+        """발송 결과에 따라 다시 시도할 때까지의 초 (None이면 대기열에서 제거)"""
+        if result.get('skipped'):
+            return self.registry.breakers[channel].cooldown
+        if result['success']:
+            return None
+
+        delay = retry_delay(attempts + 1)
+        if delay is None:
+            logger.error(f"❌ 알림 발송 포기: {label}, {channel}, {attempts + 1}회 실패 ({result.get('error')})")
+        else:
+            logger.warning(f"⚠️ 알림 발송 실패: {label}, {channel}, "
+                           f"{delay:.0f}초 후 다시 시도 ({result.get('error')})")
+        return delay
+
+    def _deliver(self, alert: Optional[Dict[str, Any]], rows: List[Dict[str, Any]]) -> None:
+        """알림 한 건의 대기열 행들을 해당 채널로 동시에 발송하고 결과 기록"""
+        if not alert:
+            logger.error(f"❌ 알림을 찾을 수 없음: alert_id={rows[0]['alert_id']}")
+            NotificationOutbox.record_attempts([
+                (row, {'success': False, 'error': 'Alert not found'}, None) for row in rows
+            ])
+            return
+
+        results = dict(self.registry.send_all(alert, [row['channel'] for row in rows]))
+        attempts = []
+        for row in rows:
+            result = results.get(row['channel'])
+            if result is None:
+                # 설정이 바뀌어 더 이상 사용하지 않는 채널
+                attempts.append((row, {'success': False, 'error': 'Channel not available'}, None))
+            else:
+                delay = self._plan_retry(row['channel'], row['attempts'], result, f"alert_id={alert['id']}")
+                attempts.append((row, result, delay))
+
+        NotificationOutbox.record_attempts(attempts)
+
+    def _deliver_digest(self, channel: str, items: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> None:
+        """여러 알림을 한 채널로 묶음 메시지 하나로 발송하고 알림마다 같은 결과 기록"""
+        result = self.registry.send_digest(channel, [alert for alert, _ in items])
+        if result is None:
+            NotificationOutbox.record_attempts([
+                (row, {'success': False, 'error': 'Channel not available'}, None) for _, row in items
+            ])
+            return
+
+        if result['success']:
+            logger.info(f"📦 묶음 알림 발송: {channel}, 알림 {len(items)}건")
+        # 실패하면 다음 시도에서도 함께 묶이도록 모든 행을 같은 시각으로 다시 예약
+        attempts = max(row['attempts'] for _, row in items)
+        delay = self._plan_retry(channel, attempts, result, f"묶음 {len(items)}건")
+        NotificationOutbox.record_attempts([(row, result, delay) for _, row in items])
+
+    def _run(self, q: queue.Queue) -> None:
+        while True:
+            item = q.get()
+            if item is None:
+                break
+            kind, target, rows = item
+            try:
+                if kind == 'digest':
+                    self._deliver_digest(target, rows)
+                else:
+                    self._deliver(target, rows)
+            except Exception as e:
+                # 결과를 기록하지 못한 행은 NOTIFY_CLAIM_SECONDS 뒤 다시 가져감
+                logger.error(f"❌ 알림 발송 처리 중 오류: {kind} {len(rows)}건, {str(e)}")
+            finally:
+                with self._in_flight_lock:
+                    self._in_flight -= 1
+                self._wake.set()
+
+    def close(self, timeout: float = NOTIFY_SHUTDOWN_TIMEOUT_SECONDS) -> None:
+        """가져간 알림을 발송한 뒤 스레드 종료 (timeout이 지나면 남은 알림은 다음 시작 시 발송)"""
+        deadline = time.monotonic() + timeout
+        self._stop.set()
+        self._wake.set()
+        if self._poller.is_alive():
+            self._poller.join(max(deadline - time.monotonic(), 0))
+
+        for q in self._queues:
+            q.put(None)
+        for thread in self._threads:
+            if thread.is_alive():
+                thread.join(max(deadline - time.monotonic(), 0))
+
+        if self.pending:
+            logger.warning(f"⚠️ 종료 시 발송을 마치지 못한 알림: {self.pending}건 (다음 시작 시 다시 발송)")
+
+        self.registry.close()
@@ -4,16 +4,37 @@ SQLite 데이터베이스 및 테이블 생성
 """
 import sqlite3
 import os
+from rollups import create_rollup_tables, backfill_rollups
 
 # 데이터베이스 파일 경로 (프로젝트 루트)
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'notifications.db')
 
 
+def add_missing_columns(cursor, table: str, columns: list):
+    """기존 테이블에 없는 컬럼 추가 (스키마 마이그레이션)"""
+    cursor.execute(f"PRAGMA table_info({table})")
+    existing = {row[1] for row in cursor.fetchall()}
+
+    for name, definition in columns:
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+
 def create_tables():
     """테이블 생성"""
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
+    # 증분 vacuum (보존 기간이 지난 데이터를 지운 뒤 빈 페이지를 조금씩 반환)
+    # 기존 DB는 VACUUM을 한 번 실행해야 적용됨
+    cursor.execute("PRAGMA auto_vacuum")
+    if cursor.fetchone()[0] != 2:
+        cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        cursor.execute("VACUUM")
+
+    # WAL 모드 (DB 파일에 유지되며, 읽기와 쓰기가 서로 막지 않음)
+    cursor.execute("PRAGMA journal_mode=WAL")
+
     # events 테이블: Agent가 전송한 모든 점검 결과
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS events (
@@ -23,10 +44,26 @@ def create_tables():
             response_time_ms INTEGER,
             timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
             is_success BOOLEAN NOT NULL,
-            error_message TEXT
+            error_message TEXT,
+            dns_ms INTEGER,
+            connect_ms INTEGER,
+            tls_ms INTEGER,
+            ttfb_ms INTEGER,
+            headers_ms INTEGER,
+            body_ms INTEGER
         )
     """)
 
+    # 기존 DB에 구간별 응답 시간 컬럼 추가
+    add_missing_columns(cursor, 'events', [
+        ('dns_ms', 'INTEGER'),
+        ('connect_ms', 'INTEGER'),
+        ('tls_ms', 'INTEGER'),
+        ('ttfb_ms', 'INTEGER'),
+        ('headers_ms', 'INTEGER'),
+        ('body_ms', 'INTEGER')
+    ])
+
     # alerts 테이블: 생성된 알림 이벤트
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS alerts (
@@ -58,11 +95,63 @@ def create_tables():
         )
     """)
 
+    # notification_outbox 테이블: 알림 발송 대기열 (알림과 같은 트랜잭션으로 추가, 발송 완료 시 삭제)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS notification_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            alert_id INTEGER NOT NULL,
+            channel TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,  -- 실패한 발송 시도 횟수
+            next_attempt_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            claimed_until DATETIME,  -- 발송 스레드가 가져간 경우 이 시각까지 다시 가져가지 않음
+            last_error TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (alert_id) REFERENCES alerts(id)
+        )
+    """)
+
+    # event_summaries 테이블: Agent 집계 모드의 대상별 구간 요약
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS event_summaries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            target_url TEXT NOT NULL,
+            window_start DATETIME NOT NULL,
+            window_end DATETIME NOT NULL,
+            count INTEGER NOT NULL,
+            failures INTEGER NOT NULL,
+            min_ms INTEGER,
+            max_ms INTEGER,
+            avg_ms REAL,
+            p50_ms INTEGER,
+            p95_ms INTEGER,
+            p99_ms INTEGER,
+            last_status_code INTEGER,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # event_rollups_minute, event_rollups_hour, event_rollups_day 테이블: 대상별 분/시간/일 구간 집계
+    create_rollup_tables(cursor)
+
     # 인덱스 생성 (성능 최적화)
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events(timestamp)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_target_url ON events(target_url)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_status ON alerts(status)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_target_url ON alerts(target_url)")
+    # 목록 조회 keyset 페이지네이션용 ((시각, id) 순서, 필터 컬럼이 앞에 오는 인덱스로 필터+정렬을 함께 처리)
+    cursor.execute("DROP INDEX IF EXISTS idx_alerts_status")
+    cursor.execute("DROP INDEX IF EXISTS idx_alerts_target_url")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_created ON alerts(created_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_status_created ON alerts(status, created_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_type_created ON alerts(alert_type, created_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_target_url_created ON alerts(target_url, created_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_notification_logs_attempted ON notification_logs(attempted_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_notification_logs_alert ON notification_logs(alert_id, attempted_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_notification_logs_status ON notification_logs(status, attempted_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_notification_outbox_due ON notification_outbox(next_attempt_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_notification_outbox_channel ON notification_outbox(channel, created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_event_summaries_url_window ON event_summaries(target_url, window_start)")
+
+    # 기존 이벤트로 rollup 채우기 (rollup 테이블이 비어 있을 때만)
+    backfilled = backfill_rollups(cursor)
 
     conn.commit()
     conn.close()
@@ -72,6 +161,11 @@ def create_tables():
     print("   - events (점검 결과)")
     print("   - alerts (알림 이벤트)")
     print("   - notification_logs (발송 기록)")
+    print("   - notification_outbox (발송 대기열)")
+    print("   - event_summaries (구간 요약)")
+    print("   - event_rollups_minute, event_rollups_hour, event_rollups_day (분/시간/일 구간 집계)")
+    if backfilled:
+        print(f"   기존 이벤트로 분 단위 구간 {backfilled}개 채움")
 
 
 def verify_tables():
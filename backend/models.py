@@ -1,24 +1,56 @@
 """
 데이터 모델 및 비즈니스 로직
 """
-from typing import Optional, List, Dict, Any
+import threading
+from typing import Optional, List, Dict, Any, Sequence, Tuple
 from datetime import datetime
-from database import insert_and_get_id, fetch_one, fetch_all, execute_query
+from database import insert_and_get_id, write_statements, fetch_one, fetch_all, execute_query, write_returning
+from rollups import rollup_statements, cover_window, estimate_percentile, BUCKET_COLUMNS
+from pagination import fetch_page, DEFAULT_PAGE_SIZE
+from read_cache import alert_read_cache
 
 
 class Event:
     """이벤트 모델 (URL 점검 결과)"""
 
+    # timestamp: Agent의 점검 시각 (UTC, 없으면 수신 시각) - rollup 구간, 보존 기간 정리와 같은 기준
+    INSERT_QUERY = """
+        INSERT INTO events (target_url, status_code, response_time_ms, is_success, error_message,
+                            dns_ms, connect_ms, tls_ms, ttfb_ms, headers_ms, body_ms, timestamp)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+    """
+
     @staticmethod
     def create(target_url: str, status_code: Optional[int], response_time_ms: int,
-               is_success: bool, error_message: Optional[str] = None) -> int:
-        """이벤트 생성"""
-        query = """
-            INSERT INTO events (target_url, status_code, response_time_ms, is_success, error_message)
-            VALUES (?, ?, ?, ?, ?)
+               is_success: bool, error_message: Optional[str] = None,
+               dns_ms: Optional[int] = None, connect_ms: Optional[int] = None,
+               tls_ms: Optional[int] = None, ttfb_ms: Optional[int] = None,
+               headers_ms: Optional[int] = None, body_ms: Optional[int] = None,
+               timestamp: Optional[str] = None) -> int:
         """
-        params = (target_url, status_code, response_time_ms, is_success, error_message)
-        return insert_and_get_id(query, params)
+        이벤트 생성 (구간별 응답 시간은 Agent가 보낸 경우에만 저장)
+        분/시간 rollup도 같은 트랜잭션에서 갱신
+        (timestamp: 점검 시각 'YYYY-MM-DD HH:MM:SS' UTC, 저장 및 rollup 구간 결정용 - 없으면 수신 시각)
+        """
+        params = (target_url, status_code, response_time_ms, is_success, error_message,
+                  dns_ms, connect_ms, tls_ms, ttfb_ms, headers_ms, body_ms, timestamp)
+        rollups = rollup_statements(events=[{
+            'target_url': target_url, 'response_time_ms': response_time_ms,
+            'is_success': is_success, 'timestamp': timestamp
+        }])
+        return write_statements([(Event.INSERT_QUERY, params)] + rollups)[0]
+
+    @staticmethod
+    def create_many(events: List[Dict[str, Any]]) -> List[int]:
+        """이벤트 일괄 생성 (단일 트랜잭션, rollup 갱신 포함, 입력 순서대로 ID 반환)"""
+        statements = [
+            (Event.INSERT_QUERY,
+             (e['target_url'], e.get('status_code'), e['response_time_ms'], e['is_success'],
+              e.get('error_message'), e.get('dns_ms'), e.get('connect_ms'), e.get('tls_ms'),
+              e.get('ttfb_ms'), e.get('headers_ms'), e.get('body_ms'), e.get('timestamp')))
+            for e in events
+        ]
+        return write_statements(statements + rollup_statements(events=events))[:len(events)]
 
     @staticmethod
     def get_by_id(event_id: int) -> Optional[Dict[str, Any]]:
@@ -38,18 +70,213 @@ class Event:
         return fetch_all(query, (target_url, limit))
 
 
+class EventSummary:
+    """구간 요약 모델 (Agent 집계 모드에서 상태 변화가 없는 점검 결과의 구간별 통계)"""
+
+    @staticmethod
+    def create_many(summaries: List[Dict[str, Any]]) -> List[int]:
+        """구간 요약 일괄 생성 (단일 트랜잭션, rollup 갱신 포함)"""
+        query = """
+            INSERT INTO event_summaries
+            (target_url, window_start, window_end, count, failures,
+             min_ms, max_ms, avg_ms, p50_ms, p95_ms, p99_ms, last_status_code)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        statements = [
+            (query,
+             (s['target_url'], s['window_start'], s['window_end'], s['count'], s['failures'],
+              s.get('min_ms'), s.get('max_ms'), s.get('avg_ms'), s.get('p50_ms'), s.get('p95_ms'),
+              s.get('p99_ms'), s.get('last_status_code')))
+            for s in summaries
+        ]
+        return write_statements(statements + rollup_statements(summaries=summaries))[:len(summaries)]
+
+    @staticmethod
+    def get_recent_by_url(target_url: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """특정 URL의 최근 구간 요약 조회"""
+        query = """
+            SELECT * FROM event_summaries
+            WHERE target_url = ?
+            ORDER BY window_start DESC
+            LIMIT ?
+        """
+        return fetch_all(query, (target_url, limit))
+
+
+class EventRollup:
+    """구간 집계 모델 (분/시간/일 rollup에서 대상별 가동률과 응답 시간 통계 계산)"""
+
+    PERCENTILES = (50, 90, 95, 99)
+
+    @staticmethod
+    def get_stats(since: datetime, until: datetime, target_url: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        [since, until) 기간의 대상별 통계 (원본 events는 읽지 않음)
+
+        Returns:
+            list: 대상별 checks, failures, uptime_pct, error_rate_pct, avg/min/max_ms, p50~p99_ms
+        """
+        parts = []
+        params: List[Any] = []
+        for table, start, end in cover_window(since, until):
+            if target_url:
+                parts.append(f"SELECT * FROM {table} WHERE target_url = ? AND bucket_start >= ? AND bucket_start < ?")
+                params += [target_url, start, end]
+            else:
+                parts.append(f"SELECT * FROM {table} WHERE bucket_start >= ? AND bucket_start < ?")
+                params += [start, end]
+
+        if not parts:
+            return []
+
+        query = f"""
+            SELECT target_url, sum(count) AS checks, sum(failures) AS failures, sum(sum_ms) AS sum_ms,
+                   min(min_ms) AS min_ms, max(max_ms) AS max_ms,
+                   {', '.join(f'sum({column}) AS {column}' for column in BUCKET_COLUMNS)}
+            FROM ({' UNION ALL '.join(parts)})
+            GROUP BY target_url
+            ORDER BY target_url
+        """
+
+        stats = []
+        for row in fetch_all(query, tuple(params)):
+            checks = row['checks']
+            buckets = [row[column] for column in BUCKET_COLUMNS]
+            item = {
+                'target_url': row['target_url'],
+                'checks': checks,
+                'failures': row['failures'],
+                'uptime_pct': round((checks - row['failures']) / checks * 100, 3),
+                'error_rate_pct': round(row['failures'] / checks * 100, 3),
+                'avg_ms': round(row['sum_ms'] / checks, 1),
+                'min_ms': row['min_ms'],
+                'max_ms': row['max_ms']
+            }
+            for p in EventRollup.PERCENTILES:
+                item[f'p{p}_ms'] = estimate_percentile(buckets, p, row['min_ms'], row['max_ms'])
+            stats.append(item)
+
+        return stats
+
+
+class OpenAlertCache:
+    """
+    대상 URL별 OPEN/ACK 알림 캐시 (write-through)
+    - 시작 시 DB에서 한 번 로드하고, 이후 Alert의 쓰기 메서드가 DB 커밋 직후 함께 갱신
+    - 장애/복구 감지는 DB 대신 이 캐시를 조회 (정상 이벤트는 INSERT 한 번으로 끝남)
+    - 백엔드 프로세스가 하나라고 가정 (다른 프로세스가 alerts를 바꾸면 load()로 다시 읽어야 함)
+    """
+
+    OPEN_QUERY = """
+        SELECT * FROM alerts
+        WHERE target_url = ? AND status IN ('OPEN', 'ACK')
+        ORDER BY created_at DESC, id DESC
+        LIMIT 1
+    """
+
+    def __init__(self):
+        self._by_url: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self) -> int:
+        """DB의 OPEN/ACK 알림으로 캐시를 채움 (URL별 가장 최근 알림, 로드한 개수 반환)"""
+        with self._lock:
+            # 잠금을 쥔 채로 읽어, 읽는 동안 커밋된 쓰기의 캐시 갱신이 덮어써지지 않도록 함
+            rows = fetch_all("""
+                SELECT * FROM alerts
+                WHERE status IN ('OPEN', 'ACK')
+                ORDER BY created_at, id
+            """)
+            self._by_url = {row['target_url']: row for row in rows}
+            self._loaded = True
+            return len(self._by_url)
+
+    def get(self, target_url: str) -> Optional[Dict[str, Any]]:
+        if not self._loaded:
+            self.load()
+        with self._lock:
+            alert = self._by_url.get(target_url)
+            return dict(alert) if alert else None
+
+    def find(self, alert_id: int) -> Optional[Dict[str, Any]]:
+        """ID로 캐시된 알림 조회 (열린 알림은 대상 수 이하이므로 순회)"""
+        with self._lock:
+            for alert in self._by_url.values():
+                if alert['id'] == alert_id:
+                    return dict(alert)
+        return None
+
+    def put(self, alert: Dict[str, Any]) -> None:
+        with self._lock:
+            self._by_url[alert['target_url']] = alert
+
+    def set_status(self, alert_id: int, status: str) -> None:
+        with self._lock:
+            for alert in self._by_url.values():
+                if alert['id'] == alert_id:
+                    alert['status'] = status
+
+    def discard(self, target_url: str) -> None:
+        with self._lock:
+            self._by_url.pop(target_url, None)
+
+    def refresh(self, target_url: str) -> None:
+        """한 URL의 캐시를 DB에서 다시 읽음 (알림을 다시 열거나 중복 알림 중 하나를 닫는 드문 경우)"""
+        with self._lock:
+            alert = fetch_one(self.OPEN_QUERY, (target_url,))
+            if alert:
+                self._by_url[target_url] = alert
+            else:
+                self._by_url.pop(target_url, None)
+
+
+# 프로세스 전체에서 공유하는 열린 알림 캐시
+open_alerts = OpenAlertCache()
+
+
 class Alert:
     """알림 모델"""
 
+    FIELDS = ('id', 'event_id', 'alert_type', 'status', 'created_at', 'resolved_at', 'message', 'target_url')
+    STATUSES = ('OPEN', 'ACK', 'RESOLVED')
+    TYPES = ('ERROR', 'WARNING', 'RECOVERY')
+
     @staticmethod
-    def create(event_id: int, alert_type: str, message: str, target_url: str) -> int:
-        """알림 생성"""
-        query = """
-            INSERT INTO alerts (event_id, alert_type, message, target_url, status)
-            VALUES (?, ?, ?, ?, 'OPEN')
+    def create(event_id: int, alert_type: str, message: str, target_url: str,
+               status: str = 'OPEN', channels: Sequence[str] = ()) -> int:
+        """
+        알림 생성 (status='RESOLVED'면 바로 해결 상태로 생성, 열린 알림은 캐시에도 추가)
+
+        Args:
+            channels: 발송할 채널 목록 (알림과 같은 트랜잭션으로 발송 대기열에 추가)
         """
-        params = (event_id, alert_type, message, target_url)
-        return insert_and_get_id(query, params)
+        if status == 'RESOLVED':
+            query = """
+                INSERT INTO alerts (event_id, alert_type, message, target_url, status, resolved_at)
+                VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """
+        else:
+            query = """
+                INSERT INTO alerts (event_id, alert_type, message, target_url, status)
+                VALUES (?, ?, ?, ?, ?)
+            """
+        params = (event_id, alert_type, message, target_url, status)
+        alert_id = write_statements([(query, params)] + NotificationOutbox.enqueue_statements(channels))[0]
+        alert_read_cache.invalidate()
+
+        if status != 'RESOLVED':
+            open_alerts.put({
+                'id': alert_id,
+                'event_id': event_id,
+                'alert_type': alert_type,
+                'status': status,
+                'created_at': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+                'resolved_at': None,
+                'message': message,
+                'target_url': target_url
+            })
+        return alert_id
 
     @staticmethod
     def get_by_id(alert_id: int) -> Optional[Dict[str, Any]]:
@@ -57,30 +284,52 @@ class Alert:
         query = "SELECT * FROM alerts WHERE id = ?"
         return fetch_one(query, (alert_id,))
 
+    @staticmethod
+    def get_by_ids(alert_ids: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+        """여러 알림을 한 번에 조회 (id → 알림)"""
+        if not alert_ids:
+            return {}
+        query = f"SELECT * FROM alerts WHERE id IN ({', '.join('?' for _ in alert_ids)})"
+        return {row['id']: row for row in fetch_all(query, tuple(alert_ids))}
+
     @staticmethod
     def get_open_alert_by_url(target_url: str) -> Optional[Dict[str, Any]]:
-        """특정 URL의 OPEN 또는 ACK 상태 알림 조회 (중복 방지용)"""
-        query = """
-            SELECT * FROM alerts
-            WHERE target_url = ? AND status IN ('OPEN', 'ACK')
-            ORDER BY created_at DESC
-            LIMIT 1
-        """
-        return fetch_one(query, (target_url,))
+        """특정 URL의 OPEN 또는 ACK 상태 알림 조회 (중복 방지용, 캐시에서 조회)"""
+        return open_alerts.get(target_url)
 
     @staticmethod
-    def get_all(status: Optional[str] = None) -> List[Dict[str, Any]]:
-        """알림 목록 조회 (상태별 필터링 가능)"""
-        if status:
-            query = "SELECT * FROM alerts WHERE status = ? ORDER BY created_at DESC"
-            return fetch_all(query, (status,))
-        else:
-            query = "SELECT * FROM alerts ORDER BY created_at DESC"
-            return fetch_all(query)
+    def load_open_alerts() -> int:
+        """열린 알림 캐시를 DB에서 다시 로드 (서버 시작 시 호출)"""
+        return open_alerts.load()
+
+    @staticmethod
+    def get_page(statuses: Optional[List[str]] = None, alert_types: Optional[List[str]] = None,
+                 target_url: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+                 fields: Optional[List[str]] = None, cursor: Optional[str] = None,
+                 limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """
+        알림 목록 페이지 조회 (최신순, (created_at, id) keyset 페이지네이션)
+
+        Returns:
+            dict: rows (알림 목록), next_cursor (다음 페이지 커서)
+        """
+        conditions = []
+        if statuses:
+            conditions.append((f"status IN ({', '.join('?' for _ in statuses)})", tuple(statuses)))
+        if alert_types:
+            conditions.append((f"alert_type IN ({', '.join('?' for _ in alert_types)})", tuple(alert_types)))
+        if target_url:
+            conditions.append(("target_url = ?", (target_url,)))
+        if since:
+            conditions.append(("created_at >= ?", (since,)))
+        if until:
+            conditions.append(("created_at < ?", (until,)))
+
+        return fetch_page('alerts', 'created_at', Alert.FIELDS, conditions, fields, cursor, limit)
 
     @staticmethod
     def update_status(alert_id: int, new_status: str) -> None:
-        """알림 상태 변경"""
+        """알림 상태 변경 (열린 알림 캐시도 함께 갱신)"""
         if new_status == 'RESOLVED':
             query = """
                 UPDATE alerts
@@ -91,6 +340,17 @@ class Alert:
             query = "UPDATE alerts SET status = ? WHERE id = ?"
 
         execute_query(query, (new_status, alert_id))
+        alert_read_cache.invalidate()
+
+        cached = open_alerts.find(alert_id)
+        if cached and new_status != 'RESOLVED':
+            # OPEN ↔ ACK
+            open_alerts.set_status(alert_id, new_status)
+        elif cached or new_status != 'RESOLVED':
+            # 캐시된 알림을 닫았거나 닫힌 알림을 다시 연 경우: 해당 URL만 DB에서 다시 읽음
+            alert = cached or Alert.get_by_id(alert_id)
+            if alert:
+                open_alerts.refresh(alert['target_url'])
 
     @staticmethod
     def resolve_by_url(target_url: str) -> None:
@@ -101,23 +361,40 @@ class Alert:
             WHERE target_url = ? AND status IN ('OPEN', 'ACK')
         """
         execute_query(query, (target_url,))
+        alert_read_cache.invalidate()
+        open_alerts.discard(target_url)
 
 
 class NotificationLog:
     """알림 발송 로그 모델"""
 
+    FIELDS = ('id', 'alert_id', 'channel', 'status', 'attempted_at', 'response_code',
+              'message_id', 'retry_count', 'error_message')
+    STATUSES = ('SENT', 'FAILED')
+
     @staticmethod
-    def create(alert_id: int, channel: str, status: str, response_code: Optional[str] = None,
-               message_id: Optional[str] = None, retry_count: int = 0,
-               error_message: Optional[str] = None) -> int:
-        """알림 발송 로그 생성"""
+    def insert_statement(alert_id: int, channel: str, status: str, response_code: Optional[str] = None,
+                         message_id: Optional[str] = None, retry_count: int = 0,
+                         error_message: Optional[str] = None) -> Tuple[str, tuple]:
+        """발송 로그 INSERT 문장 (다른 쓰기와 한 트랜잭션으로 묶을 때 사용)"""
         query = """
             INSERT INTO notification_logs
             (alert_id, channel, status, response_code, message_id, retry_count, error_message)
             VALUES (?, ?, ?, ?, ?, ?, ?)
         """
-        params = (alert_id, channel, status, response_code, message_id, retry_count, error_message)
-        return insert_and_get_id(query, params)
+        return query, (alert_id, channel, status, response_code, message_id, retry_count, error_message)
+
+    @staticmethod
+    def create(alert_id: int, channel: str, status: str, response_code: Optional[str] = None,
+               message_id: Optional[str] = None, retry_count: int = 0,
+               error_message: Optional[str] = None) -> int:
+        """알림 발송 로그 생성"""
+        log_id = insert_and_get_id(*NotificationLog.insert_statement(
+            alert_id, channel, status, response_code, message_id, retry_count, error_message
+        ))
+        # 알림 상세 조회 응답에 발송 로그가 포함되므로 알림 조회 캐시도 무효화
+        alert_read_cache.invalidate()
+        return log_id
 
     @staticmethod
     def get_by_alert_id(alert_id: int) -> List[Dict[str, Any]]:
@@ -130,11 +407,148 @@ class NotificationLog:
         return fetch_all(query, (alert_id,))
 
     @staticmethod
-    def get_recent(limit: int = 50) -> List[Dict[str, Any]]:
-        """최근 발송 로그 조회"""
-        query = """
-            SELECT * FROM notification_logs
-            ORDER BY attempted_at DESC
-            LIMIT ?
+    def get_page(alert_id: Optional[int] = None, channels: Optional[List[str]] = None,
+                 statuses: Optional[List[str]] = None, since: Optional[str] = None,
+                 until: Optional[str] = None, fields: Optional[List[str]] = None,
+                 cursor: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
         """
-        return fetch_all(query, (limit,))
+        발송 로그 페이지 조회 (최신순, (attempted_at, id) keyset 페이지네이션)
+
+        Returns:
+            dict: rows (발송 로그 목록), next_cursor (다음 페이지 커서)
+        """
+        conditions = []
+        if alert_id is not None:
+            conditions.append(("alert_id = ?", (alert_id,)))
+        if channels:
+            conditions.append((f"channel IN ({', '.join('?' for _ in channels)})", tuple(channels)))
+        if statuses:
+            conditions.append((f"status IN ({', '.join('?' for _ in statuses)})", tuple(statuses)))
+        if since:
+            conditions.append(("attempted_at >= ?", (since,)))
+        if until:
+            conditions.append(("attempted_at < ?", (until,)))
+
+        return fetch_page('notification_logs', 'attempted_at', NotificationLog.FIELDS,
+                          conditions, fields, cursor, limit)
+
+
+class NotificationOutbox:
+    """
+    알림 발송 대기열 (transactional outbox) 모델
+    - 알림과 같은 트랜잭션으로 채널별 행을 추가 → 알림이 저장되었으면 발송도 반드시 시도됨
+    - 발송 스레드가 행을 가져가(claim) 발송하고, 성공하거나 재시도를 포기하면 삭제
+    - 실패하면 attempts를 올리고 next_attempt_at 이후에 다시 가져감
+    """
+
+    @staticmethod
+    def enqueue_statements(channels: Sequence[str]) -> List[Tuple[str, tuple]]:
+        """직전에 INSERT한 알림의 채널별 대기열 행 추가 문장 (알림 INSERT 바로 뒤에 같은 쓰기 요청으로 실행)"""
+        # 그룹 커밋에서는 알림 ID를 미리 알 수 없으므로 같은 연결의 last_insert_rowid()로 참조:
+        # 첫 행은 방금 INSERT한 알림의 ID, 이후 행은 바로 앞에 추가한 대기열 행의 alert_id
+        first = "INSERT INTO notification_outbox (alert_id, channel) VALUES (last_insert_rowid(), ?)"
+        rest = """
+            INSERT INTO notification_outbox (alert_id, channel)
+            VALUES ((SELECT alert_id FROM notification_outbox WHERE id = last_insert_rowid()), ?)
+        """
+        return [(first if index == 0 else rest, (channel,)) for index, channel in enumerate(channels)]
+
+    @staticmethod
+    def claim(limit: int, lease_seconds: float, window_seconds: int = 0) -> List[Dict[str, Any]]:
+        """
+        발송할 때가 된 행을 최대 limit개 가져감 (lease_seconds 동안 다시 가져가지 않음)
+
+        Args:
+            window_seconds: 0보다 크면 알림 묶음 구간 길이 (초, 시각 기준으로 정렬)
+                - 채널별로 구간의 첫 알림은 바로 가져감
+                - 같은 채널에 같은 구간에서 먼저 생성된 대기열 행이나 발송 기록이 있으면
+                  구간이 끝난 뒤 한 번에 가져감 (묶어서 발송)
+
+        Returns:
+            list: id, alert_id, channel, attempts (오래된 순)
+        """
+        conditions = ""
+        params: tuple = (f'+{lease_seconds:g} seconds',)
+        if window_seconds > 0:
+            window_start = "datetime(CAST(strftime('%s', candidate.created_at) AS INTEGER) / ? * ?, 'unixepoch')"
+            conditions = f"""
+                  AND (attempts > 0
+                       OR created_at < datetime(CAST(strftime('%s', 'now') AS INTEGER) / ? * ?, 'unixepoch')
+                       OR (NOT EXISTS (SELECT 1 FROM notification_outbox AS earlier
+                                       WHERE earlier.channel = candidate.channel
+                                         AND earlier.created_at >= {window_start}
+                                         AND earlier.id < candidate.id)
+                           AND NOT EXISTS (SELECT 1 FROM notification_logs AS sent
+                                           WHERE sent.attempted_at >= {window_start}
+                                             AND sent.channel = candidate.channel)))
+            """
+            params += (window_seconds,) * 6
+
+        # UPDATE ... RETURNING: 가져감 표시와 조회를 한 문장으로 (다른 쓰기와 같이 쓰기 스레드에서 커밋)
+        query = f"""
+            UPDATE notification_outbox
+            SET claimed_until = datetime('now', ?)
+            WHERE id IN (
+                SELECT id FROM notification_outbox AS candidate
+                WHERE next_attempt_at <= CURRENT_TIMESTAMP
+                  AND (claimed_until IS NULL OR claimed_until <= CURRENT_TIMESTAMP)
+                  {conditions}
+                ORDER BY id
+                LIMIT ?
+            )
+            RETURNING id, alert_id, channel, attempts
+        """
+        rows = write_returning(query, params + (limit,))
+        return sorted(rows, key=lambda row: row['id'])
+
+    @staticmethod
+    def release_claims() -> None:
+        """가져간 채 끝나지 않은 행을 모두 되돌림 (서버 시작 시 호출: 이전 프로세스가 발송 중 종료된 경우)"""
+        execute_query("UPDATE notification_outbox SET claimed_until = NULL WHERE claimed_until IS NOT NULL")
+
+    @staticmethod
+    def count() -> int:
+        """발송 대기 중인 행 수"""
+        return fetch_one("SELECT COUNT(*) AS count FROM notification_outbox")['count']
+
+    @staticmethod
+    def record_attempts(attempts: List[Tuple[Dict[str, Any], Dict[str, Any], Optional[float]]]) -> None:
+        """
+        발송 시도 결과를 한 트랜잭션으로 기록
+
+        Args:
+            attempts: (대기열 행, 발송 결과, 다시 시도할 때까지의 초) 목록
+                - 발송 시도마다 발송 로그 추가 (retry_count = 이전 시도 횟수)
+                - 성공했거나 다시 시도하지 않으면(None) 대기열에서 삭제, 아니면 시도 횟수를 올리고 다시 예약
+                - 결과에 skipped가 있으면(서킷 브레이커로 건너뜀) 시도로 세지 않고 로그 없이 다시 예약
+        """
+        statements = []
+        for row, result, retry_delay in attempts:
+            if result.get('skipped'):
+                statements.append(("""
+                    UPDATE notification_outbox
+                    SET next_attempt_at = datetime('now', ?), claimed_until = NULL, last_error = ?
+                    WHERE id = ?
+                """, (f'+{retry_delay:g} seconds', result.get('error'), row['id'])))
+                continue
+
+            statements.append(NotificationLog.insert_statement(
+                alert_id=row['alert_id'],
+                channel=row['channel'],
+                status='SENT' if result['success'] else 'FAILED',
+                message_id=result.get('message_id'),
+                retry_count=row['attempts'],
+                error_message=result.get('error')
+            ))
+            if result['success'] or retry_delay is None:
+                statements.append(("DELETE FROM notification_outbox WHERE id = ?", (row['id'],)))
+            else:
+                statements.append(("""
+                    UPDATE notification_outbox
+                    SET attempts = attempts + 1, next_attempt_at = datetime('now', ?),
+                        claimed_until = NULL, last_error = ?
+                    WHERE id = ?
+                """, (f'+{retry_delay:g} seconds', result.get('error'), row['id'])))
+
+        write_statements(statements)
+        alert_read_cache.invalidate()
@@ -1 +1,11 @@
-# Notifiers package
\ No newline at end of file
+# Notifiers package
+import inspect
+from typing import List
+from .base import BaseNotifier
+# 채널 모듈을 import하면 BaseNotifier에 등록됨 (새 채널은 여기에 추가)
+from . import console, telegram  # noqa: F401
+
+
+def create_notifiers() -> List[BaseNotifier]:
+    """등록된 모든 채널 생성"""
+    return [cls() for cls in BaseNotifier.registry if not inspect.isabstract(cls)]
@@ -1,13 +1,47 @@
 """
 알림 채널 베이스 인터페이스
+- BaseNotifier를 상속한 채널 클래스는 자동으로 등록됨 (notifiers.create_notifiers로 생성)
 """
+import os
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+# 채널 기본 발송 제한 시간 (채널별: <채널이름>_TIMEOUT_SECONDS)
+NOTIFY_TIMEOUT_SECONDS = float(os.getenv('NOTIFY_TIMEOUT_SECONDS', '10'))
+# 묶음 알림에 하나씩 나열하는 최대 알림 수 (나머지는 "외 N건")
+NOTIFY_DIGEST_MAX_LINES = int(os.getenv('NOTIFY_DIGEST_MAX_LINES', '20'))
+
+# 알림 타입별 이모지, 묶음 알림 제목의 상태 이름
+ALERT_EMOJI = {
+    'ERROR': '🚨',
+    'WARNING': '⚠️',
+    'RECOVERY': '✅'
+}
+DIGEST_LABELS = {
+    'ERROR': '장애',
+    'WARNING': '경고',
+    'RECOVERY': '복구'
+}
 
 
 class BaseNotifier(ABC):
     """알림 채널 추상 클래스"""
 
+    # 등록된 채널 클래스 (정의 순서)
+    registry: List[type] = []
+
+    # 비활성 채널은 발송하지 않음 (설정이 없는 경우 등)
+    enabled = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        BaseNotifier.registry.append(cls)
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """발송 제한 시간 (초, None이면 채널이 직접 제한)"""
+        return float(os.getenv(f'{self.get_channel_name()}_TIMEOUT_SECONDS', NOTIFY_TIMEOUT_SECONDS))
+
     @abstractmethod
     def send(self, alert: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -28,3 +62,43 @@ class BaseNotifier(ABC):
     def get_channel_name(self) -> str:
         """채널 이름 반환"""
         pass
+
+    def send_digest(self, alerts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        같은 구간에 생성된 여러 알림을 메시지 하나로 묶어 발송
+        (기본: 알림마다 send, 묶음 메시지를 지원하는 채널은 재정의)
+
+        Returns:
+            dict: 발송 결과 (묶인 모든 알림의 발송 로그에 같은 결과를 기록)
+        """
+        results = [self.send(alert) for alert in alerts]
+        failed = [result for result in results if not result['success']]
+        if failed:
+            return {'success': False, 'message_id': None, 'error': failed[0].get('error')}
+        return {'success': True, 'message_id': None, 'error': None}
+
+    def summarize_digest(self, alerts: List[Dict[str, Any]]) -> Tuple[str, List[str]]:
+        """
+        묶음 알림의 제목과 본문 줄 목록
+
+        예: ("🚨 37개 대상 장애 / ✅ 2개 대상 복구", ["🚨 https://a.example.com - HTTP 500", ...])
+        """
+        targets: Dict[str, set] = {}
+        for alert in alerts:
+            targets.setdefault(alert['alert_type'], set()).add(alert['target_url'])
+        title = ' / '.join(
+            f"{ALERT_EMOJI.get(alert_type, '📢')} {len(urls)}개 대상 {DIGEST_LABELS.get(alert_type, alert_type)}"
+            for alert_type, urls in targets.items()
+        )
+
+        lines = []
+        for alert in alerts[:NOTIFY_DIGEST_MAX_LINES]:
+            message = alert['message'] if len(alert['message']) <= 100 else alert['message'][:97] + '...'
+            lines.append(f"{ALERT_EMOJI.get(alert['alert_type'], '📢')} {alert['target_url']} - {message}")
+        if len(alerts) > NOTIFY_DIGEST_MAX_LINES:
+            lines.append(f"... 외 {len(alerts) - NOTIFY_DIGEST_MAX_LINES}건")
+        return title, lines
+
+    def close(self) -> None:
+        """채널이 사용하는 연결 등 자원 정리 (서버 종료 시 호출, 기본: 없음)"""
+        pass
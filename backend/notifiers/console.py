@@ -2,7 +2,7 @@
 콘솔 출력 알림 채널
 """
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 from .base import BaseNotifier
 
 # 로거 설정
@@ -61,6 +61,33 @@ class ConsoleNotifier(BaseNotifier):
                 'error': str(e)
             }
 
+    def send_digest(self, alerts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """여러 알림을 묶음 알림 하나로 출력"""
+        try:
+            title, lines = self.summarize_digest(alerts)
+            message = '\n'.join(["=" * 80, f"📦 묶음 알림: {title}", "-" * 80] + lines)
+
+            if any(alert['alert_type'] == 'ERROR' for alert in alerts):
+                logger.error(message)
+            elif any(alert['alert_type'] == 'WARNING' for alert in alerts):
+                logger.warning(message)
+            else:
+                logger.info(message)
+            logger.info("=" * 80)
+
+            return {
+                'success': True,
+                'message_id': None,
+                'error': None
+            }
+
+        except Exception as e:
+            return {
+                'success': False,
+                'message_id': None,
+                'error': str(e)
+            }
+
     def _format_alert_message(self, alert: Dict[str, Any], emoji: str) -> str:
         """알림 메시지 포맷팅"""
         lines = [
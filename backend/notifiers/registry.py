@@ -0,0 +1,177 @@
+"""
+알림 채널 동시 발송
+- 활성화된 모든 채널로 동시에 발송 (채널이 늘어도 알림 지연은 가장 느린 채널 하나만큼)
+- 채널마다 전용 스레드 풀: 멈춘 채널이 다른 채널의 발송 스레드를 차지하지 않음
+- 채널별 제한 시간: 넘기면 실패로 기록하고 기다리지 않음 (발송 자체는 스레드에서 계속될 수 있음)
+- 채널별 서킷 브레이커: 연속 실패 시 일정 시간 그 채널을 건너뜀 (매 알림마다 제한 시간을 기다리지 않음)
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from .base import BaseNotifier
+
+# 로거
+logger = logging.getLogger('notifier_registry')
+
+# 채널별 발송 스레드 수
+NOTIFY_CHANNEL_THREADS = int(os.getenv('NOTIFY_CHANNEL_THREADS', '4'))
+# 서킷 브레이커: 연속 실패 횟수, 건너뛰는 시간
+NOTIFY_BREAKER_FAILURES = int(os.getenv('NOTIFY_BREAKER_FAILURES', '3'))
+NOTIFY_BREAKER_COOLDOWN_SECONDS = float(os.getenv('NOTIFY_BREAKER_COOLDOWN_SECONDS', '60'))
+
+
+class CircuitBreaker:
+    """
+    채널 하나의 서킷 브레이커
+    - 연속 failure_threshold번 실패하면 열림 (cooldown 동안 발송하지 않음)
+    - cooldown이 지나면 한 건만 시험 발송: 성공하면 닫힘, 실패하면 다시 cooldown
+    """
+
+    def __init__(self, failure_threshold: int = NOTIFY_BREAKER_FAILURES,
+                 cooldown: float = NOTIFY_BREAKER_COOLDOWN_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        """발송해도 되는지 (열린 상태면 cooldown 뒤 시험 발송 한 건만 허용)"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._trial or time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self._trial = True
+            return True
+
+    def record(self, success: bool) -> bool:
+        """
+        발송 결과 반영
+
+        Returns:
+            bool: 이번 결과로 상태가 바뀌었으면 True (열림/닫힘)
+        """
+        with self._lock:
+            was_open = self.opened_at is not None
+            self._trial = False
+            if success:
+                self.failures = 0
+                self.opened_at = None
+                return was_open
+
+            self.failures += 1
+            if was_open or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                return not was_open
+            return False
+
+
+class NotifierRegistry:
+    """알림 채널 목록과 채널별 발송 스레드 풀, 서킷 브레이커"""
+
+    def __init__(self, notifiers: List[BaseNotifier], threads: int = NOTIFY_CHANNEL_THREADS):
+        self.notifiers = notifiers
+        self._executors = {
+            n.get_channel_name(): ThreadPoolExecutor(max_workers=threads,
+                                                     thread_name_prefix=f'notify-{n.get_channel_name().lower()}')
+            for n in notifiers
+        }
+        self.breakers = {n.get_channel_name(): CircuitBreaker() for n in notifiers}
+
+    def enabled(self) -> List[BaseNotifier]:
+        """발송 대상 채널 (비활성 채널 제외)"""
+        return [n for n in self.notifiers if n.enabled]
+
+    def channels(self) -> List[str]:
+        """발송 대상 채널 이름 목록"""
+        return [n.get_channel_name() for n in self.enabled()]
+
+    def send_all(self, alert: Dict[str, Any],
+                 channels: Optional[Sequence[str]] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        활성화된 모든 채널(channels가 있으면 그중 해당 채널)로 동시에 발송하고 채널별 결과 반환
+
+        Returns:
+            list: (채널 이름, 발송 결과) 목록 - 제한 시간 초과는 실패 결과로,
+                  서킷 브레이커로 건너뛴 채널은 skipped=True인 실패 결과로 포함
+        """
+        started = time.monotonic()
+        pending = []
+        results = []
+        for notifier in self.enabled():
+            channel = notifier.get_channel_name()
+            if channels is not None and channel not in channels:
+                continue
+            if not self.breakers[channel].allow():
+                results.append((channel, self._skipped()))
+                continue
+            pending.append((notifier, self._executors[channel].submit(notifier.send, alert)))
+
+        # 제한 시간이 짧은 채널부터 확인 (모든 채널이 같은 시각부터 동시에 진행 중)
+        pending.sort(key=lambda item: float('inf') if item[0].timeout is None else item[0].timeout)
+        for notifier, future in pending:
+            results.append((notifier.get_channel_name(), self._collect(notifier, future, started)))
+
+        return results
+
+    def send_digest(self, channel: str, alerts: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        한 채널로 여러 알림을 묶음 메시지 하나로 발송 (제한 시간, 서킷 브레이커는 send_all과 동일)
+
+        Returns:
+            dict: 발송 결과, 활성화된 채널이 아니면 None
+        """
+        notifier = next((n for n in self.enabled() if n.get_channel_name() == channel), None)
+        if notifier is None:
+            return None
+        if not self.breakers[channel].allow():
+            return self._skipped()
+
+        started = time.monotonic()
+        future = self._executors[channel].submit(notifier.send_digest, alerts)
+        return self._collect(notifier, future, started)
+
+    @staticmethod
+    def _skipped() -> Dict[str, Any]:
+        return {
+            'success': False,
+            'skipped': True,
+            'message_id': None,
+            'error': 'Circuit open: channel skipped after repeated failures'
+        }
+
+    def _collect(self, notifier: BaseNotifier, future, started: float) -> Dict[str, Any]:
+        """발송 결과를 제한 시간까지 기다리고 서킷 브레이커에 반영"""
+        channel = notifier.get_channel_name()
+        timeout = notifier.timeout
+        try:
+            remaining = None if timeout is None else max(started + timeout - time.monotonic(), 0)
+            result = future.result(timeout=remaining)
+        except FutureTimeoutError:
+            result = {'success': False, 'message_id': None, 'error': f'Timed out after {timeout:g}s'}
+        except Exception as e:
+            result = {'success': False, 'message_id': None, 'error': str(e)}
+
+        if self.breakers[channel].record(result['success']):
+            if result['success']:
+                logger.info(f"✅ {channel} 채널 복구: 발송 재개")
+            else:
+                logger.warning(f"⚠️ {channel} 채널 연속 실패: {self.breakers[channel].cooldown:g}초 동안 건너뜀 "
+                               f"({result['error']})")
+        return result
+
+    def close(self) -> None:
+        """발송 스레드 풀과 채널 자원 정리"""
+        for executor in self._executors.values():
+            executor.shutdown(wait=False)
+        for notifier in self.notifiers:
+            notifier.close()
@@ -1,11 +1,20 @@
 """
 텔레그램 봇 알림 채널
+- 프로세스 전체에서 Bot 하나를 재사용 (연결 풀 유지, 알림마다 새로 만들지 않음)
+- python-telegram-bot 22.x의 비동기 API를 전용 이벤트 루프 스레드에서 실행
+- 토큰 버킷으로 전역/채팅방별 전송 속도를 제한하여 몰린 알림은 실패시키지 않고 순서대로 대기
+- 제한 시간(TELEGRAM_TIMEOUT_SECONDS)은 속도 제한 대기를 빼고 API 호출 한 번에만 적용
+- 메시지는 HTML 형식: URL, 오류 메시지 등 외부 값은 모두 이스케이프 (특수문자가 있어도 전송 실패하지 않음)
 """
+import asyncio
+import html
 import os
 import logging
-from typing import Dict, Any
+import threading
+import time
+from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
-from .base import BaseNotifier
+from .base import BaseNotifier, NOTIFY_TIMEOUT_SECONDS
 
 # 환경변수 로드
 load_dotenv()
@@ -13,6 +22,43 @@ load_dotenv()
 # 로거 설정
 logger = logging.getLogger('telegram_notifier')
 
+# 전송 속도 제한 (텔레그램 제한: 전체 초당 약 30건, 같은 채팅방 초당 1건, 그룹은 분당 20건)
+TELEGRAM_MAX_PER_SECOND = float(os.getenv('TELEGRAM_MAX_PER_SECOND', '30'))
+TELEGRAM_CHAT_MAX_PER_SECOND = float(os.getenv('TELEGRAM_CHAT_MAX_PER_SECOND', '1'))
+# 연결 풀 크기
+TELEGRAM_POOL_SIZE = int(os.getenv('TELEGRAM_POOL_SIZE', '8'))
+# 429(RetryAfter) 응답 시 다시 보내는 최대 횟수
+TELEGRAM_MAX_RETRIES = int(os.getenv('TELEGRAM_MAX_RETRIES', '3'))
+# API 호출 한 번의 제한 시간
+TELEGRAM_TIMEOUT_SECONDS = float(os.getenv('TELEGRAM_TIMEOUT_SECONDS', str(NOTIFY_TIMEOUT_SECONDS)))
+
+
+class TokenBucket:
+    """
+    비동기 토큰 버킷 (초당 rate개, 최대 capacity개까지 모아 둠)
+    토큰이 없으면 실패하지 않고 생길 때까지 대기 (대기 순서대로 진행)
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._tokens = 1
+                self._updated = time.monotonic()
+
+            self._tokens -= 1
+
 
 class TelegramNotifier(BaseNotifier):
     """텔레그램 봇으로 알림 전송"""
@@ -20,6 +66,11 @@ class TelegramNotifier(BaseNotifier):
     def __init__(self):
         self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
         self.chat_id = os.getenv('TELEGRAM_CHAT_ID')
+        self._bot = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self._global_bucket: Optional[TokenBucket] = None
+        self._chat_buckets: Dict[str, TokenBucket] = {}
 
         # 텔레그램 설정 확인
         if not self.bot_token or not self.chat_id:
@@ -30,9 +81,12 @@ class TelegramNotifier(BaseNotifier):
             # telegram 라이브러리는 실제 사용 시에만 import
             try:
                 from telegram import Bot
-                from telegram.error import TelegramError
+                from telegram.error import TelegramError, RetryAfter
+                from telegram.request import HTTPXRequest
                 self.Bot = Bot
                 self.TelegramError = TelegramError
+                self.RetryAfter = RetryAfter
+                self.HTTPXRequest = HTTPXRequest
             except ImportError:
                 logger.warning("⚠️ python-telegram-bot 라이브러리가 설치되지 않았습니다.")
                 self.enabled = False
@@ -40,9 +94,57 @@ class TelegramNotifier(BaseNotifier):
     def get_channel_name(self) -> str:
         return "TELEGRAM"
 
+    @property
+    def timeout(self) -> Optional[float]:
+        # 속도 제한으로 대기하는 알림이 제한 시간 초과로 실패하지 않도록 API 호출에만 직접 적용
+        return None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """전용 이벤트 루프 스레드 시작 (첫 전송 시)"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name='telegram', daemon=True).start()
+            return self._loop
+
+    async def _get_bot(self):
+        """공유 Bot (첫 사용 시 연결 풀과 함께 초기화, 이벤트 루프 스레드에서만 호출)"""
+        if self._bot is None:
+            bot = self.Bot(token=self.bot_token,
+                           request=self.HTTPXRequest(connection_pool_size=TELEGRAM_POOL_SIZE))
+            await bot.initialize()
+            self._bot = bot
+            self._global_bucket = TokenBucket(TELEGRAM_MAX_PER_SECOND, max(TELEGRAM_MAX_PER_SECOND, 1))
+        return self._bot
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        if chat_id not in self._chat_buckets:
+            self._chat_buckets[chat_id] = TokenBucket(TELEGRAM_CHAT_MAX_PER_SECOND, 1)
+        return self._chat_buckets[chat_id]
+
+    async def _send_async(self, chat_id: str, text: str):
+        """속도 제한을 지키며 전송 (429 응답은 안내된 시간만큼 기다린 뒤 다시 전송)"""
+        bot = await self._get_bot()
+
+        for attempt in range(TELEGRAM_MAX_RETRIES + 1):
+            await self._chat_bucket(chat_id).acquire()
+            await self._global_bucket.acquire()
+            try:
+                return await asyncio.wait_for(
+                    bot.send_message(chat_id=chat_id, text=text, parse_mode='HTML'),
+                    TELEGRAM_TIMEOUT_SECONDS
+                )
+            except self.RetryAfter as e:
+                if attempt == TELEGRAM_MAX_RETRIES:
+                    raise
+                retry_after = e.retry_after
+                delay = retry_after.total_seconds() if hasattr(retry_after, 'total_seconds') else retry_after
+                logger.warning(f"⚠️ 텔레그램 전송 속도 제한: {delay}초 후 다시 전송")
+                await asyncio.sleep(delay)
+
     def send(self, alert: Dict[str, Any]) -> Dict[str, Any]:
         """
-        텔레그램으로 알림 전송
+        텔레그램으로 알림 전송 (전송이 끝날 때까지 대기, 발송 작업 스레드에서 호출)
 
         Args:
             alert: 알림 데이터
@@ -58,19 +160,28 @@ class TelegramNotifier(BaseNotifier):
                 'error': 'Telegram not configured or library not installed'
             }
 
-        try:
-            # 봇 인스턴스 생성
-            bot = self.Bot(token=self.bot_token)
+        return self._send_text(self._format_alert_message(alert))
+
+    def send_digest(self, alerts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """여러 알림을 메시지 하나로 묶어 전송 (장애가 몰려도 메시지 수가 늘지 않음)"""
+        if not self.enabled:
+            return {
+                'success': False,
+                'message_id': None,
+                'error': 'Telegram not configured or library not installed'
+            }
 
-            # 메시지 포맷팅
-            message = self._format_alert_message(alert)
+        title, lines = self.summarize_digest(alerts)
+        return self._send_text(f"<b>{html.escape(title)}</b>\n\n" + '\n'.join(html.escape(line) for line in lines))
 
-            # 메시지 전송
-            sent_message = bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                parse_mode='Markdown'
+    def _send_text(self, message: str) -> Dict[str, Any]:
+        """메시지 전송 후 발송 결과 반환"""
+        try:
+            # 공유 이벤트 루프에서 전송 (속도 제한으로 대기할 수 있음)
+            future = asyncio.run_coroutine_threadsafe(
+                self._send_async(self.chat_id, message), self._ensure_loop()
             )
+            sent_message = future.result()
 
             logger.info(f"✅ 텔레그램 전송 성공: message_id={sent_message.message_id}")
 
@@ -80,6 +191,14 @@ class TelegramNotifier(BaseNotifier):
                 'error': None
             }
 
+        except asyncio.TimeoutError:
+            logger.error(f"❌ 텔레그램 전송 시간 초과: {TELEGRAM_TIMEOUT_SECONDS:g}초")
+            return {
+                'success': False,
+                'message_id': None,
+                'error': f'Timed out after {TELEGRAM_TIMEOUT_SECONDS:g}s'
+            }
+
         except self.TelegramError as e:
             logger.error(f"❌ 텔레그램 전송 실패: {str(e)}")
             return {
@@ -96,8 +215,23 @@ class TelegramNotifier(BaseNotifier):
                 'error': str(e)
             }
 
+    def close(self) -> None:
+        """Bot 연결 풀 정리 및 이벤트 루프 종료"""
+        if self._loop is None:
+            return
+
+        async def shutdown():
+            if self._bot is not None:
+                await self._bot.shutdown()
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(timeout=5)
+        except Exception as e:
+            logger.warning(f"⚠️ 텔레그램 연결 정리 실패: {str(e)}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
     def _format_alert_message(self, alert: Dict[str, Any]) -> str:
-        """알림 메시지 포맷팅 (Markdown)"""
+        """알림 메시지 포맷팅 (HTML, 값은 이스케이프)"""
         # 알림 타입에 따른 이모지
         emoji_map = {
             'ERROR': '🚨',
@@ -106,16 +240,19 @@ class TelegramNotifier(BaseNotifier):
         }
         emoji = emoji_map.get(alert['alert_type'], '📢')
 
+        value = {key: html.escape(str(alert.get(key))) for key in
+                 ('alert_type', 'target_url', 'message', 'status', 'created_at', 'resolved_at')}
+
         message = f"""
-{emoji} *{alert['alert_type']}* 알림
+{emoji} <b>{value['alert_type']}</b> 알림
 
-*URL:* {alert['target_url']}
-*메시지:* {alert['message']}
-*상태:* {alert['status']}
-*발생 시각:* {alert['created_at']}
+<b>URL:</b> {value['target_url']}
+<b>메시지:</b> {value['message']}
+<b>상태:</b> {value['status']}
+<b>발생 시각:</b> {value['created_at']}
 """
 
         if alert.get('resolved_at'):
-            message += f"*해결 시각:* {alert['resolved_at']}\n"
+            message += f"<b>해결 시각:</b> {value['resolved_at']}\n"
 
         return message.strip()
@@ -0,0 +1,126 @@
+"""
+목록 조회 API의 keyset 페이지네이션 및 필터 파라미터 처리
+- (시각, id) 내림차순으로 정렬하고 마지막 행 다음부터 조회 (OFFSET 없이 인덱스 범위 탐색)
+  → 이력이 아무리 많아도 페이지 조회 비용과 응답 크기가 일정
+- 커서는 마지막 행의 (시각, id)를 인코딩한 불투명 문자열
+- 잘못된 파라미터는 ValueError (API에서 400으로 응답)
+"""
+import base64
+import json
+import os
+from typing import List, Dict, Any, Optional, Tuple
+from database import fetch_all
+from timeutil import parse_utc
+
+# 페이지 크기
+DEFAULT_PAGE_SIZE = int(os.getenv('DEFAULT_PAGE_SIZE', '100'))
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', '1000'))
+
+
+def encode_cursor(time_value: str, row_id: int) -> str:
+    """마지막 행의 (시각, id)를 커서 문자열로 인코딩"""
+    raw = json.dumps([time_value, row_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """커서 문자열을 (시각, id)로 디코딩"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        time_value, row_id = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+    if not isinstance(time_value, str) or not isinstance(row_id, int):
+        raise ValueError('Invalid cursor')
+    return time_value, row_id
+
+
+def parse_limit(value: Optional[str], default: int = DEFAULT_PAGE_SIZE) -> int:
+    """페이지 크기 (1 ~ MAX_PAGE_SIZE)"""
+    if value is None:
+        return default
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError('limit must be an integer')
+
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f'limit must be between 1 and {MAX_PAGE_SIZE}')
+    return limit
+
+
+def parse_time(value: Optional[str], name: str) -> Optional[str]:
+    """ISO 8601 시각을 DB 형식('YYYY-MM-DD HH:MM:SS' UTC)으로 변환 (시간대가 있으면 UTC로 환산)"""
+    if value is None:
+        return None
+    try:
+        return parse_utc(value).strftime('%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        raise ValueError(f'{name} must be an ISO 8601 timestamp')
+
+
+def parse_choices(value: Optional[str], name: str,
+                  allowed: Optional[Tuple[str, ...]] = None) -> Optional[List[str]]:
+    """쉼표로 구분된 값 목록 (대문자로 정규화, allowed가 있으면 허용된 값만)"""
+    if not value:
+        return None
+
+    choices = [item.strip().upper() for item in value.split(',') if item.strip()]
+    invalid = [item for item in choices if allowed and item not in allowed]
+    if invalid:
+        raise ValueError(f'Invalid {name}: {", ".join(invalid)}. Must be one of: {list(allowed)}')
+    return choices
+
+
+def parse_fields(value: Optional[str], allowed: Tuple[str, ...]) -> Optional[List[str]]:
+    """응답에 포함할 필드 목록 (없으면 전체)"""
+    if not value:
+        return None
+
+    fields = [item.strip() for item in value.split(',') if item.strip()]
+    invalid = [item for item in fields if item not in allowed]
+    if invalid:
+        raise ValueError(f'Unknown fields: {", ".join(invalid)}. Must be one of: {list(allowed)}')
+    return fields
+
+
+def fetch_page(table: str, time_column: str, columns: Tuple[str, ...],
+               conditions: List[Tuple[str, tuple]], fields: Optional[List[str]] = None,
+               cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    """
+    (time_column, id) 내림차순 keyset 페이지 조회
+
+    Args:
+        conditions: (SQL 조건, 파라미터) 목록 (AND로 결합)
+        fields: 응답 필드 (정렬 키는 커서 생성을 위해 항상 조회한 뒤 요청하지 않았으면 제외)
+
+    Returns:
+        dict: rows (행 목록), next_cursor (다음 페이지 커서, 마지막 페이지면 None)
+    """
+    selected = list(fields or columns)
+    query_columns = selected + [c for c in (time_column, 'id') if c not in selected]
+
+    where = [sql for sql, _ in conditions]
+    params = [p for _, values in conditions for p in values]
+    if cursor:
+        time_value, row_id = decode_cursor(cursor)
+        where.append(f"({time_column}, id) < (?, ?)")
+        params += [time_value, row_id]
+
+    query = f"SELECT {', '.join(query_columns)} FROM {table}"
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    # 다음 페이지 존재 여부 확인을 위해 한 행 더 조회
+    query += f" ORDER BY {time_column} DESC, id DESC LIMIT ?"
+    rows = fetch_all(query, tuple(params) + (limit + 1,))
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][time_column], rows[-1]['id'])
+
+    if len(query_columns) != len(selected):
+        rows = [{name: row[name] for name in selected} for row in rows]
+
+    return {'rows': rows, 'next_cursor': next_cursor}
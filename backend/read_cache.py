@@ -0,0 +1,98 @@
+"""
+알림 조회 API 읽기 캐시 (버전 기반)
+- 알림/발송 로그를 쓸 때마다 버전을 올림 (models의 Alert/NotificationLog 쓰기 메서드에서 호출)
+- 조회 응답 본문을 (요청 URL, 버전) 단위로 캐시하여 같은 버전 동안 DB 조회와 JSON 직렬화를 생략
+- ETag = 프로세스 시작 시각 + 버전 + URL 해시 → If-None-Match가 일치하면 DB 접근 없이 304
+- 백엔드 프로세스가 하나라고 가정 (다른 프로세스의 쓰기는 버전에 반영되지 않음)
+"""
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from functools import wraps
+from typing import Optional, Tuple
+from flask import request, make_response, Response
+
+# 캐시할 최대 응답 수 (오래 쓰지 않은 것부터 제거)
+READ_CACHE_MAX_ENTRIES = int(os.getenv('READ_CACHE_MAX_ENTRIES', '256'))
+
+
+class ReadCache:
+    """버전 기반 응답 캐시"""
+
+    def __init__(self, max_entries: int = READ_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.version = 0
+        # 재시작 후 버전이 0부터 다시 시작해도 이전 ETag와 겹치지 않도록 시작 시각을 포함
+        self._epoch = format(int(time.time() * 1000), 'x')
+        self._entries: 'OrderedDict[str, Tuple[int, bytes, str]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """데이터가 바뀌었음을 알림 (DB 커밋 후 호출)"""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def etag(self, key: str, version: int) -> str:
+        return f"{self._epoch}-{version}-{zlib.crc32(key.encode()):08x}"
+
+    def get(self, key: str, version: int) -> Optional[Tuple[bytes, str]]:
+        """같은 버전에서 캐시한 (본문, Content-Type) 반환"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1], entry[2]
+
+    def put(self, key: str, version: int, body: bytes, mimetype: str) -> None:
+        with self._lock:
+            # 조회하는 동안 버전이 바뀌었으면 이미 낡은 응답이므로 저장하지 않음
+            if version != self.version:
+                return
+            self._entries[key] = (version, body, mimetype)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+# 알림 조회 API 캐시 (Alert, NotificationLog 쓰기 시 무효화)
+alert_read_cache = ReadCache()
+
+
+def cached_response(cache: ReadCache):
+    """
+    GET 조회 API 데코레이터
+    - If-None-Match가 현재 ETag와 같으면 뷰를 실행하지 않고 304
+    - 같은 버전에서 캐시한 본문이 있으면 그대로 200
+    - 그 외에는 뷰를 실행하고 200 응답만 캐시
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # 버전을 먼저 읽어야 조회 중 쓰기가 일어나도 응답이 새 버전으로 표시되지 않음
+            version = cache.version
+            key = request.full_path
+            etag = cache.etag(key, version)
+
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+            else:
+                cached = cache.get(key, version)
+                if cached is not None:
+                    response = Response(cached[0], status=200, mimetype=cached[1])
+                else:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    cache.put(key, version, response.get_data(), response.mimetype)
+
+            response.set_etag(etag)
+            # 캐시는 하되 매번 ETag로 재검증
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+
+        return wrapper
+    return decorator
@@ -0,0 +1,122 @@
+"""
+보존 기간 관리
+- 보존 기간이 지난 원본 이벤트/구간 요약/분 단위 rollup을 작은 배치로 삭제 (배치마다 짧은 트랜잭션)
+- 삭제 후 증분 vacuum으로 빈 페이지를 조금씩 반환하여 DB 크기 유지
+- 시간/일 단위 rollup은 더 오래 보관하여 장기 이력 조회 가능
+"""
+import logging
+import os
+import threading
+from typing import Dict
+from dotenv import load_dotenv
+from database import get_db_connection
+
+load_dotenv()
+
+# 로거
+logger = logging.getLogger('retention')
+
+# 보존 기간 (일, 0이면 삭제하지 않음)
+EVENT_RETENTION_DAYS = float(os.getenv('EVENT_RETENTION_DAYS', '7'))
+ROLLUP_MINUTE_RETENTION_DAYS = float(os.getenv('ROLLUP_MINUTE_RETENTION_DAYS', '30'))
+ROLLUP_HOUR_RETENTION_DAYS = float(os.getenv('ROLLUP_HOUR_RETENTION_DAYS', '400'))
+ROLLUP_DAY_RETENTION_DAYS = float(os.getenv('ROLLUP_DAY_RETENTION_DAYS', '0'))
+
+# 정리 주기 및 배치 설정
+RETENTION_INTERVAL_SECONDS = float(os.getenv('RETENTION_INTERVAL_SECONDS', '300'))
+RETENTION_BATCH_SIZE = int(os.getenv('RETENTION_BATCH_SIZE', '1000'))
+RETENTION_BATCH_PAUSE_SECONDS = float(os.getenv('RETENTION_BATCH_PAUSE_SECONDS', '0.05'))
+VACUUM_PAGES_PER_RUN = int(os.getenv('VACUUM_PAGES_PER_RUN', '1000'))
+
+# (테이블, 키 컬럼, 시각 컬럼, 보존 기간, 추가 조건)
+# 알림이 참조하는 이벤트는 알림 이력 조회를 위해 남김
+RETENTION_RULES = [
+    ('events', 'id', 'timestamp', EVENT_RETENTION_DAYS,
+     'AND id NOT IN (SELECT event_id FROM alerts WHERE event_id IS NOT NULL)'),
+    ('event_summaries', 'id', 'window_start', EVENT_RETENTION_DAYS, ''),
+    ('event_rollups_minute', 'rowid', 'bucket_start', ROLLUP_MINUTE_RETENTION_DAYS, ''),
+    ('event_rollups_hour', 'rowid', 'bucket_start', ROLLUP_HOUR_RETENTION_DAYS, ''),
+    ('event_rollups_day', 'rowid', 'bucket_start', ROLLUP_DAY_RETENTION_DAYS, ''),
+]
+
+
+class RetentionWorker:
+    """보존 기간 정리 스레드"""
+
+    def __init__(self, interval: float = RETENTION_INTERVAL_SECONDS,
+                 batch_size: int = RETENTION_BATCH_SIZE):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='retention', daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _delete_batch(self, table: str, key: str, time_column: str, days: float, extra: str) -> int:
+        """기준 시각 이전 행을 최대 batch_size개 삭제하고 삭제한 개수 반환"""
+        if key == 'rowid':
+            # WITHOUT ROWID 테이블은 기본 키(target_url, bucket_start)로 삭제
+            query = f"""
+                DELETE FROM {table}
+                WHERE (target_url, bucket_start) IN (
+                    SELECT target_url, bucket_start FROM {table}
+                    WHERE {time_column} < datetime('now', ?)
+                    LIMIT ?
+                )
+            """
+        else:
+            query = f"""
+                DELETE FROM {table}
+                WHERE {key} IN (
+                    SELECT {key} FROM {table}
+                    WHERE {time_column} < datetime('now', ?) {extra}
+                    LIMIT ?
+                )
+            """
+
+        with get_db_connection() as conn:
+            cursor = conn.execute(query, (f'-{days} days', self.batch_size))
+            return cursor.rowcount
+
+    def prune(self) -> Dict[str, int]:
+        """보존 기간이 지난 행 삭제 후 증분 vacuum (테이블별 삭제 개수 반환)"""
+        deleted = {}
+
+        for table, key, time_column, days, extra in RETENTION_RULES:
+            if days <= 0:
+                continue
+
+            total = 0
+            while not self._stop.is_set():
+                count = self._delete_batch(table, key, time_column, days, extra)
+                total += count
+                if count < self.batch_size:
+                    break
+                # 배치 사이에 쓰기 잠금을 놓아 이벤트 수신이 밀리지 않도록 함
+                self._stop.wait(RETENTION_BATCH_PAUSE_SECONDS)
+
+            if total:
+                deleted[table] = total
+
+        if deleted:
+            with get_db_connection() as conn:
+                conn.execute(f"PRAGMA incremental_vacuum({VACUUM_PAGES_PER_RUN})").fetchall()
+
+        return deleted
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                deleted = self.prune()
+                if deleted:
+                    summary = ', '.join(f'{table} {count}건' for table, count in deleted.items())
+                    logger.info(f"🧹 보존 기간 정리: {summary}")
+            except Exception as e:
+                logger.error(f"⚠️ 보존 기간 정리 실패: {str(e)}")
+
+            self._stop.wait(self.interval)
@@ -0,0 +1,273 @@
+"""
+점검 결과 시간 구간 집계 (분/시간/일 단위 rollup)
+- 대상 URL별 분(event_rollups_minute)/시간(event_rollups_hour)/일(event_rollups_day) 구간의
+  count, failures, 응답 시간 합계/최소/최대 및 응답 시간 구간별 개수(히스토그램) 저장
+- 이벤트 INSERT와 같은 트랜잭션에서 UPSERT로 누적 (별도 집계 작업 없음)
+- 백분위수는 히스토그램에서 추정 (구간을 합쳐도 계산 가능)
+- 임의 기간은 일 → 시간 → 분 단위 순으로 가장 큰 구간으로 덮어 적은 행만 읽음
+"""
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Tuple, Optional
+from timeutil import parse_utc
+
+# 응답 시간 히스토그램 구간 상한 (밀리초, 마지막 구간은 상한 없음)
+LATENCY_BOUNDS_MS = (10, 25, 50, 75, 100, 150, 200, 300, 400, 500, 750,
+                     1000, 1500, 2000, 3000, 5000, 7500, 10000, 15000, 30000)
+BUCKET_COLUMNS = tuple(f'b{i}' for i in range(len(LATENCY_BOUNDS_MS) + 1))
+
+# 구간 단위별 테이블과 구간 시작 시각 형식
+ROLLUP_TABLES = {
+    'minute': ('event_rollups_minute', '%Y-%m-%d %H:%M:00'),
+    'hour': ('event_rollups_hour', '%Y-%m-%d %H:00:00'),
+    'day': ('event_rollups_day', '%Y-%m-%d 00:00:00')
+}
+
+# 구간 단위 길이
+UNIT_LENGTHS = {
+    'minute': timedelta(minutes=1),
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1)
+}
+
+
+def create_rollup_tables(cursor) -> None:
+    """rollup 테이블 생성 (init_db에서 호출)"""
+    buckets = ',\n'.join(f'            {column} INTEGER NOT NULL DEFAULT 0' for column in BUCKET_COLUMNS)
+    for table, _ in ROLLUP_TABLES.values():
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                target_url TEXT NOT NULL,
+                bucket_start DATETIME NOT NULL,
+                count INTEGER NOT NULL,
+                failures INTEGER NOT NULL,
+                sum_ms INTEGER NOT NULL,
+                min_ms INTEGER,
+                max_ms INTEGER,
+{buckets},
+                PRIMARY KEY (target_url, bucket_start)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_bucket ON {table}(bucket_start)")
+
+
+def bucket_index(latency_ms: float) -> int:
+    """응답 시간이 속하는 히스토그램 구간 번호"""
+    for index, bound in enumerate(LATENCY_BOUNDS_MS):
+        if latency_ms <= bound:
+            return index
+    return len(LATENCY_BOUNDS_MS)
+
+
+def _parse_time(value: Optional[str]) -> datetime:
+    """점검 시각 (Agent가 보낸 시각을 UTC로 환산, 없거나 잘못되면 현재 UTC)"""
+    try:
+        return parse_utc(value)
+    except (TypeError, ValueError):
+        return datetime.utcnow()
+
+
+class _Delta:
+    """한 (URL, 구간)에 더할 값"""
+
+    __slots__ = ('count', 'failures', 'sum_ms', 'min_ms', 'max_ms', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.sum_ms = 0
+        self.min_ms = None
+        self.max_ms = None
+        self.buckets = [0] * len(BUCKET_COLUMNS)
+
+    def add(self, count: int, failures: int, sum_ms: float, min_ms: Optional[int], max_ms: Optional[int]) -> None:
+        self.count += count
+        self.failures += failures
+        self.sum_ms += sum_ms
+        if min_ms is not None:
+            self.min_ms = min_ms if self.min_ms is None else min(self.min_ms, min_ms)
+        if max_ms is not None:
+            self.max_ms = max_ms if self.max_ms is None else max(self.max_ms, max_ms)
+
+
+def _summary_buckets(summary: Dict[str, Any]) -> List[Tuple[float, int]]:
+    """
+    구간 요약의 (응답 시간, 개수) 근사 분포
+    요약에는 백분위수만 있으므로 50%는 p50, 45%는 p95, 4%는 p99, 나머지는 max 구간에 배정
+    """
+    count = summary['count']
+    p50 = summary.get('p50_ms') or summary.get('avg_ms') or 0
+    p95 = summary.get('p95_ms') or p50
+    p99 = summary.get('p99_ms') or p95
+    max_ms = summary.get('max_ms') or p99
+
+    n50 = math.ceil(count * 0.5)
+    n95 = min(math.ceil(count * 0.95), count) - n50
+    n99 = min(math.ceil(count * 0.99), count) - n50 - n95
+    return [(p50, n50), (p95, n95), (p99, n99), (max_ms, count - n50 - n95 - n99)]
+
+
+def rollup_statements(events: List[Dict[str, Any]] = (),
+                      summaries: List[Dict[str, Any]] = ()) -> List[Tuple[str, tuple]]:
+    """
+    이벤트/구간 요약을 분·시간 rollup에 더하는 UPSERT 문장 목록
+    (같은 배치의 같은 URL·구간은 미리 합쳐 한 문장으로 만듦)
+    """
+    deltas: Dict[Tuple[str, str, str], _Delta] = defaultdict(_Delta)
+
+    for event in events:
+        checked_at = _parse_time(event.get('timestamp'))
+        latency = event.get('response_time_ms') or 0
+        for unit, (_, time_format) in ROLLUP_TABLES.items():
+            delta = deltas[(unit, event['target_url'], checked_at.strftime(time_format))]
+            delta.add(1, 0 if event['is_success'] else 1, latency, latency, latency)
+            delta.buckets[bucket_index(latency)] += 1
+
+    for summary in summaries:
+        window_start = _parse_time(summary['window_start'])
+        for unit, (_, time_format) in ROLLUP_TABLES.items():
+            delta = deltas[(unit, summary['target_url'], window_start.strftime(time_format))]
+            delta.add(summary['count'], summary['failures'],
+                      (summary.get('avg_ms') or 0) * summary['count'],
+                      summary.get('min_ms'), summary.get('max_ms'))
+            for latency, count in _summary_buckets(summary):
+                delta.buckets[bucket_index(latency)] += count
+
+    columns = ('target_url', 'bucket_start', 'count', 'failures', 'sum_ms', 'min_ms', 'max_ms') + BUCKET_COLUMNS
+    placeholders = ', '.join('?' for _ in columns)
+    updates = ', '.join(
+        ['count = count + excluded.count', 'failures = failures + excluded.failures',
+         'sum_ms = sum_ms + excluded.sum_ms',
+         'min_ms = min(coalesce(min_ms, excluded.min_ms), coalesce(excluded.min_ms, min_ms))',
+         'max_ms = max(coalesce(max_ms, excluded.max_ms), coalesce(excluded.max_ms, max_ms))']
+        + [f'{column} = {column} + excluded.{column}' for column in BUCKET_COLUMNS]
+    )
+
+    statements = []
+    for (unit, url, bucket_start), delta in deltas.items():
+        table = ROLLUP_TABLES[unit][0]
+        query = (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+                 f"ON CONFLICT (target_url, bucket_start) DO UPDATE SET {updates}")
+        params = (url, bucket_start, delta.count, delta.failures, int(round(delta.sum_ms)),
+                  delta.min_ms, delta.max_ms, *delta.buckets)
+        statements.append((query, params))
+
+    return statements
+
+
+def estimate_percentile(buckets: List[int], p: float,
+                        min_ms: Optional[int] = None, max_ms: Optional[int] = None) -> Optional[float]:
+    """
+    히스토그램에서 백분위수 추정 (해당 구간 안에서 선형 보간, 실제 최소/최대로 제한)
+
+    Args:
+        buckets: 구간별 개수 (BUCKET_COLUMNS 순서)
+        p: 백분위 (0~100)
+    """
+    total = sum(buckets)
+    if total == 0:
+        return None
+
+    rank = max(math.ceil(p / 100 * total), 1)
+    cumulative = 0
+    for index, count in enumerate(buckets):
+        if count and cumulative + count >= rank:
+            lower = LATENCY_BOUNDS_MS[index - 1] if index > 0 else 0
+            upper = LATENCY_BOUNDS_MS[index] if index < len(LATENCY_BOUNDS_MS) else (max_ms or lower)
+            if min_ms is not None:
+                lower = max(lower, min_ms)
+            if max_ms is not None:
+                upper = min(upper, max_ms)
+            value = lower + (upper - lower) * (rank - cumulative) / count
+            return round(max(value, lower), 1)
+        cumulative += count
+
+    return None
+
+
+def backfill_rollups(cursor) -> int:
+    """
+    기존 데이터로 비어 있는 rollup 채우기 (init_db에서 실행)
+    분/시간 단위는 events.timestamp(수신 시각) 기준, 일 단위는 시간 단위 rollup에서 합산
+    (원본 이벤트 보존 기간보다 오래된 이력도 일 단위에 반영)
+
+    Returns:
+        int: 채운 분 단위 구간 수
+    """
+    bucket_sums = []
+    for index, column in enumerate(BUCKET_COLUMNS):
+        lower = LATENCY_BOUNDS_MS[index - 1] if index > 0 else None
+        upper = LATENCY_BOUNDS_MS[index] if index < len(LATENCY_BOUNDS_MS) else None
+        conditions = [f'coalesce(response_time_ms, 0) > {lower}' if lower is not None else None,
+                      f'coalesce(response_time_ms, 0) <= {upper}' if upper is not None else None]
+        condition = ' AND '.join(c for c in conditions if c)
+        bucket_sums.append(f'sum(CASE WHEN {condition} THEN 1 ELSE 0 END)')
+
+    columns = f"target_url, bucket_start, count, failures, sum_ms, min_ms, max_ms, {', '.join(BUCKET_COLUMNS)}"
+    filled = 0
+    for unit, (table, time_format) in ROLLUP_TABLES.items():
+        cursor.execute(f"SELECT 1 FROM {table} LIMIT 1")
+        if cursor.fetchone():
+            continue
+
+        if unit == 'day':
+            cursor.execute(f"""
+                INSERT INTO {table} ({columns})
+                SELECT target_url, strftime('{time_format}', bucket_start), sum(count), sum(failures),
+                       sum(sum_ms), min(min_ms), max(max_ms), {', '.join(f'sum({c})' for c in BUCKET_COLUMNS)}
+                FROM {ROLLUP_TABLES['hour'][0]}
+                GROUP BY target_url, strftime('{time_format}', bucket_start)
+            """)
+            continue
+
+        cursor.execute(f"""
+            INSERT INTO {table} ({columns})
+            SELECT target_url, strftime('{time_format}', timestamp), count(*),
+                   sum(CASE WHEN is_success THEN 0 ELSE 1 END), sum(coalesce(response_time_ms, 0)),
+                   min(response_time_ms), max(response_time_ms), {', '.join(bucket_sums)}
+            FROM events
+            WHERE timestamp IS NOT NULL
+            GROUP BY target_url, strftime('{time_format}', timestamp)
+        """)
+        if unit == 'minute':
+            filled = cursor.rowcount
+
+    return filled
+
+
+def _floor(moment: datetime, unit: str) -> datetime:
+    moment = moment.replace(second=0, microsecond=0)
+    if unit in ('hour', 'day'):
+        moment = moment.replace(minute=0)
+    if unit == 'day':
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def _ceil(moment: datetime, unit: str) -> datetime:
+    floor = _floor(moment, unit)
+    return floor if floor == moment else floor + UNIT_LENGTHS[unit]
+
+
+def cover_window(since: datetime, until: datetime,
+                 units: Tuple[str, ...] = ('day', 'hour', 'minute')) -> List[Tuple[str, str, str]]:
+    """
+    [since, until) 기간을 덮는 (테이블, 시작, 끝) 목록
+    가운데는 큰 단위 구간, 양 끝의 자투리는 더 작은 단위 구간으로 채움 (분 단위 미만은 분 단위로 올림/내림)
+    """
+    if since >= until:
+        return []
+
+    unit = units[0]
+    table, time_format = ROLLUP_TABLES[unit]
+    if len(units) == 1:
+        return [(table, _floor(since, unit).strftime(time_format), _ceil(until, unit).strftime(time_format))]
+
+    start, end = _ceil(since, unit), _floor(until, unit)
+    if start >= end:
+        return cover_window(since, until, units[1:])
+
+    return (cover_window(since, start, units[1:])
+            + [(table, start.strftime(time_format), end.strftime(time_format))]
+            + cover_window(end, until, units[1:]))
@@ -0,0 +1,108 @@
+"""
+대용량 목록 스트리밍 응답 (내보내기)
+- keyset 커서로 chunk_size 행씩 조회하여 바로 응답에 씀 (전체 결과를 메모리에 올리지 않음)
+- 청크마다 짧은 읽기로 끝나므로 긴 내보내기 중에도 연결을 붙잡거나 WAL 체크포인트를 막지 않음
+- 형식: JSON 배열 또는 NDJSON (한 줄에 한 행)
+"""
+import json
+import logging
+import os
+from typing import Callable, Dict, Any, Iterator, List, Optional
+from flask import Response
+
+# 로거
+logger = logging.getLogger('streaming')
+
+# 청크 크기 (한 번에 조회하여 응답에 쓰는 행 수)
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', '1000'))
+MAX_EXPORT_CHUNK_SIZE = int(os.getenv('MAX_EXPORT_CHUNK_SIZE', '10000'))
+
+# 형식별 Content-Type
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json'
+}
+
+
+def parse_format(value: Optional[str]) -> str:
+    """응답 형식 (기본값: ndjson)"""
+    fmt = (value or 'ndjson').lower()
+    if fmt not in FORMATS:
+        raise ValueError(f'format must be one of: {list(FORMATS)}')
+    return fmt
+
+
+def parse_chunk_size(value: Optional[str]) -> int:
+    """청크 크기 (1 ~ MAX_EXPORT_CHUNK_SIZE)"""
+    if value is None:
+        return EXPORT_CHUNK_SIZE
+    try:
+        chunk_size = int(value)
+    except ValueError:
+        raise ValueError('chunk_size must be an integer')
+
+    if chunk_size < 1 or chunk_size > MAX_EXPORT_CHUNK_SIZE:
+        raise ValueError(f'chunk_size must be between 1 and {MAX_EXPORT_CHUNK_SIZE}')
+    return chunk_size
+
+
+def iter_chunks(get_page: Callable[..., Dict[str, Any]], chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """
+    페이지 조회 함수를 커서로 끝까지 따라가며 청크(행 목록) 단위로 반환
+
+    Args:
+        get_page: cursor, limit 인자를 받아 rows, next_cursor를 반환하는 함수 (예: Alert.get_page)
+    """
+    cursor = None
+    while True:
+        page = get_page(cursor=cursor, limit=chunk_size)
+        if page['rows']:
+            yield page['rows']
+
+        cursor = page['next_cursor']
+        if cursor is None:
+            return
+
+
+def encode_chunks(chunks: Iterator[List[Dict[str, Any]]], fmt: str) -> Iterator[str]:
+    """청크를 JSON 배열 또는 NDJSON 조각으로 직렬화 (청크당 한 번 씀)"""
+    if fmt == 'ndjson':
+        for rows in chunks:
+            yield ''.join(json.dumps(row) + '\n' for row in rows)
+        return
+
+    yield '['
+    separator = ''
+    for rows in chunks:
+        yield separator + ','.join(json.dumps(row) for row in rows)
+        separator = ','
+    yield ']'
+
+
+def stream_rows(get_page: Callable[..., Dict[str, Any]], fmt: str, chunk_size: int, name: str) -> Response:
+    """
+    목록 전체를 스트리밍하는 응답 생성
+
+    응답 시작 후의 오류는 상태 코드로 알릴 수 없으므로 로그를 남기고,
+    NDJSON은 마지막 줄에 {"error": ...}를 씀 (JSON 배열은 닫히지 않은 채 끝남)
+    """
+    def generate():
+        count = 0
+
+        def counted():
+            nonlocal count
+            for rows in iter_chunks(get_page, chunk_size):
+                count += len(rows)
+                yield rows
+
+        try:
+            yield from encode_chunks(counted(), fmt)
+            logger.info(f"📤 {name} 내보내기 완료: {count}건 ({fmt}, 청크 {chunk_size})")
+        except Exception as e:
+            logger.error(f"❌ {name} 내보내기 중 오류 ({count}건 전송 후): {str(e)}")
+            if fmt == 'ndjson':
+                yield json.dumps({'error': str(e)}) + '\n'
+
+    return Response(generate(), mimetype=FORMATS[fmt], headers={
+        'Content-Disposition': f'attachment; filename={name}.{fmt}'
+    })
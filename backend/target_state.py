@@ -0,0 +1,149 @@
+"""
+대상별 점검 결과 상태 추적 (장애/복구 판정 및 flapping 감지)
+- 대상마다 최근 결과를 메모리 슬라이딩 윈도우로 유지 (events 테이블 조회 없음)
+- 연속 실패 open_after회에 알림 생성, 연속 성공 resolve_after회에 해결 (대상별 설정 가능)
+- 최근 FLAP_WINDOW_SIZE회 중 상태 변화 비율이 FLAP_START_RATIO 이상이면 flapping 시작,
+  FLAP_STOP_RATIO 이하로 내려가야 끝남 (히스테리시스: 경계값 부근에서 시작/종료가 반복되지 않음)
+- 서버 재시작 시 초기화됨 (열린 알림은 DB에서 다시 로드하므로 중복 알림은 생기지 않음)
+"""
+import os
+import threading
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
+
+# 알림 생성/해결에 필요한 연속 실패/성공 횟수 (기본값, 대상별 설정은 ALERT_THRESHOLDS_FILE)
+ALERT_OPEN_AFTER_FAILURES = int(os.getenv('ALERT_OPEN_AFTER_FAILURES', '1'))
+ALERT_RESOLVE_AFTER_SUCCESSES = int(os.getenv('ALERT_RESOLVE_AFTER_SUCCESSES', '1'))
+# 대상별 설정 파일: 한 줄에 "<URL> open_after=3 resolve_after=5" (# 주석)
+ALERT_THRESHOLDS_FILE = os.getenv('ALERT_THRESHOLDS_FILE')
+
+# flapping 감지: 윈도우 크기(결과 수), 시작/종료 상태 변화 비율
+FLAP_WINDOW_SIZE = int(os.getenv('FLAP_WINDOW_SIZE', '20'))
+FLAP_START_RATIO = float(os.getenv('FLAP_START_RATIO', '0.4'))
+FLAP_STOP_RATIO = float(os.getenv('FLAP_STOP_RATIO', '0.2'))
+
+if ALERT_OPEN_AFTER_FAILURES < 1 or ALERT_RESOLVE_AFTER_SUCCESSES < 1:
+    raise ValueError("ALERT_OPEN_AFTER_FAILURES, ALERT_RESOLVE_AFTER_SUCCESSES는 1 이상이어야 합니다.")
+if not 0 <= FLAP_STOP_RATIO < FLAP_START_RATIO <= 1:
+    raise ValueError("FLAP_STOP_RATIO는 FLAP_START_RATIO보다 작아야 합니다 (0 ~ 1).")
+
+
+def load_thresholds(path: Optional[str]) -> Dict[str, Tuple[int, int]]:
+    """대상별 (open_after, resolve_after) 설정 파일 로드"""
+    thresholds: Dict[str, Tuple[int, int]] = {}
+    if not path:
+        return thresholds
+
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+
+            parts = line.split()
+            values = {'open_after': ALERT_OPEN_AFTER_FAILURES, 'resolve_after': ALERT_RESOLVE_AFTER_SUCCESSES}
+            for option in parts[1:]:
+                key, _, value = option.partition('=')
+                if key not in values or not value.isdigit() or int(value) < 1:
+                    raise ValueError(f"잘못된 알림 기준 옵션: {option} ({parts[0]})")
+                values[key] = int(value)
+            thresholds[parts[0]] = (values['open_after'], values['resolve_after'])
+
+    return thresholds
+
+
+class TargetState:
+    """대상 하나의 최근 결과와 현재 연속 상태"""
+
+    __slots__ = ('results', 'changes', 'is_success', 'streak', 'flapping')
+
+    def __init__(self, window_size: int):
+        self.results: deque = deque(maxlen=window_size)  # 최근 결과 (is_success)
+        self.changes = 0           # results 안의 상태 변화 횟수
+        self.is_success: Optional[bool] = None
+        self.streak = 0            # 현재 상태의 연속 횟수
+        self.flapping = False
+
+    def add(self, is_success: bool) -> None:
+        if len(self.results) == self.results.maxlen and len(self.results) > 1:
+            # 가장 오래된 결과가 빠지면서 그 다음 결과와의 변화도 윈도우에서 빠짐
+            if self.results[0] != self.results[1]:
+                self.changes -= 1
+        if self.results and self.results[-1] != is_success:
+            self.changes += 1
+        self.results.append(is_success)
+
+    @property
+    def change_ratio(self) -> float:
+        """윈도우 안의 상태 변화 비율 (결과가 윈도우를 채우기 전에는 윈도우 크기 기준)"""
+        return self.changes / max(self.results.maxlen - 1, 1)
+
+
+class TargetStateTracker:
+    """대상별 상태 추적기 (여러 요청 스레드에서 호출)"""
+
+    def __init__(self, window_size: int = FLAP_WINDOW_SIZE,
+                 thresholds: Optional[Dict[str, Tuple[int, int]]] = None):
+        self.window_size = window_size
+        self._thresholds = thresholds if thresholds is not None else load_thresholds(ALERT_THRESHOLDS_FILE)
+        self._states: Dict[str, TargetState] = {}
+        self._lock = threading.Lock()
+
+    def thresholds(self, target_url: str) -> Tuple[int, int]:
+        """대상의 (알림 생성 연속 실패 횟수, 해결 연속 성공 횟수)"""
+        return self._thresholds.get(target_url, (ALERT_OPEN_AFTER_FAILURES, ALERT_RESOLVE_AFTER_SUCCESSES))
+
+    def record(self, target_url: str, is_success: bool, count: int = 1,
+               summary: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        점검 결과 반영
+
+        Args:
+            count: 같은 결과가 연속된 횟수 (Agent 집계 모드의 구간 요약)
+            summary: 구간 요약 여부 - Agent는 상태가 바뀔 때 구간을 끊어 요약을 먼저 보내므로
+                     요약은 한 가지 상태의 결과만 담음. 현재 상태와 다르면
+                     상태 변화 전 구간이 늦게 도착한 것으로 보고 무시
+
+        Returns:
+            dict: 반영 후 상태, 무시한 경우 None
+                - is_success: 현재 상태
+                - streak: 현재 상태 연속 횟수
+                - flapping: flapping 여부
+                - flap_changed: 이번 결과로 flapping이 시작/종료되었는지
+                - changes, window: 윈도우 안의 상태 변화 횟수, 윈도우 크기
+        """
+        with self._lock:
+            state = self._states.get(target_url)
+            if state is None:
+                state = self._states[target_url] = TargetState(self.window_size)
+
+            if summary and state.is_success is not None and state.is_success != is_success:
+                return None
+
+            if state.is_success == is_success:
+                state.streak += count
+            else:
+                state.is_success = is_success
+                state.streak = count
+            # 같은 결과의 연속은 윈도우 크기 이상 넣어도 결과가 같음
+            for _ in range(min(count, self.window_size)):
+                state.add(is_success)
+
+            was_flapping = state.flapping
+            if not state.flapping and state.change_ratio >= FLAP_START_RATIO:
+                state.flapping = True
+            elif state.flapping and state.change_ratio <= FLAP_STOP_RATIO:
+                state.flapping = False
+
+            return {
+                'is_success': state.is_success,
+                'streak': state.streak,
+                'flapping': state.flapping,
+                'flap_changed': state.flapping != was_flapping,
+                'changes': state.changes,
+                'window': self.window_size
+            }
+
+
+# 프로세스 전체에서 공유하는 대상 상태 추적기
+target_states = TargetStateTracker()
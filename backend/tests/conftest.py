@@ -0,0 +1,42 @@
+"""
+백엔드 테스트 공통 설정
+- backend 디렉터리의 모듈을 서버와 같은 방식(평면 import)으로 불러옴
+- 테스트마다 임시 SQLite 파일에 테이블을 만들어 사용 (notifications.db는 건드리지 않음)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import database
+import init_db
+from models import open_alerts
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """임시 데이터베이스 (테스트가 끝나면 쓰기 스레드와 연결 정리)"""
+    path = str(tmp_path / 'notifications.db')
+    database.close_all()
+    monkeypatch.setattr(database, 'DB_PATH', path)
+    monkeypatch.setattr(init_db, 'DB_PATH', path)
+    init_db.create_tables()
+    open_alerts.load()
+    yield path
+    database.close_all()
+
+
+@pytest.fixture
+def client(db, monkeypatch):
+    """/events API 테스트 클라이언트 (대상 상태는 테스트마다 새로 시작)"""
+    from flask import Flask
+    from api import events
+    from target_state import TargetStateTracker
+
+    monkeypatch.setattr(events, 'target_states', TargetStateTracker(thresholds={}))
+    app = Flask(__name__)
+    app.register_blueprint(events.events_bp)
+    client = app.test_client()
+    client.environ_base['HTTP_X_API_KEY'] = events.API_KEY
+    return client
@@ -0,0 +1,91 @@
+"""
+알림 변경 이벤트 스트림 (SSE 구독, 이어받기, 느린 구독자 연결 종료) 테스트
+"""
+import pytest
+from flask import Flask
+from alert_stream import AlertEventBroker
+
+ALERT = {'id': 1, 'alert_type': 'ERROR', 'status': 'OPEN', 'target_url': 'https://example.com'}
+
+
+def event_names(frames):
+    return [line.split(': ', 1)[1] for frame in frames for line in frame.splitlines() if line.startswith('event: ')]
+
+
+def test_publish_fans_out_to_every_subscriber():
+    broker = AlertEventBroker(buffer_size=10, history_size=10, max_subscribers=10)
+    subscribers = [broker.subscribe()[0] for _ in range(3)]
+
+    broker.publish('created', ALERT)
+    broker.publish('acked', {**ALERT, 'status': 'ACK'})
+
+    for subscriber in subscribers:
+        assert event_names([subscriber.next(0), subscriber.next(0)]) == ['created', 'acked']
+        assert subscriber.next(0) is None
+
+
+def test_subscribers_over_limit_are_refused():
+    broker = AlertEventBroker(max_subscribers=2)
+    first, _ = broker.subscribe()
+    broker.subscribe()
+
+    assert broker.subscribe() == (None, [])
+    broker.unsubscribe(first)
+    assert broker.subscribe()[0] is not None
+
+
+def test_slow_subscriber_is_evicted_without_affecting_others():
+    broker = AlertEventBroker(buffer_size=2, history_size=10, max_subscribers=10)
+    slow, _ = broker.subscribe()
+    fast, _ = broker.subscribe()
+
+    for _ in range(3):
+        broker.publish('created', ALERT)
+        assert fast.next(0) is not None
+
+    assert slow.evicted and slow.next(0) is None
+    assert broker.subscriber_count == 1 and broker.evicted_count == 1
+
+
+def test_resume_from_last_event_id():
+    broker = AlertEventBroker(history_size=2)
+    for event in ('created', 'acked', 'resolved'):
+        broker.publish(event, ALERT)
+
+    # 보관 범위 안이면 이후 이벤트, 벗어났거나 다른 서버 실행의 ID면 reset
+    assert event_names(broker.subscribe(f'{broker._epoch}-1')[1]) == ['acked', 'resolved']
+    assert event_names(broker.subscribe(f'{broker._epoch}-2')[1]) == ['resolved']
+    assert event_names(broker.subscribe('0-1')[1]) == ['reset']
+    broker.publish('reopened', ALERT)
+    assert event_names(broker.subscribe(f'{broker._epoch}-1')[1]) == ['reset']
+
+
+@pytest.fixture
+def stream_client(monkeypatch):
+    from api import alerts
+    broker = AlertEventBroker(buffer_size=10, history_size=10, max_subscribers=1)
+    monkeypatch.setattr(alerts, 'alert_events', broker)
+    monkeypatch.setattr(alerts, 'ALERT_STREAM_HEARTBEAT_SECONDS', 0.05)
+    app = Flask(__name__)
+    app.register_blueprint(alerts.alerts_bp)
+    return app.test_client(), broker
+
+
+def test_stream_delivers_events_and_releases_subscriber_on_disconnect(stream_client):
+    client, broker = stream_client
+    response = client.get('/alerts/stream', buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+
+    chunks = iter(response.response)
+    assert next(chunks) == b'retry: 3000\n\n'
+    assert broker.subscriber_count == 1
+    assert client.get('/alerts/stream').status_code == 503
+
+    broker.publish('created', ALERT)
+    assert b'event: created' in next(chunks)
+    assert next(chunks) == b': keepalive\n\n'
+
+    # 클라이언트 연결 종료 시 구독 해제
+    response.close()
+    assert broker.subscriber_count == 0
@@ -0,0 +1,168 @@
+"""
+그룹 커밋 쓰기 스레드 테스트
+"""
+import sqlite3
+import threading
+import time
+import pytest
+import database
+from database import GroupCommitWriter
+
+
+@pytest.fixture
+def gate(tmp_path, monkeypatch):
+    """
+    임시 DB와 쓰기 스레드를 멈춰 둘 수 있는 block() SQL 함수
+    (block()을 실행하는 동안 들어온 요청은 다음 배치로 모임)
+    """
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'writer.db'))
+    conn = database.connect()
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)")
+    conn.commit()
+    conn.close()
+
+    release = threading.Event()
+    release.entered = threading.Event()
+    connect = database.connect
+
+    def block():
+        release.entered.set()
+        return int(release.wait(5))
+
+    def connect_with_block():
+        conn = connect()
+        conn.create_function('block', 0, block)
+        return conn
+
+    monkeypatch.setattr(database, 'connect', connect_with_block)
+    yield release
+    release.set()
+
+
+@pytest.fixture
+def writer(gate, monkeypatch):
+    batches = []
+    commit = GroupCommitWriter._commit
+
+    def record_commit(self, conn, batch):
+        batches.append(len(batch))
+        commit(self, conn, batch)
+
+    monkeypatch.setattr(GroupCommitWriter, '_commit', record_commit)
+    writer = GroupCommitWriter(max_batch=100, max_delay=0)
+    writer.batches = batches
+    yield writer
+    gate.set()
+    writer.close()
+
+
+def insert(name):
+    return ("INSERT INTO items (name) VALUES (?)", (name,))
+
+
+def submit_async(writer, statements):
+    """요청을 별도 스레드에서 제출하고 (스레드, 결과) 반환"""
+    outcome = {}
+
+    def run():
+        try:
+            outcome['row_ids'] = writer.submit(statements)
+        except Exception as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, outcome
+
+
+def hold_writer(writer, gate):
+    """쓰기 스레드가 block()에서 멈출 때까지 대기"""
+    thread, outcome = submit_async(writer, [("INSERT INTO items (name) SELECT 'held' WHERE block()", ())])
+    assert gate.entered.wait(2)
+    return thread, outcome
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def names():
+    conn = sqlite3.connect(database.DB_PATH)
+    try:
+        return sorted(row[0] for row in conn.execute("SELECT name FROM items"))
+    finally:
+        conn.close()
+
+
+def test_concurrent_submits_share_one_commit(writer, gate):
+    held = hold_writer(writer, gate)
+    pending = [submit_async(writer, [insert(f'item-{index}')]) for index in range(5)]
+    wait_for(lambda: writer._queue.qsize() == 5)
+
+    gate.set()
+    for thread, outcome in [held] + pending:
+        thread.join(2)
+        assert 'error' not in outcome
+
+    assert writer.batches == [1, 5]
+    assert len({outcome['row_ids'][0] for _, outcome in pending}) == 5
+    assert names() == ['held'] + [f'item-{index}' for index in range(5)]
+
+
+def test_failing_request_does_not_fail_others_in_group(writer, gate):
+    writer.submit([insert('taken')])
+    held = hold_writer(writer, gate)
+    good = submit_async(writer, [insert('a'), insert('b')])
+    bad = submit_async(writer, [insert('c'), insert('taken')])  # UNIQUE 위반
+    other = submit_async(writer, [insert('d')])
+    wait_for(lambda: writer._queue.qsize() == 3)
+
+    gate.set()
+    for thread, _ in (held, good, bad, other):
+        thread.join(2)
+
+    assert isinstance(bad[1]['error'], sqlite3.IntegrityError)
+    assert len(good[1]['row_ids']) == 2 and len(other[1]['row_ids']) == 1
+    # 실패한 요청의 문장은 모두 롤백 (같은 요청의 앞 문장 'c' 포함)
+    assert names() == ['a', 'b', 'd', 'held', 'taken']
+
+
+def test_close_commits_queued_requests(gate):
+    writer = GroupCommitWriter(max_batch=100, max_delay=0)
+    held = hold_writer(writer, gate)
+    pending = [submit_async(writer, [insert(f'item-{index}')]) for index in range(3)]
+    wait_for(lambda: writer._queue.qsize() == 3)
+
+    closer = threading.Thread(target=writer.close)
+    closer.start()
+    gate.set()
+    closer.join(2)
+
+    assert not closer.is_alive()
+    for thread, outcome in [held] + pending:
+        thread.join(2)
+        assert 'row_ids' in outcome
+    assert names() == ['held', 'item-0', 'item-1', 'item-2']
+
+
+def test_returning_rows_come_back_after_group_retry(writer, gate):
+    writer.submit([insert('taken'), insert('x')])
+    held = hold_writer(writer, gate)
+    outcome = {}
+    returning = threading.Thread(target=lambda: outcome.update(rows=writer.execute(
+        [("UPDATE items SET name = name || '!' WHERE name IN ('taken', 'x') RETURNING name", ())]).rows))
+    returning.start()
+    bad = submit_async(writer, [insert('x!')])  # 앞 요청 뒤에 실행되면 UNIQUE 위반
+    wait_for(lambda: writer._queue.qsize() == 2)
+
+    gate.set()
+    for thread in (held[0], returning, bad[0]):
+        thread.join(2)
+
+    # 배치 실패 후 요청별로 다시 실행해도 결과 행이 중복되지 않음
+    assert writer.batches == [1, 1, 2]
+    assert sorted(row['name'] for row in outcome['rows']) == ['taken!', 'x!']
+    assert isinstance(bad[1]['error'], sqlite3.IntegrityError)
@@ -0,0 +1,119 @@
+"""
+알림 발송 디스패처 테스트 (가짜 채널로 발송 대기열 → 발송 → 재시도 흐름 확인)
+"""
+import time
+import pytest
+import dispatcher
+from database import fetch_all
+from dispatcher import NotificationDispatcher, retry_delay
+from models import Alert
+
+
+class FakeRegistry:
+    """채널 발송 결과를 미리 정해 두는 NotifierRegistry 대역"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.sent = []
+        self.breakers = {}
+
+    def send_all(self, alert, channels=None):
+        self.sent.append(('alert', alert['id']))
+        return [('CONSOLE', self.results.pop(0))]
+
+    def send_digest(self, channel, alerts):
+        self.sent.append(('digest', [alert['id'] for alert in alerts]))
+        return self.results.pop(0)
+
+    def close(self):
+        pass
+
+
+def wait_until(condition, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('timed out')
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def start_dispatcher(db, monkeypatch):
+    """짧은 재시도 간격으로 디스패처 시작 (테스트가 끝나면 종료)"""
+    monkeypatch.setattr(dispatcher, 'NOTIFY_POLL_SECONDS', 0.05)
+    monkeypatch.setattr(dispatcher, 'NOTIFY_DIGEST_WINDOW_SECONDS', 0)
+    monkeypatch.setattr(dispatcher, 'retry_delay', lambda attempts: 0 if attempts < 3 else None)
+    started = []
+
+    def start(registry):
+        instance = NotificationDispatcher(registry, workers=2)
+        instance.start()
+        started.append(instance)
+        return instance
+
+    yield start
+    for instance in started:
+        instance.close(timeout=2)
+
+
+def outbox_count():
+    return fetch_all("SELECT COUNT(*) AS count FROM notification_outbox")[0]['count']
+
+
+def logs(alert_id):
+    return [(row['status'], row['retry_count']) for row in fetch_all(
+        "SELECT status, retry_count FROM notification_logs WHERE alert_id = ? ORDER BY id", (alert_id,))]
+
+
+def test_retry_delay_grows_and_gives_up(monkeypatch):
+    monkeypatch.setattr(dispatcher, 'NOTIFY_MAX_ATTEMPTS', 4)
+    monkeypatch.setattr(dispatcher, 'NOTIFY_RETRY_BASE_SECONDS', 10)
+    monkeypatch.setattr(dispatcher, 'NOTIFY_RETRY_MAX_SECONDS', 25)
+
+    assert 8 <= retry_delay(1) <= 12
+    assert 16 <= retry_delay(2) <= 24
+    assert 20 <= retry_delay(3) <= 30
+    assert retry_delay(4) is None
+
+
+def test_failed_send_is_retried_until_it_succeeds(start_dispatcher):
+    registry = FakeRegistry([{'success': False, 'error': 'timeout'}, {'success': True, 'message_id': None}])
+    instance = start_dispatcher(registry)
+
+    alert_id = Alert.create(event_id=None, alert_type='ERROR', message='HTTP 500',
+                            target_url='https://example.com', channels=('CONSOLE',))
+    instance.wake()
+
+    wait_until(lambda: outbox_count() == 0)
+    assert registry.sent == [('alert', alert_id), ('alert', alert_id)]
+    assert logs(alert_id) == [('FAILED', 0), ('SENT', 1)]
+
+
+def test_send_is_abandoned_after_max_attempts(start_dispatcher):
+    registry = FakeRegistry([{'success': False, 'error': 'down'}] * 3)
+    instance = start_dispatcher(registry)
+
+    alert_id = Alert.create(event_id=None, alert_type='ERROR', message='HTTP 500',
+                            target_url='https://example.com', channels=('CONSOLE',))
+    instance.wake()
+
+    wait_until(lambda: outbox_count() == 0)
+    assert logs(alert_id) == [('FAILED', 0), ('FAILED', 1), ('FAILED', 2)]
+
+
+def test_first_alert_is_sent_at_once_and_the_rest_as_one_digest(start_dispatcher, monkeypatch):
+    monkeypatch.setattr(dispatcher, 'NOTIFY_DIGEST_WINDOW_SECONDS', 2)
+    monkeypatch.setattr(dispatcher, 'NOTIFY_DIGEST_MIN_ALERTS', 3)
+    registry = FakeRegistry([{'success': True}, {'success': True}])
+    instance = start_dispatcher(registry)
+
+    # 구간 경계 직후에 시작 (알림이 두 구간으로 나뉘지 않도록)
+    time.sleep(2 - time.time() % 2 + 0.05)
+    alert_ids = [Alert.create(event_id=None, alert_type='ERROR', message='HTTP 500',
+                              target_url=f'https://{index}.example.com', channels=('CONSOLE',))
+                 for index in range(4)]
+    instance.wake()
+
+    wait_until(lambda: registry.sent == [('alert', alert_ids[0])], timeout=1)
+    wait_until(lambda: outbox_count() == 0)
+    assert registry.sent == [('alert', alert_ids[0]), ('digest', alert_ids[1:])]
@@ -0,0 +1,157 @@
+"""
+/events/batch 수신 및 구간 요약 검증 테스트
+"""
+import pytest
+from api.events import validate_event, validate_summary
+from database import fetch_all
+
+
+def summary(**fields):
+    data = {
+        'type': 'summary',
+        'target_url': 'https://example.com',
+        'window_start': '2026-10-17T10:00:00',
+        'window_end': '2026-10-17T10:01:00',
+        'count': 6,
+        'failures': 0,
+        'avg_ms': 120.5,
+        'p95_ms': 180,
+        'last_status_code': 200
+    }
+    data.update(fields)
+    return data
+
+
+def event(**fields):
+    data = {
+        'target_url': 'https://example.com',
+        'status_code': 200,
+        'response_time_ms': 150,
+        'is_success': True,
+        'timestamp': '2026-10-17T10:00:05',
+        'error_message': None,
+        'ttfb_ms': 140
+    }
+    data.update(fields)
+    return data
+
+
+def test_valid_event_normalizes_timestamp_to_utc():
+    data = event(timestamp='2026-10-17T19:00:05+09:00')
+    assert validate_event(data) is None
+    assert data['timestamp'] == '2026-10-17 10:00:05'
+
+
+@pytest.mark.parametrize('fields', [
+    {'target_url': None},
+    {'target_url': ''},
+    {'response_time_ms': 'slow'},
+    {'response_time_ms': -1},
+    {'response_time_ms': True},
+    {'is_success': 'false'},
+    {'is_success': 0},
+    {'timestamp': 'garbage'},
+    {'timestamp': None},
+    {'status_code': '200'},
+    {'ttfb_ms': 'n/a'},
+    {'error_message': 500},
+])
+def test_invalid_event_fields_are_rejected(fields):
+    assert validate_event(event(**fields)) is not None
+
+
+def test_batch_rejects_bad_events_by_index(client):
+    response = client.post('/events/batch', json={'events': [
+        event(),
+        event(response_time_ms='slow'),
+        event(target_url=None),
+        event(is_success='false', timestamp='garbage'),
+        'not an event',
+        event(target_url='https://example.org', is_success=False, status_code=503)
+    ]})
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body['count'] == 2
+    assert [item['index'] for item in body['rejected']] == [1, 2, 3, 4]
+    rows = fetch_all("SELECT target_url, is_success FROM events ORDER BY id")
+    assert [(row['target_url'], row['is_success']) for row in rows] == \
+        [('https://example.com', 1), ('https://example.org', 0)]
+
+
+def test_event_is_stored_with_agent_timestamp(client):
+    # 스풀에서 늦게 전송된 결과도 점검 시각으로 저장하고 같은 시각의 rollup 구간에 더함
+    response = client.post('/events/batch', json={'events': [
+        event(timestamp='2026-10-17T19:00:05+09:00'),
+        event(timestamp='2026-10-16T23:59:59.500000')
+    ]})
+    assert response.status_code == 201
+
+    rows = fetch_all("SELECT timestamp FROM events ORDER BY id")
+    assert [row['timestamp'] for row in rows] == ['2026-10-17 10:00:05', '2026-10-16 23:59:59']
+    buckets = fetch_all("SELECT bucket_start FROM event_rollups_minute ORDER BY bucket_start")
+    assert [row['bucket_start'] for row in buckets] == ['2026-10-16 23:59:00', '2026-10-17 10:00:00']
+
+    response = client.post('/events', json=event(timestamp='2026-10-15T08:30:00Z'))
+    assert response.status_code == 201
+    assert fetch_all("SELECT timestamp FROM events WHERE id = ?",
+                     (response.get_json()['event_id'],))[0]['timestamp'] == '2026-10-15 08:30:00'
+
+
+def test_batch_with_only_bad_events_is_a_client_error(client):
+    response = client.post('/events/batch', json={'events': [event(response_time_ms='slow')]})
+    assert response.status_code == 400
+
+
+def test_single_event_validation_error_is_a_client_error(client):
+    response = client.post('/events', json=event(is_success='false'))
+    assert response.status_code == 400
+
+
+def test_valid_summary_normalizes_window_to_utc():
+    data = summary(window_start='2026-10-17T19:00:00+09:00', window_end='2026-10-17T10:01:00Z')
+    assert validate_summary(data) is None
+    assert data['window_start'] == '2026-10-17 10:00:00'
+    assert data['window_end'] == '2026-10-17 10:01:00'
+
+
+@pytest.mark.parametrize('fields', [
+    {'count': 0},
+    {'count': '6'},
+    {'count': True},
+    {'failures': 'z'},
+    {'failures': -1},
+    {'failures': 7},
+    {'failures': 1.5},
+    {'failures': False},
+    {'avg_ms': 'fast'},
+    {'p95_ms': -3},
+    {'last_status_code': '200'},
+    {'last_status_code': 42},
+    {'target_url': 7},
+    {'window_start': 'yesterday'},
+])
+def test_invalid_summary_fields_are_rejected(fields):
+    assert validate_summary(summary(**fields)) is not None
+
+
+def test_batch_rejects_bad_summary_by_index(client):
+    response = client.post('/events/batch', json={'events': [
+        summary(),
+        summary(failures='z'),
+        {'target_url': 'https://example.com', 'response_time_ms': 90, 'is_success': True,
+         'timestamp': '2026-10-17T10:01:05'}
+    ]})
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body['count'] == 1
+    assert body['summary_count'] == 1
+    assert [item['index'] for item in body['rejected']] == [1]
+
+
+def test_batch_with_only_bad_summaries_is_a_client_error(client):
+    response = client.post('/events/batch', json={'events': [summary(failures=9)]})
+
+    assert response.status_code == 400
+    assert response.get_json()['rejected'][0]['index'] == 0
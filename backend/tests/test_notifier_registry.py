@@ -0,0 +1,83 @@
+"""
+알림 채널 동시 발송 (제한 시간, 서킷 브레이커) 테스트
+"""
+import threading
+from notifiers.registry import CircuitBreaker, NotifierRegistry
+
+
+class FakeNotifier:
+    """발송 결과를 지정할 수 있는 채널 (BaseNotifier를 상속하면 전역 등록되므로 덕 타이핑)"""
+
+    enabled = True
+
+    def __init__(self, name, success=True, timeout=5.0, block=None):
+        self.name = name
+        self.success = success
+        self.timeout = timeout
+        self.block = block
+        self.sent = []
+
+    def get_channel_name(self):
+        return self.name
+
+    def send(self, alert):
+        if self.block is not None:
+            self.block.wait(5)
+        self.sent.append(alert)
+        return {'success': self.success, 'message_id': None, 'error': None if self.success else 'boom'}
+
+    def close(self):
+        pass
+
+
+ALERT = {'id': 1, 'alert_type': 'ERROR', 'target_url': 'https://example.com', 'message': 'HTTP 500'}
+
+
+def test_breaker_opens_after_consecutive_failures_and_allows_one_trial():
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=0)
+    assert not breaker.record(False)
+    assert breaker.record(False) and breaker.is_open
+
+    # cooldown이 지나면 시험 발송은 한 건만
+    assert breaker.allow()
+    assert not breaker.allow()
+    assert not breaker.record(False) and breaker.is_open
+
+    assert breaker.allow()
+    assert breaker.record(True) and not breaker.is_open
+
+
+def test_open_breaker_skips_channel_until_cooldown():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=60)
+    breaker.record(False)
+    assert not breaker.allow()
+
+
+def test_slow_channel_times_out_without_delaying_others():
+    release = threading.Event()
+    slow = FakeNotifier('SLOW', timeout=0.1, block=release)
+    fast = FakeNotifier('FAST')
+    registry = NotifierRegistry([slow, fast], threads=1)
+    try:
+        results = dict(registry.send_all(ALERT))
+        assert results['FAST']['success']
+        assert not results['SLOW']['success'] and 'Timed out' in results['SLOW']['error']
+    finally:
+        release.set()
+        registry.close()
+
+
+def test_failing_channel_is_skipped_after_breaker_opens():
+    failing = FakeNotifier('FAILING', success=False)
+    registry = NotifierRegistry([failing, FakeNotifier('OK')])
+    registry.breakers['FAILING'] = CircuitBreaker(failure_threshold=2, cooldown=60)
+    try:
+        for _ in range(3):
+            results = dict(registry.send_all(ALERT))
+        assert results['FAILING']['skipped'] and results['OK']['success']
+        assert len(failing.sent) == 2
+
+        # channels로 지정한 채널에만 발송
+        assert [channel for channel, _ in registry.send_all(ALERT, channels=['OK'])] == ['OK']
+    finally:
+        registry.close()
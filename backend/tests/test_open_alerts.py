@@ -0,0 +1,76 @@
+"""
+열린 알림 캐시 (write-through) 일관성 테스트
+- 알림 쓰기 후 캐시 조회 결과가 DB의 OPEN/ACK 알림과 같은지 확인
+"""
+from concurrent.futures import ThreadPoolExecutor
+from database import fetch_one
+from models import Alert, OpenAlertCache, open_alerts
+
+URL = 'https://example.com'
+
+
+def create(url=URL, status='OPEN'):
+    return Alert.create(event_id=None, alert_type='ERROR', message='HTTP 500', target_url=url, status=status)
+
+
+def db_open_alert(url=URL):
+    return fetch_one(OpenAlertCache.OPEN_QUERY, (url,))
+
+
+def assert_consistent(url=URL):
+    cached = Alert.get_open_alert_by_url(url)
+    stored = db_open_alert(url)
+    assert (cached and (cached['id'], cached['status'])) == (stored and (stored['id'], stored['status']))
+    return cached
+
+
+def test_status_changes_keep_cache_in_sync(db):
+    alert_id = create()
+    assert assert_consistent()['id'] == alert_id
+
+    Alert.update_status(alert_id, 'ACK')
+    assert assert_consistent()['status'] == 'ACK'
+
+    Alert.update_status(alert_id, 'RESOLVED')
+    assert assert_consistent() is None
+
+    # 해결된 알림을 다시 열면 캐시에 다시 나타남
+    Alert.update_status(alert_id, 'OPEN')
+    assert assert_consistent()['id'] == alert_id
+
+    Alert.resolve_by_url(URL)
+    assert assert_consistent() is None
+
+
+def test_resolved_alert_is_not_cached(db):
+    create(status='RESOLVED')
+    assert assert_consistent() is None
+
+
+def test_closing_newest_duplicate_falls_back_to_older_open_alert(db):
+    older = create()
+    newer = create()
+    assert assert_consistent()['id'] == newer
+
+    Alert.update_status(newer, 'RESOLVED')
+    assert assert_consistent()['id'] == older
+
+
+def test_returned_alert_is_a_copy(db):
+    create()
+    Alert.get_open_alert_by_url(URL)['status'] = 'RESOLVED'
+    assert Alert.get_open_alert_by_url(URL)['status'] == 'OPEN'
+
+
+def test_load_rebuilds_cache_from_database(db):
+    urls = [f'https://{index}.example.com' for index in range(10)]
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        alert_ids = list(pool.map(create, urls))
+    Alert.resolve_by_url(urls[0])
+
+    # 재시작한 서버처럼 빈 캐시에서 다시 로드
+    assert OpenAlertCache().load() == 9
+    assert open_alerts.load() == 9
+    for url, alert_id in zip(urls[1:], alert_ids[1:]):
+        assert assert_consistent(url)['id'] == alert_id
+    assert assert_consistent(urls[0]) is None
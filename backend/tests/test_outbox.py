@@ -0,0 +1,147 @@
+"""
+알림 발송 대기열 (transactional outbox) 테스트
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from database import fetch_all, execute_query
+from models import Alert, NotificationOutbox
+
+CHANNELS = ('CONSOLE', 'TELEGRAM')
+
+
+def create_alert(url: str = 'https://example.com', channels=CHANNELS) -> int:
+    return Alert.create(event_id=None, alert_type='ERROR', message='HTTP 500', target_url=url,
+                        channels=channels)
+
+
+def outbox_rows():
+    return fetch_all("SELECT * FROM notification_outbox ORDER BY id")
+
+
+def test_enqueue_references_the_alert_written_in_the_same_request(db):
+    # 여러 요청이 한 그룹 커밋으로 묶여도 각 대기열 행은 자기 알림을 가리킴
+    urls = [f'https://{index}.example.com' for index in range(20)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        alert_ids = list(pool.map(create_alert, urls))
+
+    rows = outbox_rows()
+    assert len(rows) == len(urls) * len(CHANNELS)
+    by_alert = {}
+    for row in rows:
+        by_alert.setdefault(row['alert_id'], []).append(row['channel'])
+    assert sorted(by_alert) == sorted(alert_ids)
+    assert all(sorted(channels) == sorted(CHANNELS) for channels in by_alert.values())
+
+
+def test_alert_without_channels_is_not_enqueued(db):
+    create_alert(channels=())
+    assert outbox_rows() == []
+
+
+def test_claimed_rows_are_leased(db):
+    alert_id = create_alert()
+
+    rows = NotificationOutbox.claim(10, lease_seconds=60)
+    assert [(row['alert_id'], row['channel'], row['attempts']) for row in rows] == \
+        [(alert_id, 'CONSOLE', 0), (alert_id, 'TELEGRAM', 0)]
+    assert NotificationOutbox.claim(10, lease_seconds=60) == []
+
+    # 이전 프로세스가 가져간 채 종료된 행은 시작 시 되돌림
+    NotificationOutbox.release_claims()
+    assert len(NotificationOutbox.claim(10, lease_seconds=60)) == 2
+
+
+def test_failed_attempt_is_rescheduled_and_logged(db):
+    alert_id = create_alert(channels=('CONSOLE',))
+    row = NotificationOutbox.claim(10, lease_seconds=60)[0]
+
+    NotificationOutbox.record_attempts([(row, {'success': False, 'error': 'boom'}, 30)])
+
+    pending = outbox_rows()[0]
+    assert pending['attempts'] == 1
+    assert pending['claimed_until'] is None
+    assert pending['last_error'] == 'boom'
+    # 재시도 시각 전에는 가져가지 않음
+    assert NotificationOutbox.claim(10, lease_seconds=60) == []
+
+    execute_query("UPDATE notification_outbox SET next_attempt_at = datetime('now', '-1 seconds')")
+    retry = NotificationOutbox.claim(10, lease_seconds=60)[0]
+    assert retry['attempts'] == 1
+    NotificationOutbox.record_attempts([(retry, {'success': True, 'message_id': '7'}, None)])
+
+    assert outbox_rows() == []
+    logs = fetch_all("SELECT status, retry_count, error_message FROM notification_logs "
+                     "WHERE alert_id = ? ORDER BY id", (alert_id,))
+    assert [(log['status'], log['retry_count']) for log in logs] == [('FAILED', 0), ('SENT', 1)]
+    assert logs[0]['error_message'] == 'boom'
+
+
+def test_given_up_attempt_is_removed(db):
+    create_alert(channels=('CONSOLE',))
+    row = NotificationOutbox.claim(10, lease_seconds=60)[0]
+
+    NotificationOutbox.record_attempts([(row, {'success': False, 'error': 'boom'}, None)])
+
+    assert outbox_rows() == []
+
+
+def test_skipped_attempt_is_not_counted(db):
+    create_alert(channels=('CONSOLE',))
+    row = NotificationOutbox.claim(10, lease_seconds=60)[0]
+
+    NotificationOutbox.record_attempts([(row, {'success': False, 'skipped': True, 'error': 'Circuit open'}, 60)])
+
+    assert outbox_rows()[0]['attempts'] == 0
+    assert fetch_all("SELECT * FROM notification_logs") == []
+
+
+def move_to_current_window(window: int):
+    """대기열 행의 생성 시각을 현재 구간 시작으로 (구간 경계에 걸려 결과가 달라지지 않도록)"""
+    execute_query("UPDATE notification_outbox SET created_at = "
+                  "datetime(CAST(strftime('%s', 'now') AS INTEGER) / ? * ?, 'unixepoch')", (window, window))
+
+
+def test_first_alert_in_window_is_claimed_immediately(db):
+    first = create_alert('https://a.example.com', channels=('CONSOLE',))
+    create_alert('https://b.example.com', channels=('CONSOLE',))
+    create_alert('https://c.example.com', channels=('CONSOLE',))
+    move_to_current_window(3600)
+
+    rows = NotificationOutbox.claim(10, lease_seconds=60, window_seconds=3600)
+    assert [row['alert_id'] for row in rows] == [first]
+
+    # 첫 알림을 보낸 뒤에도 같은 구간의 이후 알림은 구간이 끝날 때까지 대기
+    NotificationOutbox.record_attempts([(rows[0], {'success': True}, None)])
+    assert NotificationOutbox.claim(10, lease_seconds=60, window_seconds=3600) == []
+
+    # 구간이 끝나면 이후 알림을 한 번에 가져감
+    execute_query("UPDATE notification_outbox SET created_at = datetime(created_at, '-3600 seconds')")
+    assert len(NotificationOutbox.claim(10, lease_seconds=60, window_seconds=3600)) == 2
+
+
+def test_each_channel_sends_its_first_alert_immediately(db):
+    create_alert('https://a.example.com', channels=('CONSOLE',))
+    create_alert('https://b.example.com', channels=('TELEGRAM',))
+    create_alert('https://c.example.com', channels=CHANNELS)
+    move_to_current_window(3600)
+
+    rows = NotificationOutbox.claim(10, lease_seconds=60, window_seconds=3600)
+    assert sorted(row['channel'] for row in rows) == ['CONSOLE', 'TELEGRAM']
+
+
+def test_claim_runs_on_the_writer_thread(db, monkeypatch):
+    # 가져감 표시도 쓰기이므로 다른 쓰기와 같은 쓰기 스레드에서 커밋 (읽기 연결에서 SQLITE_BUSY 방지)
+    import database
+    threads = []
+    run_statements = database._run_statements
+
+    def record_thread(conn, statements):
+        if any('RETURNING' in query for query, _ in statements):
+            threads.append(threading.current_thread().name)
+        return run_statements(conn, statements)
+
+    monkeypatch.setattr(database, '_run_statements', record_thread)
+    create_alert()
+
+    assert len(NotificationOutbox.claim(10, lease_seconds=60)) == 2
+    assert threads == ['db-writer']
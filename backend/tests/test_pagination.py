@@ -0,0 +1,21 @@
+"""
+목록 조회 파라미터 처리 테스트
+"""
+import pytest
+from pagination import parse_time, encode_cursor, decode_cursor
+
+
+def test_parse_time_converts_offset_to_utc():
+    assert parse_time('2026-10-17T10:00:00+09:00', 'since') == '2026-10-17 01:00:00'
+    assert parse_time('2026-10-17T10:00:00Z', 'since') == '2026-10-17 10:00:00'
+    assert parse_time('2026-10-17T10:00:00', 'since') == '2026-10-17 10:00:00'
+    assert parse_time(None, 'since') is None
+
+
+def test_parse_time_rejects_invalid_value():
+    with pytest.raises(ValueError, match='until'):
+        parse_time('tomorrow', 'until')
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor('2026-10-17 01:00:00', 42)) == ('2026-10-17 01:00:00', 42)
@@ -0,0 +1,120 @@
+"""
+알림 조회 API 읽기 캐시 (ETag, 304, 쓰기 시 무효화) 테스트
+"""
+import pytest
+from models import Alert, NotificationLog
+from read_cache import ReadCache, alert_read_cache
+
+URL = 'https://example.com'
+
+
+@pytest.fixture
+def alerts_client(db):
+    from flask import Flask
+    from api import alerts
+
+    # 이전 테스트의 DB에서 캐시한 응답이 남지 않도록 버전을 올림
+    alert_read_cache.invalidate()
+    app = Flask(__name__)
+    app.register_blueprint(alerts.alerts_bp)
+    return app.test_client()
+
+
+@pytest.fixture
+def alert_id(db):
+    return Alert.create(None, 'ERROR', 'HTTP 500', URL)
+
+
+def fail_reads(monkeypatch):
+    """뷰가 DB를 읽으면 실패하도록 함 (캐시에서 응답했는지 확인용)"""
+    def fail(*args, **kwargs):
+        raise AssertionError('read from database')
+    monkeypatch.setattr(Alert, 'get_page', fail)
+    monkeypatch.setattr(Alert, 'get_by_id', fail)
+
+
+def test_matching_etag_returns_304_without_reading(alerts_client, alert_id, monkeypatch):
+    response = alerts_client.get('/alerts')
+    etag = response.headers['ETag']
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+    fail_reads(monkeypatch)
+    revalidated = alerts_client.get('/alerts', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers['ETag'] == etag
+    assert revalidated.get_data() == b''
+
+
+def test_same_version_is_served_from_cache(alerts_client, alert_id, monkeypatch):
+    first = alerts_client.get(f'/alerts/{alert_id}')
+
+    fail_reads(monkeypatch)
+    second = alerts_client.get(f'/alerts/{alert_id}')
+    assert second.status_code == 200
+    assert second.get_data() == first.get_data()
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert second.mimetype == 'application/json'
+
+
+def test_etag_differs_per_url(alerts_client, alert_id):
+    etags = {alerts_client.get(path).headers['ETag'] for path in ['/alerts', '/alerts?limit=1', f'/alerts/{alert_id}']}
+    assert len(etags) == 3
+
+
+def test_alert_create_invalidates(alerts_client, alert_id):
+    etag = alerts_client.get('/alerts').headers['ETag']
+
+    new_id = Alert.create(None, 'ERROR', 'timeout', 'https://b.example.com')
+    response = alerts_client.get('/alerts', headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert new_id in [alert['id'] for alert in response.get_json()['alerts']]
+
+
+def test_status_change_invalidates(alerts_client, alert_id):
+    etag = alerts_client.get(f'/alerts/{alert_id}').headers['ETag']
+
+    assert alerts_client.patch(f'/alerts/{alert_id}', json={'status': 'ACK'}).status_code == 200
+    response = alerts_client.get(f'/alerts/{alert_id}', headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.get_json()['alert']['status'] == 'ACK'
+
+
+def test_notification_log_invalidates_alert_detail(alerts_client, alert_id):
+    etag = alerts_client.get(f'/alerts/{alert_id}').headers['ETag']
+
+    NotificationLog.create(alert_id, 'telegram', 'SENT')
+    response = alerts_client.get(f'/alerts/{alert_id}', headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert [log['channel'] for log in response.get_json()['notification_logs']] == ['telegram']
+
+
+def test_error_responses_are_not_cached(alerts_client):
+    response = alerts_client.get('/alerts?status=BROKEN')
+    assert response.status_code == 400
+    assert 'ETag' not in response.headers
+
+    response = alerts_client.get('/alerts/999')
+    assert response.status_code == 404
+    assert 'ETag' not in response.headers
+
+
+def test_put_skips_stale_version_and_evicts_oldest():
+    cache = ReadCache(max_entries=2)
+    cache.put('/a', cache.version, b'a', 'application/json')
+
+    # 조회 중 쓰기가 일어나 버전이 바뀐 경우 낡은 응답은 저장하지 않음
+    version = cache.version
+    cache.invalidate()
+    cache.put('/b', version, b'b', 'application/json')
+    assert cache.get('/a', cache.version) is None
+    assert cache.get('/b', cache.version) is None
+
+    for key in ['/a', '/b', '/c']:
+        cache.put(key, cache.version, key.encode(), 'application/json')
+    assert cache.get('/a', cache.version) is None
+    assert cache.get('/c', cache.version) == (b'/c', 'application/json')
@@ -0,0 +1,31 @@
+"""
+rollup 구간 계산 테스트
+"""
+from rollups import rollup_statements
+
+
+def bucket_starts(statements):
+    """테이블별 구간 시작 시각"""
+    return {query.split()[2]: params[1] for query, params in statements}
+
+
+def test_event_with_offset_is_bucketed_in_utc():
+    statements = rollup_statements(events=[{
+        'target_url': 'https://example.com', 'is_success': True, 'response_time_ms': 120,
+        'timestamp': '2026-10-17T08:05:30+09:00'
+    }])
+
+    assert bucket_starts(statements) == {
+        'event_rollups_minute': '2026-10-16 23:05:00',
+        'event_rollups_hour': '2026-10-16 23:00:00',
+        'event_rollups_day': '2026-10-16 00:00:00'
+    }
+
+
+def test_naive_timestamp_is_treated_as_utc():
+    statements = rollup_statements(summaries=[{
+        'target_url': 'https://example.com', 'window_start': '2026-10-17T10:05:00',
+        'count': 4, 'failures': 1, 'avg_ms': 80
+    }])
+
+    assert bucket_starts(statements)['event_rollups_minute'] == '2026-10-17 10:05:00'
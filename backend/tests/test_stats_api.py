@@ -0,0 +1,44 @@
+"""
+/stats 조회 기간 처리 테스트
+"""
+from datetime import datetime
+import pytest
+from api.stats import parse_window
+
+
+def test_offsets_are_converted_to_utc():
+    since, until = parse_window({'since': '2026-10-17T09:00:00+09:00', 'until': '2026-10-17T01:30:00Z'})
+
+    assert since == datetime(2026, 10, 17, 0, 0)
+    assert until == datetime(2026, 10, 17, 1, 30)
+
+
+def test_window_counts_back_from_until():
+    since, until = parse_window({'until': '2026-10-17T12:00:00+02:00', 'window': '30m'})
+
+    assert (since, until) == (datetime(2026, 10, 17, 9, 30), datetime(2026, 10, 17, 10, 0))
+
+
+@pytest.mark.parametrize('args', [
+    {'since': 'noon'},
+    {'window': '0h'},
+    {'window': '99999999d'},
+    {'window': '999999d'},
+    {'since': '2026-10-17T10:00:00+09:00', 'until': '2026-10-17T00:30:00'},
+])
+def test_invalid_windows_are_rejected(args):
+    with pytest.raises(ValueError):
+        parse_window(args)
+
+
+@pytest.mark.parametrize('window', ['99999999d', '999999999999999999999m'])
+def test_too_long_window_returns_400(db, window):
+    from flask import Flask
+    from api.stats import stats_bp
+
+    app = Flask(__name__)
+    app.register_blueprint(stats_bp)
+    response = app.test_client().get(f'/stats?window={window}')
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'window is too long'}
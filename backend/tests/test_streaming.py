@@ -0,0 +1,107 @@
+"""
+대용량 목록 스트리밍 (내보내기) 테스트
+"""
+import json
+import pytest
+import streaming
+from models import Alert
+from streaming import iter_chunks, parse_chunk_size, parse_format, stream_rows
+
+URL = 'https://example.com'
+
+
+@pytest.fixture
+def alerts_client(db):
+    from flask import Flask
+    from api import alerts
+
+    app = Flask(__name__)
+    app.register_blueprint(alerts.alerts_bp)
+    return app.test_client()
+
+
+@pytest.fixture
+def alert_ids(db):
+    return [Alert.create(None, 'ERROR', f'HTTP 500 #{index}', URL, status='RESOLVED') for index in range(5)]
+
+
+def fake_pages(rows, calls=None):
+    """rows를 id 커서로 나누어 반환하는 get_page"""
+    def get_page(cursor=None, limit=10):
+        if calls is not None:
+            calls.append((cursor, limit))
+        start = cursor or 0
+        page = rows[start:start + limit]
+        next_cursor = start + limit if start + limit < len(rows) else None
+        return {'rows': page, 'next_cursor': next_cursor}
+    return get_page
+
+
+def test_parse_format_and_chunk_size(monkeypatch):
+    monkeypatch.setattr(streaming, 'MAX_EXPORT_CHUNK_SIZE', 100)
+    assert parse_format(None) == 'ndjson'
+    assert parse_format('JSON') == 'json'
+    assert parse_chunk_size(None) == streaming.EXPORT_CHUNK_SIZE
+    assert parse_chunk_size('100') == 100
+
+    for value in ['0', '101', 'x']:
+        with pytest.raises(ValueError, match='chunk_size'):
+            parse_chunk_size(value)
+    with pytest.raises(ValueError, match='format'):
+        parse_format('csv')
+
+
+def test_iter_chunks_follows_cursor_to_end():
+    calls = []
+    rows = [{'id': index} for index in range(5)]
+
+    assert list(iter_chunks(fake_pages(rows, calls), 2)) == [rows[0:2], rows[2:4], rows[4:5]]
+    assert calls == [(None, 2), (2, 2), (4, 2)]
+
+
+def test_export_ndjson_streams_every_row(alerts_client, alert_ids):
+    response = alerts_client.get('/alerts/export?chunk_size=2')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert 'alerts.ndjson' in response.headers['Content-Disposition']
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row['id'] for row in rows] == sorted(alert_ids, reverse=True)
+
+
+def test_export_json_is_single_array(alerts_client, alert_ids):
+    response = alerts_client.get('/alerts/export?format=json&chunk_size=2&fields=id')
+
+    assert response.mimetype == 'application/json'
+    assert json.loads(response.get_data(as_text=True)) == [{'id': id} for id in sorted(alert_ids, reverse=True)]
+
+
+def test_export_empty_result(alerts_client):
+    assert alerts_client.get('/alerts/export').get_data(as_text=True) == ''
+    assert json.loads(alerts_client.get('/alerts/export?format=json').get_data(as_text=True)) == []
+
+
+@pytest.mark.parametrize('query', ['format=csv', 'chunk_size=0', 'chunk_size=x', 'status=BROKEN'])
+def test_export_rejects_invalid_parameters(alerts_client, query):
+    response = alerts_client.get(f'/alerts/export?{query}')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_error_mid_stream_ends_ndjson_with_error_line(db):
+    rows = [{'id': index} for index in range(4)]
+    get_page = fake_pages(rows)
+
+    def failing(cursor=None, limit=10):
+        if cursor is not None:
+            raise RuntimeError('database is locked')
+        return get_page(cursor=cursor, limit=limit)
+
+    from flask import Flask
+    with Flask(__name__).test_request_context():
+        lines = stream_rows(failing, 'ndjson', 2, 'alerts').get_data(as_text=True).splitlines()
+        body = stream_rows(failing, 'json', 2, 'alerts').get_data(as_text=True)
+
+    assert [json.loads(line) for line in lines] == [{'id': 0}, {'id': 1}, {'error': 'database is locked'}]
+    # JSON 배열은 닫히지 않아 클라이언트가 잘린 응답임을 알 수 있음
+    assert body == '[{"id": 0},{"id": 1}'
@@ -0,0 +1,117 @@
+"""
+대상 상태 추적 (연속 횟수 기준, 구간 요약, flapping) 테스트
+"""
+import pytest
+import target_state
+from models import Alert
+from target_state import TargetStateTracker, load_thresholds
+
+URL = 'https://example.com'
+
+
+def record_all(tracker, results, url=URL):
+    return [tracker.record(url, is_success) for is_success in results]
+
+
+def test_default_thresholds_alert_on_first_failure():
+    assert target_state.ALERT_OPEN_AFTER_FAILURES == 1
+    assert target_state.ALERT_RESOLVE_AFTER_SUCCESSES == 1
+    assert TargetStateTracker(thresholds={}).thresholds(URL) == (1, 1)
+
+
+@pytest.mark.parametrize('open_after', [1, 2, 3])
+def test_streak_reaches_threshold_after_consecutive_failures(open_after):
+    tracker = TargetStateTracker(thresholds={URL: (open_after, 1)})
+    states = record_all(tracker, [True] + [False] * open_after)
+
+    streaks = [state['streak'] for state in states[1:]]
+    assert streaks == list(range(1, open_after + 1))
+    assert [streak >= open_after for streak in streaks] == [False] * (open_after - 1) + [True]
+
+
+def test_summary_adds_to_streak():
+    tracker = TargetStateTracker(thresholds={})
+    tracker.record(URL, True)
+    assert tracker.record(URL, True, count=4, summary=True)['streak'] == 5
+
+    tracker.record(URL, False)
+    state = tracker.record(URL, False, count=3, summary=True)
+    assert (state['is_success'], state['streak']) == (False, 4)
+
+
+def test_summary_from_before_transition_is_ignored():
+    # 상태 변화 전 구간의 요약이 상태 변화 이벤트보다 늦게 도착한 경우
+    tracker = TargetStateTracker(thresholds={})
+    record_all(tracker, [True, False])
+
+    assert tracker.record(URL, True, count=5, summary=True) is None
+    assert tracker.record(URL, False)['streak'] == 2
+
+
+def test_first_summary_sets_state():
+    tracker = TargetStateTracker(thresholds={})
+    state = tracker.record(URL, False, count=3, summary=True)
+    assert (state['is_success'], state['streak']) == (False, 3)
+
+
+def test_flapping_starts_and_stops_with_hysteresis(monkeypatch):
+    monkeypatch.setattr(target_state, 'FLAP_START_RATIO', 0.5)
+    monkeypatch.setattr(target_state, 'FLAP_STOP_RATIO', 0.2)
+    tracker = TargetStateTracker(window_size=11, thresholds={})
+
+    # 10번 비교 중 5번 변화 → 시작
+    states = record_all(tracker, [True, False] * 3)
+    assert [state['flapping'] for state in states] == [False] * 5 + [True]
+    assert states[-1]['flap_changed']
+
+    # 변화 비율이 시작 기준 아래로 내려가도 종료 기준 이하가 될 때까지 유지
+    states = record_all(tracker, [False] * 10)
+    ratios = [state['changes'] / 10 for state in states]
+    stopped = next(index for index, state in enumerate(states) if not state['flapping'])
+    assert all(ratio > 0.2 for ratio in ratios[:stopped])
+    assert any(ratio < 0.5 for ratio in ratios[:stopped])
+    assert ratios[stopped] <= 0.2 and states[stopped]['flap_changed']
+
+
+def test_load_thresholds(tmp_path):
+    path = tmp_path / 'thresholds.txt'
+    path.write_text(
+        "# 대상별 기준\n"
+        "https://a.example.com open_after=3 resolve_after=5\n"
+        "https://b.example.com resolve_after=2  # 생략한 값은 기본값\n",
+        encoding='utf-8'
+    )
+
+    tracker = TargetStateTracker(thresholds=load_thresholds(str(path)))
+    assert tracker.thresholds('https://a.example.com') == (3, 5)
+    assert tracker.thresholds('https://b.example.com') == (1, 2)
+    assert tracker.thresholds('https://c.example.com') == (1, 1)
+
+
+@pytest.mark.parametrize('option', ['open_after=0', 'open_after=x', 'retries=2'])
+def test_load_thresholds_rejects_invalid_option(tmp_path, option):
+    path = tmp_path / 'thresholds.txt'
+    path.write_text(f"{URL} {option}\n", encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_thresholds(str(path))
+
+
+def test_aggregated_failures_open_alert(db, monkeypatch):
+    # 집계 모드 Agent가 보내는 순서: 첫 결과, 정상 구간 요약(상태 변화 시 끊김), 상태 변화, 장애 구간 요약
+    from api import events
+    monkeypatch.setattr(events, 'target_states', TargetStateTracker(thresholds={URL: (3, 1)}))
+
+    def summary(count, failures):
+        return {'type': 'summary', 'target_url': URL, 'count': count, 'failures': failures,
+                'last_status_code': 500 if failures else 200}
+
+    def raw(is_success):
+        return {'target_url': URL, 'is_success': is_success, 'status_code': 200 if is_success else 500,
+                'response_time_ms': 100, 'error_message': None if is_success else 'HTTP 500'}
+
+    events.process_state_changes([(1, raw(True)), (None, summary(4, 0)), (2, raw(False))])
+    assert Alert.get_open_alert_by_url(URL) is None
+
+    events.process_state_changes([(None, summary(3, 3))])
+    alert = Alert.get_open_alert_by_url(URL)
+    assert alert is not None and alert['event_id'] is None
@@ -0,0 +1,158 @@
+"""
+텔레그램 알림 테스트 (실제 전송 없이 HTML 이스케이프와 전송 속도 제한 확인)
+"""
+import asyncio
+import re
+import pytest
+from notifiers import telegram
+from notifiers.telegram import TelegramNotifier, TokenBucket
+
+ALERT = {
+    'id': 1, 'alert_type': 'ERROR', 'status': 'OPEN', 'created_at': '2026-10-17 10:00:00', 'resolved_at': None,
+    'target_url': 'https://example.com/a_b*c[d]`e?x=1&y=<2>',
+    'message': "Connection error: <urlopen error [Errno 111] can't_connect *now*>"
+}
+
+
+def assert_only_bold_tags(text: str):
+    """허용한 <b> 태그 외에는 HTML 특수문자가 이스케이프되어 있는지"""
+    stripped = re.sub(r'</?b>', '', text)
+    assert '<' not in stripped and '>' not in stripped
+    assert not re.search(r'&(?!amp;|lt;|gt;|quot;|#x27;)', stripped)
+
+
+@pytest.fixture
+def notifier(monkeypatch):
+    monkeypatch.delenv('TELEGRAM_BOT_TOKEN', raising=False)
+    return TelegramNotifier()
+
+
+def test_alert_message_escapes_url_and_error(notifier):
+    text = notifier._format_alert_message(ALERT)
+
+    assert_only_bold_tags(text)
+    assert 'https://example.com/a_b*c[d]`e?x=1&amp;y=&lt;2&gt;' in text
+
+
+def test_digest_escapes_every_line(notifier, monkeypatch):
+    sent = []
+    monkeypatch.setattr(notifier, 'enabled', True)
+    monkeypatch.setattr(notifier, '_send_text', lambda text: sent.append(text) or {'success': True})
+
+    notifier.send_digest([ALERT, {**ALERT, 'id': 2, 'target_url': 'https://b.example.com/<x>'}])
+
+    assert_only_bold_tags(sent[0])
+    assert '&lt;x&gt;' in sent[0]
+
+
+class FakeClock:
+    """asyncio.sleep을 기다리지 않고 시각만 앞당기는 시계"""
+
+    def __init__(self, monkeypatch):
+        self.now = 0.0
+        self.sleeps = []
+        real_sleep = asyncio.sleep
+
+        async def sleep(delay):
+            self.sleeps.append(delay)
+            self.now += delay
+            await real_sleep(0)
+
+        monkeypatch.setattr(telegram.time, 'monotonic', lambda: self.now)
+        monkeypatch.setattr(telegram.asyncio, 'sleep', sleep)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    return FakeClock(monkeypatch)
+
+
+def acquire_times(bucket, clock, count):
+    """count개를 동시에 요청했을 때 각 토큰을 얻은 시각"""
+    times = []
+
+    async def take():
+        await bucket.acquire()
+        times.append(clock.now)
+
+    async def run():
+        await asyncio.gather(*(take() for _ in range(count)))
+
+    asyncio.run(run())
+    return times
+
+
+def test_bucket_allows_burst_then_waits_at_rate(clock):
+    bucket = TokenBucket(rate=2, capacity=3)
+
+    assert acquire_times(bucket, clock, 6) == [0, 0, 0, 0.5, 1.0, 1.5]
+    assert clock.sleeps == [0.5, 0.5, 0.5]
+
+
+def test_bucket_refills_up_to_capacity(clock):
+    bucket = TokenBucket(rate=1, capacity=2)
+    acquire_times(bucket, clock, 2)
+
+    # 오래 쉬어도 capacity 이상은 모이지 않음
+    clock.now = 100
+    assert acquire_times(bucket, clock, 3) == [100, 100, 101]
+
+
+class FakeBot:
+    def __init__(self, now, failures=0):
+        self.now = now
+        self.failures = failures
+        self.sent = []
+
+    async def send_message(self, chat_id, text, parse_mode):
+        self.sent.append((chat_id, self.now()))
+        if self.failures:
+            self.failures -= 1
+            raise RetryAfter(5)
+        return type('Message', (), {'message_id': len(self.sent)})()
+
+
+class RetryAfter(Exception):
+    def __init__(self, retry_after):
+        super().__init__(f'retry after {retry_after}')
+        self.retry_after = retry_after
+
+
+def sending_notifier(notifier, bot):
+    notifier._bot = bot
+    notifier._global_bucket = TokenBucket(30, 30)
+    notifier.RetryAfter = RetryAfter
+    return notifier
+
+
+def test_chat_bucket_limits_each_chat_separately(notifier, monkeypatch):
+    # 여러 작업이 동시에 대기하므로 가짜 시계 대신 짧은 간격의 실제 시간으로 확인
+    monkeypatch.setattr(telegram, 'TELEGRAM_CHAT_MAX_PER_SECOND', 20)
+    bot = FakeBot(telegram.time.monotonic)
+    sending_notifier(notifier, bot)
+
+    async def run():
+        await asyncio.gather(*(notifier._send_async(chat_id, 'hi') for chat_id in ['a', 'a', 'b', 'a']))
+
+    started = telegram.time.monotonic()
+    asyncio.run(run())
+    sent_at = {chat_id: [at - started for sent_chat, at in bot.sent if sent_chat == chat_id] for chat_id in 'ab'}
+    # 다른 채팅방은 기다리지 않고, 같은 채팅방은 1/20초 간격
+    assert sent_at['b'][0] < 0.04
+    assert all(later - earlier >= 0.045 for earlier, later in zip(sent_at['a'], sent_at['a'][1:]))
+    assert len(sent_at['a']) == 3
+
+
+def test_retry_after_waits_and_resends(notifier, clock, monkeypatch):
+    bot = FakeBot(lambda: clock.now, failures=2)
+    sending_notifier(notifier, bot)
+
+    message = asyncio.run(notifier._send_async('a', 'hi'))
+    assert message.message_id == 3
+    # 안내된 5초를 기다린 뒤에도 채팅방 버킷을 다시 거침
+    assert [sent_at for _, sent_at in bot.sent] == [0, 5, 10]
+
+    monkeypatch.setattr(telegram, 'TELEGRAM_MAX_RETRIES', 1)
+    bot.failures = 2
+    with pytest.raises(RetryAfter):
+        asyncio.run(notifier._send_async('a', 'hi'))
@@ -0,0 +1,16 @@
+"""
+시각 처리 공통 함수
+- DB와 rollup 구간은 시간대 없는 UTC 시각으로 다룸
+"""
+from datetime import datetime, timezone
+
+
+def parse_utc(value: str) -> datetime:
+    """
+    ISO 8601 시각을 시간대 없는 UTC datetime으로 변환
+    (시간대가 있으면 UTC로 환산, 없으면 UTC로 간주 - 잘못된 값은 TypeError/ValueError)
+    """
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed